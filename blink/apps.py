@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class BlinkConfig(AppConfig):
     name = "blink"
+
+    def ready(self):
+        from . import signals  # noqa
@@ -0,0 +1,77 @@
+from asgiref.sync import async_to_sync
+from channels.generic.websocket import JsonWebsocketConsumer
+
+from peerinst.models import Teacher
+
+from . import live
+from .models import BlinkQuestion
+
+
+class BlinkQuestionConsumer(JsonWebsocketConsumer):
+    """
+    Pushes the status of a blink question to everyone on its page, replacing
+    the polling of `blink_status`, and the vote count to its teacher,
+    replacing the polling of `blink_count`.
+    """
+
+    def connect(self):
+        try:
+            self.blinkquestion = BlinkQuestion.objects.select_related(
+                "teacher__user"
+            ).get(pk=self.scope["url_route"]["kwargs"]["pk"])
+        except BlinkQuestion.DoesNotExist:
+            return self.close()
+
+        self.groups = [live.question_group(self.blinkquestion.pk)]
+        user = self.scope.get("user")
+        if (
+            user is not None
+            and user.is_authenticated
+            and self.blinkquestion.teacher is not None
+            and self.blinkquestion.teacher.user == user
+        ):
+            self.groups.append(live.count_group(self.blinkquestion.pk))
+
+        for group in self.groups:
+            async_to_sync(self.channel_layer.group_add)(
+                group, self.channel_name
+            )
+        self.accept()
+
+        self.send_json({"status": self.blinkquestion.active})
+        if live.count_group(self.blinkquestion.pk) in self.groups:
+            blinkround = live.get_current_round(self.blinkquestion.pk)
+            if blinkround is not None:
+                self.send_json({"count": live.get_count(blinkround.pk)})
+
+    def blink_status(self, event):
+        self.send_json({"status": event["status"]})
+
+    def blink_count(self, event):
+        self.send_json({"count": event["count"]})
+
+
+class BlinkTeacherConsumer(JsonWebsocketConsumer):
+    """
+    Pushes the page students of a teacher should be on, replacing the polling
+    of `blink_get_current_url`.
+    """
+
+    def connect(self):
+        try:
+            self.teacher = Teacher.objects.get(
+                user__username=self.scope["url_route"]["kwargs"]["username"]
+            )
+        except Teacher.DoesNotExist:
+            return self.close()
+
+        self.groups = [live.teacher_group(self.teacher.pk)]
+        async_to_sync(self.channel_layer.group_add)(
+            self.groups[0], self.channel_name
+        )
+        self.accept()
+
+        self.send_json({"action": live.get_current_url(self.teacher)})
+
+    def blink_action(self, event):
+        self.send_json({"action": event["action"]})
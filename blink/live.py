@@ -0,0 +1,218 @@
+"""
+Live state of blink questions pushed to the websocket consumers.
+
+Vote tallies are kept in the cache as one counter per round and answer
+choice, incremented on each vote and rebuilt from the `BlinkAnswer` rows,
+which remain the durable record, whenever they are missing. Changes are
+sent to the channel groups joined by `blink.consumers`.
+"""
+
+import logging
+import threading
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.urls import reverse
+
+from .models import BlinkAnswer, BlinkRound
+
+logger = logging.getLogger("dalite")
+
+
+def question_group(question_pk):
+    return f"blink_question_{question_pk}"
+
+
+def count_group(question_pk):
+    return f"blink_count_{question_pk}"
+
+
+def teacher_group(teacher_pk):
+    return f"blink_teacher_{teacher_pk}"
+
+
+def _count_key(round_pk, choice=None):
+    return f"blink_round:{round_pk}:{'all' if choice is None else choice}"
+
+
+def _load_counts(round_pk):
+    counts = dict(
+        BlinkAnswer.objects.filter(voting_round_id=round_pk)
+        .values_list("answer_choice")
+        .annotate(n=Count("pk"))
+        .order_by()
+    )
+    timeout = getattr(settings, "BLINK_COUNT_TIMEOUT", 60 * 60)
+    cache.set_many(
+        {
+            _count_key(round_pk, choice): n
+            for choice, n in counts.items()
+            if choice is not None
+        },
+        timeout,
+    )
+    # the total is added last as its presence marks the counters as loaded.
+    # if another request loaded them first, votes may already have been
+    # counted on top of it and overwritten by this older snapshot, so the
+    # counters are dropped to be rebuilt on the next read
+    if not cache.add(_count_key(round_pk), sum(counts.values()), timeout):
+        cache.delete(_count_key(round_pk))
+    return counts
+
+
+def get_count(round_pk, choice=None):
+    """
+    Returns the number of votes in a round, using the cached counters.
+
+    Parameters
+    ----------
+    round_pk : int
+        Primary key of the BlinkRound
+    choice : Optional[int] (default : None)
+        Answer choice to count, or all the votes if None
+
+    Returns
+    -------
+    int
+        Number of votes
+    """
+    total = cache.get(_count_key(round_pk))
+    if total is None:
+        counts = _load_counts(round_pk)
+        return (
+            sum(counts.values()) if choice is None else counts.get(choice, 0)
+        )
+    if choice is None:
+        return total
+    return cache.get(_count_key(round_pk, choice), 0)
+
+
+def add_vote(answer):
+    """
+    Adds a newly saved vote to the counters of its round and pushes the new
+    count to the teacher, at most once every `BLINK_BROADCAST_INTERVAL`
+    seconds for a round. Votes held back by the interval are sent once it
+    expires.
+
+    Parameters
+    ----------
+    answer : BlinkAnswer
+        Saved vote
+    """
+    round_pk = answer.voting_round_id
+    try:
+        cache.incr(_count_key(round_pk))
+    except ValueError:
+        # the rebuilt counters already include this vote
+        _load_counts(round_pk)
+    else:
+        key = _count_key(round_pk, answer.answer_choice)
+        timeout = getattr(settings, "BLINK_COUNT_TIMEOUT", 60 * 60)
+        if not cache.add(key, 1, timeout):
+            cache.incr(key)
+
+    interval = getattr(settings, "BLINK_BROADCAST_INTERVAL", 1)
+    if cache.add(f"blink_round:{round_pk}:broadcast", True, interval):
+        broadcast_count(answer.question_id, round_pk)
+    elif cache.add(f"blink_round:{round_pk}:pending", True, 2 * interval):
+        timer = threading.Timer(
+            interval, _flush_count, args=(answer.question_id, round_pk)
+        )
+        timer.daemon = True
+        timer.start()
+
+
+def _flush_count(question_pk, round_pk):
+    # the flag is cleared before reading the count so a vote counted after
+    # the read schedules another flush
+    cache.delete(f"blink_round:{round_pk}:pending")
+    broadcast_count(question_pk, round_pk)
+
+
+def get_current_round(question_pk):
+    """
+    Returns the open round of a question or, if none are open, the last one
+    closed.
+
+    Parameters
+    ----------
+    question_pk : str
+        Primary key of the BlinkQuestion
+
+    Returns
+    -------
+    Optional[BlinkRound]
+        Round, or None if the question was never asked
+    """
+    rounds = BlinkRound.objects.filter(question_id=question_pk)
+    return (
+        rounds.filter(deactivate_time__isnull=True).first()
+        or rounds.exclude(deactivate_time__isnull=True)
+        .order_by("-deactivate_time")
+        .first()
+    )
+
+
+def get_current_url(teacher):
+    """
+    Returns the page students of a teacher should be on.
+
+    Parameters
+    ----------
+    teacher : Teacher
+        Teacher running the blink questions
+
+    Returns
+    -------
+    str
+        Url of the active question, of the summary of the last question
+        asked or "stop" if no blink assignment is running
+    """
+    blinkquestion = teacher.blinkquestion_set.filter(active=True).first()
+    if blinkquestion is not None:
+        return reverse("blink:blink-question", kwargs={"pk": blinkquestion.pk})
+    if not teacher.blinkassignment_set.filter(active=True).exists():
+        return "stop"
+    latest_round = (
+        BlinkRound.objects.filter(question__teacher=teacher)
+        .order_by("-activate_time")
+        .first()
+    )
+    if latest_round is None:
+        return "stop"
+    return reverse(
+        "blink:blink-summary", kwargs={"pk": latest_round.question_id}
+    )
+
+
+def _send(group, message):
+    # the database is the source of truth, so a failing channel layer only
+    # delays clients until they reconnect and receive the current state
+    try:
+        async_to_sync(get_channel_layer().group_send)(group, message)
+    except Exception as e:  # noqa
+        logger.warning(f"Couldn't send blink update to {group}: {e}")
+
+
+def broadcast_count(question_pk, round_pk):
+    _send(
+        count_group(question_pk),
+        {"type": "blink.count", "count": get_count(round_pk)},
+    )
+
+
+def broadcast_status(blinkquestion):
+    _send(
+        question_group(blinkquestion.pk),
+        {"type": "blink.status", "status": blinkquestion.active},
+    )
+
+
+def broadcast_action(teacher):
+    _send(
+        teacher_group(teacher.pk),
+        {"type": "blink.action", "action": get_current_url(teacher)},
+    )
@@ -0,0 +1,14 @@
+from django.urls import re_path
+
+from blink import consumers
+
+websocket_urlpatterns = [
+    re_path(
+        r"ws/blink/(?P<pk>[0-9]+)/$",
+        consumers.BlinkQuestionConsumer.as_asgi(),
+    ),
+    re_path(
+        r"ws/blink/teacher/(?P<username>[^/]+)/$",
+        consumers.BlinkTeacherConsumer.as_asgi(),
+    ),
+]
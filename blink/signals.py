@@ -0,0 +1,43 @@
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from . import live
+from .models import BlinkAnswer, BlinkAssignment, BlinkQuestion, BlinkRound
+
+
+@receiver(post_init, sender=BlinkQuestion)
+@receiver(post_init, sender=BlinkAssignment)
+def store_active(sender, instance, **kwargs):
+    instance._active = instance.__dict__.get("active")
+
+
+@receiver(post_save, sender=BlinkQuestion)
+def push_question_status(sender, instance, created, **kwargs):
+    if created or instance.active != instance._active:
+        instance._active = instance.active
+        live.broadcast_status(instance)
+        if instance.teacher_id is not None:
+            live.broadcast_action(instance.teacher)
+
+
+@receiver(post_save, sender=BlinkAssignment)
+def push_assignment_status(sender, instance, created, **kwargs):
+    if created or instance.active != instance._active:
+        instance._active = instance.active
+        if instance.teacher_id is not None:
+            live.broadcast_action(instance.teacher)
+
+
+@receiver(post_save, sender=BlinkRound)
+def push_round(sender, instance, **kwargs):
+    # opening a round resets the count and closing it sends the final one,
+    # which may have been held back by the broadcast interval
+    live.broadcast_count(instance.question_id, instance.pk)
+    if instance.question.teacher_id is not None:
+        live.broadcast_action(instance.question.teacher)
+
+
+@receiver(post_save, sender=BlinkAnswer)
+def push_vote(sender, instance, created, **kwargs):
+    if created:
+        live.add_vote(instance)
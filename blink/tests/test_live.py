@@ -0,0 +1,258 @@
+import pytest
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from blink import live
+from blink.models import (
+    BlinkAnswer,
+    BlinkAssignment,
+    BlinkQuestion,
+    BlinkRound,
+)
+from dalite.routing import application
+from peerinst.tests.fixtures import *  # noqa
+
+
+@pytest.fixture
+def blinkquestion(question, teacher):
+    return BlinkQuestion.objects.create(
+        question=question, teacher=teacher, key="12345678", time_limit=30
+    )
+
+
+@pytest.fixture
+def blinkround(blinkquestion):
+    return BlinkRound.objects.create(
+        question=blinkquestion, activate_time=timezone.now()
+    )
+
+
+def vote(blinkquestion, blinkround, choice):
+    return BlinkAnswer.objects.create(
+        question=blinkquestion,
+        answer_choice=choice,
+        vote_time=timezone.now(),
+        voting_round=blinkround,
+    )
+
+
+@pytest.mark.django_db
+def test_get_count(blinkquestion, blinkround, django_assert_num_queries):
+    cache.clear()
+    for choice in (1, 1, 2):
+        vote(blinkquestion, blinkround, choice)
+
+    with django_assert_num_queries(0):
+        assert live.get_count(blinkround.pk) == 3
+        assert live.get_count(blinkround.pk, 1) == 2
+        assert live.get_count(blinkround.pk, 2) == 1
+        assert live.get_count(blinkround.pk, 3) == 0
+
+
+@pytest.mark.django_db
+def test_get_count__not_cached(blinkquestion, blinkround):
+    for choice in (1, 1, 2):
+        vote(blinkquestion, blinkround, choice)
+    cache.clear()
+
+    assert live.get_count(blinkround.pk, 1) == 2
+    assert live.get_count(blinkround.pk) == 3
+
+    vote(blinkquestion, blinkround, 3)
+    assert live.get_count(blinkround.pk) == 4
+    assert live.get_count(blinkround.pk, 3) == 1
+
+
+@pytest.mark.django_db
+def test_get_count__concurrent_load(blinkquestion, blinkround):
+    cache.clear()
+    vote(blinkquestion, blinkround, 1)
+    # a vote saved without going through the counters, which another
+    # request counted on top of the counters it loaded
+    BlinkAnswer.objects.bulk_create(
+        [
+            BlinkAnswer(
+                question=blinkquestion,
+                answer_choice=2,
+                vote_time=timezone.now(),
+                voting_round=blinkround,
+            )
+        ]
+    )
+    cache.set(live._count_key(blinkround.pk), 2)
+
+    live._load_counts(blinkround.pk)
+
+    assert cache.get(live._count_key(blinkround.pk)) is None
+    assert live.get_count(blinkround.pk) == 2
+    assert live.get_count(blinkround.pk, 1) == 1
+    assert live.get_count(blinkround.pk, 2) == 1
+
+
+@pytest.mark.django_db
+def test_add_vote__trailing_broadcast(
+    monkeypatch, settings, blinkquestion, blinkround
+):
+    settings.BLINK_BROADCAST_INTERVAL = 60
+    cache.clear()
+    broadcasts = []
+    timers = []
+    monkeypatch.setattr(
+        live, "broadcast_count", lambda *args: broadcasts.append(args)
+    )
+
+    class Timer:
+        def __init__(self, interval, function, args):
+            timers.append((interval, function, args))
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(live.threading, "Timer", Timer)
+
+    for choice in (1, 2, 2):
+        vote(blinkquestion, blinkround, choice)
+
+    assert broadcasts == [(blinkquestion.pk, blinkround.pk)]
+    assert len(timers) == 1
+
+    interval, function, args = timers[0]
+    assert interval == 60
+    function(*args)
+    assert broadcasts == [(blinkquestion.pk, blinkround.pk)] * 2
+
+    vote(blinkquestion, blinkround, 1)
+    assert len(timers) == 2
+
+
+@pytest.mark.django_db
+def test_get_current_url(teacher, blinkquestion, blinkround):
+    assert live.get_current_url(teacher) == "stop"
+
+    BlinkAssignment.objects.create(
+        title="test", teacher=teacher, key="123", active=True
+    )
+    assert live.get_current_url(teacher) == reverse(
+        "blink:blink-summary", kwargs={"pk": blinkquestion.pk}
+    )
+
+    blinkquestion.active = True
+    blinkquestion.save()
+    assert live.get_current_url(teacher) == reverse(
+        "blink:blink-question", kwargs={"pk": blinkquestion.pk}
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_question_consumer(client, teacher, blinkquestion, blinkround):
+    cache.clear()
+    vote(blinkquestion, blinkround, 1)
+
+    async def run():
+        student = WebsocketCommunicator(
+            application, f"/ws/blink/{blinkquestion.pk}/"
+        )
+        connected, _ = await student.connect()
+        assert connected
+        assert await student.receive_json_from() == {"status": False}
+
+        blinkquestion.active = True
+        await database_sync_to_async(blinkquestion.save)()
+        assert await student.receive_json_from() == {"status": True}
+
+        # votes are only sent to the teacher
+        await database_sync_to_async(vote)(blinkquestion, blinkround, 2)
+        assert await student.receive_nothing()
+
+        await student.disconnect()
+
+    async_to_sync(run)()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_question_consumer__teacher(
+    client, settings, teacher, blinkquestion, blinkround
+):
+    settings.BLINK_BROADCAST_INTERVAL = 60
+    vote(blinkquestion, blinkround, 1)
+    cache.clear()
+    client.force_login(teacher.user)
+
+    async def run():
+        communicator = WebsocketCommunicator(
+            application,
+            f"/ws/blink/{blinkquestion.pk}/",
+            headers=[
+                (
+                    b"cookie",
+                    f"sessionid={client.cookies['sessionid'].value}".encode(),
+                )
+            ],
+        )
+        connected, _ = await communicator.connect()
+        assert connected
+        assert await communicator.receive_json_from() == {"status": False}
+        assert await communicator.receive_json_from() == {"count": 1}
+
+        await database_sync_to_async(vote)(blinkquestion, blinkround, 2)
+        assert await communicator.receive_json_from() == {"count": 2}
+
+        # counts are throttled until the round is closed
+        await database_sync_to_async(vote)(blinkquestion, blinkround, 2)
+        assert await communicator.receive_nothing()
+
+        blinkround.deactivate_time = timezone.now()
+        await database_sync_to_async(blinkround.save)()
+        assert await communicator.receive_json_from() == {"count": 3}
+
+        await communicator.disconnect()
+
+    async_to_sync(run)()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_teacher_consumer(teacher, blinkquestion, blinkround):
+    async def run():
+        communicator = WebsocketCommunicator(
+            application, f"/ws/blink/teacher/{teacher.user.username}/"
+        )
+        connected, _ = await communicator.connect()
+        assert connected
+        assert await communicator.receive_json_from() == {"action": "stop"}
+
+        await database_sync_to_async(BlinkAssignment.objects.create)(
+            title="test", teacher=teacher, key="123", active=True
+        )
+        assert await communicator.receive_json_from() == {
+            "action": reverse(
+                "blink:blink-summary", kwargs={"pk": blinkquestion.pk}
+            )
+        }
+
+        blinkquestion.active = True
+        await database_sync_to_async(blinkquestion.save)()
+        assert await communicator.receive_json_from() == {
+            "action": reverse(
+                "blink:blink-question", kwargs={"pk": blinkquestion.pk}
+            )
+        }
+
+        await communicator.disconnect()
+
+    async_to_sync(run)()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_teacher_consumer__unknown_teacher():
+    async def run():
+        communicator = WebsocketCommunicator(
+            application, "/ws/blink/teacher/unknown/"
+        )
+        connected, _ = await communicator.connect()
+        assert not connected
+
+    async_to_sync(run)()
@@ -14,7 +14,7 @@ from django.views.generic import DetailView
 from django.views.generic.detail import SingleObjectMixin
 from django.views.generic.edit import CreateView, FormView
 
-from blink import forms
+from blink import forms, live
 from blink.models import (
     BlinkAnswer,
     BlinkAssignment,
@@ -140,25 +140,11 @@ def blink_close(request, pk):
 
 def blink_count(request, pk):
 
-    blinkquestion = BlinkQuestion.objects.get(pk=pk)
-    try:
-        blinkround = BlinkRound.objects.get(
-            question=blinkquestion, deactivate_time__isnull=True
-        )
-    except Exception:
-        try:
-            blinkround = BlinkRound.objects.filter(
-                question=blinkquestion
-            ).latest("deactivate_time")
-        except Exception:
-            return JsonResponse()
-
-    context = {}
-    context["count"] = BlinkAnswer.objects.filter(
-        voting_round=blinkround
-    ).count()
+    blinkround = live.get_current_round(pk)
+    if blinkround is None:
+        return JsonResponse({})
 
-    return JsonResponse(context)
+    return JsonResponse({"count": live.get_count(blinkround.pk)})
 
 
 def blink_get_current(request, username):
@@ -213,24 +199,7 @@ def blink_get_current_url(request, username):
     except Exception:
         return HttpResponse("Teacher does not exist")
 
-    try:
-        # Return url of current active blinkquestion, if any
-        blinkquestion = teacher.blinkquestion_set.get(active=True)
-        url = reverse("blink:blink-question", kwargs={"pk": blinkquestion.pk})
-        return JsonResponse({"action": url})
-    except Exception:
-        if not teacher.blinkassignment_set.filter(active=True).exists():
-            return JsonResponse({"action": "stop"})
-        try:
-            latest_round = BlinkRound.objects.filter(
-                question__in=teacher.blinkquestion_set.all()
-            ).latest("activate_time")
-            url = reverse(
-                "blink:blink-summary", kwargs={"pk": latest_round.question.pk}
-            )
-            return JsonResponse({"action": url})
-        except Exception:
-            return JsonResponse({"action": "stop"})
+    return JsonResponse({"action": live.get_current_url(teacher)})
 
 
 def blink_get_next(request, pk):
@@ -300,15 +269,10 @@ def blink_latest_results(request, pk):
         "deactivate_time"
     )
 
-    c = 1
-    for label, _text in blinkquestion.question.get_choices():
-        results[label] = (
-            BlinkAnswer.objects.filter(question=blinkquestion)
-            .filter(voting_round=blinkround)
-            .filter(answer_choice=c)
-            .count()
-        )
-        c = c + 1
+    for c, (label, _text) in enumerate(
+        blinkquestion.question.get_choices(), 1
+    ):
+        results[label] = live.get_count(blinkround.pk, c)
 
     return JsonResponse(results)
 
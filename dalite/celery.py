@@ -86,6 +86,14 @@ def setup_periodic_tasks(sender, **kwargs):
             "task": "peerinst.tasks.clean_notifications",
             "schedule": crontab(hour=0, minute=0),
         },
+        "refresh_question_statistics": {
+            "task": "peerinst.tasks.refresh_question_statistics",
+            "schedule": crontab(hour=1, minute=0),
+        },
+        "refresh_rationale_evaluation_queue": {
+            "task": "peerinst.tasks.refresh_rationale_evaluation_queue",
+            "schedule": crontab(hour=2, minute=0),
+        },
         "update_reputation_history": {
             "task": "reputation.tasks.update_reputation_history",
             "schedule": crontab(hour=0, minute=0),
@@ -3,11 +3,16 @@ from channels.auth import AuthMiddlewareStack
 from channels.routing import ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
 
+import blink.routing
+
 application = ProtocolTypeRouter(
     {
         "http": get_asgi_application(),
         "websocket": AuthMiddlewareStack(
-            URLRouter(course_flow.routing.websocket_urlpatterns)
+            URLRouter(
+                course_flow.routing.websocket_urlpatterns
+                + blink.routing.websocket_urlpatterns
+            )
         ),
     }
 )
@@ -36,3 +36,11 @@ PYLTI_CONFIG = {
 }
 
 ROOT_URLCONF = "dalite.test_urls"
+
+# Channels
+CHANNEL_LAYERS = {
+    "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+}
+
+# Tracking events are written synchronously
+EVENT_FLUSH_INTERVAL = None
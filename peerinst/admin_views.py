@@ -7,7 +7,7 @@ import urllib.request
 from django import forms
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
-from django.db.models import Count, F, Q
+from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils.safestring import mark_safe
@@ -27,6 +27,7 @@ from .mixins import (
     NoStudentsMixin,
     TOSAcceptanceRequiredMixin,
 )
+from .transitions import get_top_rationales, get_transitions, load_rationales
 from .util import make_percent_function, student_list_from_student_groups
 
 
@@ -54,12 +55,10 @@ def get_question_aggregates(assignment, question, student_groups=None):
     the set of all user tokens of the submitted answers.
     """
     # Get indices of the correct answer choices (usually only one)
-    answerchoice_correct = question.answerchoice_set.values_list(
-        "correct", flat=True
-    )
-    correct_choices = list(
-        itertools.compress(itertools.count(1), answerchoice_correct)
-    )
+    choices = list(question.answerchoice_set.all())
+    correct_choices = [
+        i for i, choice in enumerate(choices, 1) if choice.correct
+    ]
     if not student_groups:
         # Select answers entered by students, not example answers
         answers = question.answer_set.filter(assignment=assignment).exclude(
@@ -73,25 +72,28 @@ def get_question_aggregates(assignment, question, student_groups=None):
             .filter(user_token__in=student_ids)
         )
 
-    switched_answers = answers.exclude(
-        second_answer_choice=F("first_answer_choice")
-    )
     sums = collections.Counter(
-        total_answers=answers.count(),
-        correct_first_answers=answers.filter(
-            first_answer_choice__in=correct_choices
-        ).count(),
-        correct_second_answers=answers.filter(
-            second_answer_choice__in=correct_choices
-        ).count(),
-        switches=switched_answers.count(),
+        total_answers=0,
+        correct_first_answers=0,
+        correct_second_answers=0,
+        switches=0,
     )
-    for choice_index in range(1, question.answerchoice_set.count() + 1):
-        key = ("switches", choice_index)
-        if count := switched_answers.filter(
-            second_answer_choice=choice_index
-        ).count():
-            sums[key] = count
+    for transition in get_transitions(answers):
+        first, second, n = (
+            transition["first"],
+            transition["second"],
+            transition["n"],
+        )
+        sums["total_answers"] += n
+        if first in correct_choices:
+            sums["correct_first_answers"] += n
+        if second in correct_choices:
+            sums["correct_second_answers"] += n
+        # Answers without both choices count as switches
+        if first is None or first != second:
+            sums["switches"] += n
+            if second is not None and 1 <= second <= len(choices):
+                sums[("switches", second)] += n
     # Get a set of all user tokens.  DISTINCT queries are not implemented for
     # MySQL, so this is the only way I can think of to determine the number of
     # students who answered at least one question in an assignment.
@@ -190,39 +192,7 @@ def get_question_rationale_aggregates(
         answers = answers.filter(second_answer_choice=choice_id)
 
     # Get indices of the correct answer choice(s)
-    answerchoice_correct = question.answerchoice_set.values_list(
-        "correct", flat=True
-    )
-    correct_choices = list(
-        itertools.compress(itertools.count(1), answerchoice_correct)
-    )
-
-    # Helper function collects chosen rationales and the number of times used
-    # from a list of answers
-    def _top_rationales(answer_list):
-        # Count the chosen rationales for the given answer list, counting the
-        # answer's original rationale if there's no related chosen rationale
-        # (the student stuck with their original rationale) and the function
-        # was called with include_own_rationales=True
-        counts = collections.Counter(
-            a.chosen_rationale
-            or (
-                # If a.chosen_rationale isn't truthy (in other words, if it is
-                # None), count a itself if include_own_rationales is True;
-                # otherwise, count None
-                a
-                if include_own_rationales
-                else None
-            )
-            for a in answer_list.select_related("chosen_rationale")
-        )
-
-        # Return a list of dicts, sorted by descending count
-        sorted_list = [
-            {"rationale": rationale, "count": counts[rationale]}
-            for rationale in sorted(counts, key=counts.get, reverse=True)
-        ]
-        return sorted_list[:perpage], len(sorted_list)
+    correct_choices = question.get_correct_choices()
 
     # Collect the upvoted rationales, sorted by descending upvotes
     output = {"upvoted": []}
@@ -236,23 +206,32 @@ def get_question_rationale_aggregates(
     sums = collections.Counter()
     sums["upvoted"] = upvoted.count()
 
+    # Count the chosen rationales for all answers at once, counting the
+    # answer's original rationale if there's no related chosen rationale
+    # (the student stuck with their original rationale) and the function
+    # was called with include_own_rationales=True, or None otherwise
+    transitions = get_transitions(answers, include_own_rationales)
+
     # Collect top rationales chosen for all answers
-    output["chosen"], sums["chosen"] = _top_rationales(answers)
+    output["chosen"], sums["chosen"] = get_top_rationales(transitions, perpage)
 
     # Collect top rationales chosen for answers switched from wrong to right
-    wrong_to_right = answers.exclude(
-        first_answer_choice__in=correct_choices
-    ).filter(second_answer_choice__in=correct_choices)
-    output["wrong_to_right"], sums["wrong_to_right"] = _top_rationales(
-        wrong_to_right
+    output["wrong_to_right"], sums["wrong_to_right"] = get_top_rationales(
+        transitions,
+        perpage,
+        lambda t: t["first"] not in correct_choices
+        and t["second"] in correct_choices,
     )
 
     # Collect top rationales chosen for answers switched from right to wrong
-    right_to_wrong = answers.exclude(
-        second_answer_choice__in=correct_choices
-    ).filter(first_answer_choice__in=correct_choices)
-    output["right_to_wrong"], sums["right_to_wrong"] = _top_rationales(
-        right_to_wrong
+    output["right_to_wrong"], sums["right_to_wrong"] = get_top_rationales(
+        transitions,
+        perpage,
+        lambda t: t["second"] not in correct_choices
+        and t["first"] in correct_choices,
+    )
+    load_rationales(
+        output["chosen"], output["wrong_to_right"], output["right_to_wrong"]
     )
 
     # Return the sums and final sorted lists of rationales
@@ -4,8 +4,12 @@ ElasticSearch endpoint
 Object serialization must match with REST API for component compatability.
 """
 
+import logging
+
 import bleach
 from django.contrib.auth.models import User
+from django.db.models import Count
+from django.urls import reverse
 from django_elasticsearch_dsl import Document
 from django_elasticsearch_dsl.fields import (
     BooleanField,
@@ -22,12 +26,15 @@ from elasticsearch_dsl import analyzer, token_filter, tokenizer
 from peerinst.models import (
     AnswerChoice,
     Category,
+    Collection,
     Discipline,
     Question,
     QuestionFlag,
 )
 from peerinst.templatetags.bleach_html import ALLOWED_TAGS
 
+logger = logging.getLogger("search")
+
 html_strip = analyzer(
     "html_strip",
     tokenizer="whitespace",
@@ -130,9 +137,16 @@ class QuestionDocument(Document):
     video_url = TextField(index=False)
 
     def prepare_answer_count(self, instance):
+        if hasattr(instance, "_document_data"):
+            return sum(
+                counts["student"]
+                for counts in instance.get_answer_statistics().values()
+            )
         return instance.answer_count
 
     def prepare_assignment_count(self, instance):
+        if hasattr(instance, "_document_data"):
+            return instance._document_data["assignment_count"]
         return instance.assignment_count
 
     def prepare_answerchoice_set(self, instance):
@@ -166,13 +180,17 @@ class QuestionDocument(Document):
         return []
 
     def prepare_collections(self, instance):
+        if hasattr(instance, "_document_data"):
+            return instance._document_data["collections"]
         return [
             {"title": c.title, "url": c.get_absolute_url()}
             for c in instance.collections
         ]
 
     def prepare_deleted(self, instance):
-        return instance in type(instance).deleted_questions()
+        if hasattr(instance, "_document_data"):
+            return instance._document_data["deleted"]
+        return instance.is_deleted
 
     def prepare_difficulty(self, instance):
         d = instance.get_difficulty()
@@ -191,6 +209,8 @@ class QuestionDocument(Document):
         return {"title": ""}
 
     def prepare_featured(self, instance):
+        if hasattr(instance, "_document_data"):
+            return instance._document_data["featured"]
         return instance.featured
 
     def prepare_frequency(self, instance):
@@ -247,13 +267,127 @@ class QuestionDocument(Document):
         }
 
     def prepare_valid(self, instance):
+        if hasattr(instance, "_document_data"):
+            return instance._document_data["valid"]
         return (
             instance.is_not_flagged and instance.is_not_missing_answer_choices
         )
 
+    def prepare(self, instance):
+        # The difficulty, frequency, matrix and peer impact are all computed
+        # from the same answer statistics
+        prefetched = getattr(instance, "_answer_statistics", None) is not None
+        if not prefetched:
+            Question.prefetch_answer_statistics([instance])
+        try:
+            return super().prepare(instance)
+        finally:
+            if not prefetched:
+                del instance._answer_statistics
+
     def get_queryset(self):
         return super().get_queryset().select_related("discipline", "user")
 
+    def get_indexing_queryset(self):
+        """
+        Yields the questions to index in chunks of `queryset_pagination`, with
+        the data of all fields fetched for each chunk in set based queries.
+        """
+        queryset = self.get_queryset().order_by("pk")
+        chunk_size = self.django.queryset_pagination
+        n = queryset.count()
+
+        deleted = Question.deleted_question_pks()
+        featured = set(Collection.featured_questions())
+
+        indexed = 0
+        last_pk = None
+        while True:
+            chunk = (
+                queryset
+                if last_pk is None
+                else queryset.filter(pk__gt=last_pk)
+            )
+            questions = self.prefetch(
+                chunk.select_related("user__saltisemember").prefetch_related(
+                    "answerchoice_set", "category", "collaborators"
+                )[:chunk_size],
+                deleted,
+                featured,
+            )
+            if not questions:
+                break
+            yield from questions
+
+            last_pk = questions[-1].pk
+            indexed += len(questions)
+            logger.info(f"Prepared {indexed}/{n} questions for indexing")
+
+    def prefetch(self, questions, deleted, featured):
+        """
+        Fetches the data of all fields for a chunk of questions and stores it
+        on the instances so `prepare` doesn't query each question separately.
+
+        Parameters
+        ----------
+        questions : Iterable[Question]
+            Questions to prefetch, with their answer choices, categories and
+            collaborators already prefetched
+        deleted : Set[int]
+            Primary keys of deleted questions
+        featured : Set[int]
+            Primary keys of featured questions
+
+        Returns
+        -------
+        List[Question]
+            Questions with their data
+        """
+        questions = list(questions)
+        if not questions:
+            return questions
+
+        Question.prefetch_answer_statistics(questions)
+
+        assignment_counts = dict(
+            Question.objects.filter(pk__in=[q.pk for q in questions])
+            .annotate(n=Count("assignment", distinct=True))
+            .values_list("pk", "n")
+        )
+
+        flagged = set(
+            QuestionFlag.objects.filter(
+                question__in=questions, flag=True
+            ).values_list("question", flat=True)
+        )
+        collections = {question.pk: [] for question in questions}
+        for question_pk, pk, title in Collection.objects.filter(
+            assignments__questions__in=questions
+        ).values_list("assignments__questions", "pk", "title"):
+            collections[question_pk].append(
+                {
+                    "title": title,
+                    "url": reverse("collection-detail", kwargs={"pk": pk}),
+                }
+            )
+
+        for question in questions:
+            answer_choices = question.answerchoice_set.all()
+            missing_answer_choices = question.type == "PI" and (
+                len(answer_choices) <= 1
+                or not any(choice.correct for choice in answer_choices)
+            )
+            question._document_data = {
+                "assignment_count": assignment_counts[question.pk],
+                "collections": collections[question.pk],
+                "deleted": question.pk in deleted,
+                "featured": question.pk in featured,
+                "valid": question.pk not in flagged
+                and not missing_answer_choices,
+            }
+
+        return questions
+
     def get_instances_from_related(self, related_instance):
         for model in [Category, Discipline, User]:
             if isinstance(related_instance, model):
@@ -271,6 +405,7 @@ class QuestionDocument(Document):
         fields = [
             "type",
         ]
+        queryset_pagination = 500
         related_models = [
             AnswerChoice,
             Category,
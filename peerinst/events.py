@@ -0,0 +1,245 @@
+"""
+Tracking events emitted while students answer questions.
+
+Events are put on a bounded in-process queue and written in batches by a
+background thread, keeping the writes off the request path. When the queue
+is full, the thread emitting the event flushes it itself, which slows the
+producers down instead of growing the queue. The queue is also flushed when
+the process exits.
+
+Where the events are written is set by `EVENT_SINK`:
+    "log" (default)
+        One JSON line per event through the `peerinst.views.views` logger,
+        as before the queue existed
+    "database"
+        `LtiEvent` rows, inserted with `bulk_create`
+
+Setting `EVENT_FLUSH_INTERVAL` to None writes each event synchronously.
+
+When a batch can't be written, its events are written one by one, and those
+still failing are written to the log.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+
+import pytz
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger("peerinst-views")
+event_logger = logging.getLogger("peerinst.views.views")
+
+
+def write_to_database(events):
+    """
+    Inserts the events as `LtiEvent` rows.
+
+    Parameters
+    ----------
+    events : List[Dict[str, Any]]
+        Events as built by `QuestionFormView.emit_event`
+    """
+    LtiEvent = apps.get_model(app_label="peerinst", model_name="LtiEvent")
+    # a failed insert mustn't break a transaction the event is emitted in
+    with transaction.atomic():
+        LtiEvent.objects.bulk_create(
+            [
+                LtiEvent(
+                    event_type=event["event_type"],
+                    username=event.get("username"),
+                    assignment_id=event["event"].get("assignment_id"),
+                    question_id=event["event"].get("question_id"),
+                    event_log=event,
+                    timestamp=_parse_time(event.get("time")),
+                )
+                for event in events
+            ],
+            batch_size=getattr(settings, "EVENT_BATCH_SIZE", 500),
+        )
+
+
+def write_to_log(events):
+    """
+    Writes the events as JSON lines through the logger.
+
+    Parameters
+    ----------
+    events : List[Dict[str, Any]]
+        Events as built by `QuestionFormView.emit_event`
+    """
+    for event in events:
+        event_logger.info(json.dumps(event))
+
+
+SINKS = {"database": write_to_database, "log": write_to_log}
+
+
+def _parse_time(time):
+    if time is None:
+        return datetime.now(pytz.utc)
+    time = datetime.fromisoformat(time)
+    if time.tzinfo is None:
+        time = pytz.timezone(settings.TIME_ZONE).localize(time)
+    return time
+
+
+class EventQueue:
+    """
+    Bounded queue of events written in batches by a background thread.
+
+    Parameters
+    ----------
+    write : Callable[[List[Dict[str, Any]]], None]
+        Function writing a batch of events
+    max_size : int
+        Number of events above which the emitting thread flushes the queue
+    batch_size : int
+        Number of queued events waking up the background thread before the
+        end of its interval
+    interval : Optional[float]
+        Maximum number of seconds events wait in the queue, or None to write
+        each event synchronously
+    """
+
+    def __init__(self, write, max_size, batch_size, interval):
+        self.write = write
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue = queue.Queue(max_size)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def put(self, event):
+        """
+        Adds an event to the queue, starting the background thread if needed.
+
+        Parameters
+        ----------
+        event : Dict[str, Any]
+            Event to write
+        """
+        if self.interval is None:
+            self._write([event])
+            return
+
+        self._start()
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                break
+            except queue.Full:
+                self.flush()
+
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """
+        Writes all the queued events.
+        """
+        with self._lock:
+            events = []
+            while True:
+                try:
+                    events.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if events:
+                self._write(events)
+
+    def _write(self, events):
+        # losing events mustn't break the students' answers
+        try:
+            self.write(events)
+            return
+        except Exception:
+            logger.exception(f"A batch of {len(events)} events failed.")
+
+        failed = events
+        if len(events) > 1:
+            failed = []
+            for event in events:
+                try:
+                    self.write([event])
+                except Exception:
+                    failed.append(event)
+
+        if failed and self.write is not write_to_log:
+            try:
+                write_to_log(failed)
+                failed = []
+            except Exception:
+                logger.exception("Events couldn't be written to the log.")
+        if failed:
+            logger.error(f"{len(failed)} events couldn't be written.")
+
+    def _start(self):
+        # the thread doesn't survive forks of the worker processes
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(
+                target=self._run, name="peerinst-events", daemon=True
+            ).start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            close_old_connections()
+            self.flush()
+
+
+_queue = None
+
+
+def get_queue():
+    """
+    Returns the event queue of the process, creating it from the settings.
+
+    Returns
+    -------
+    EventQueue
+        Queue
+    """
+    global _queue
+    if _queue is None:
+        _queue = EventQueue(
+            SINKS[getattr(settings, "EVENT_SINK", "log")],
+            max_size=getattr(settings, "EVENT_QUEUE_SIZE", 10000),
+            batch_size=getattr(settings, "EVENT_BATCH_SIZE", 500),
+            interval=getattr(settings, "EVENT_FLUSH_INTERVAL", 5),
+        )
+    return _queue
+
+
+def emit(event):
+    """
+    Queues an event to be written.
+
+    Parameters
+    ----------
+    event : Dict[str, Any]
+        Event as built by `QuestionFormView.emit_event`
+    """
+    get_queue().put(event)
+
+
+@atexit.register
+def flush():
+    """
+    Writes the queued events, called when the process exits.
+    """
+    if _queue is not None:
+        _queue.flush()
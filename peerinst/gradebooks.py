@@ -1,9 +1,12 @@
 import csv
+from itertools import islice
 
+from django.conf import settings
 from django.db.models.functions import Lower
 
 from .models import (
     Answer,
+    StudentAssignment,
     StudentGroup,
     StudentGroupAssignment,
     StudentGroupMembership,
@@ -78,6 +81,38 @@ def compute_gradebook(group_pk, assignment_pk=None):
                 }]
             }
 
+    Raises
+    ------
+    StudentGroup.DoesNotExist
+        When the group pk doesn't correspond to an existing group
+    StudentGroupAssignment.DoesNotExist
+        When the assignment pk doesn't correspond to an existing group
+    """
+    results = iter_gradebook(group_pk, assignment_pk)
+    results["results"] = list(results["results"])
+    return results
+
+
+def iter_gradebook(group_pk, assignment_pk=None):
+    """
+    Same as `compute_gradebook`, but the `results` are a generator computing
+    the rows of the gradebook as they are consumed. Students and their
+    answers are fetched in chunks of `GRADEBOOK_CHUNK_SIZE` (default : 100)
+    students, so only the rows of one chunk are built at a time.
+
+    Parameters
+    ----------
+    group_pk : int
+        Primary key of the group for which to compute the gradebook
+    assignment_pk : Optional[int] (default : None)
+        Primary key of the assignment for which to compute the gradebook
+
+    Returns
+    -------
+    Dict[str, Any]
+        Gradebook in the format of `compute_gradebook` with `results` being
+        an iterator
+
     Raises
     ------
     StudentGroup.DoesNotExist
@@ -88,87 +123,192 @@ def compute_gradebook(group_pk, assignment_pk=None):
     group = StudentGroup.objects.get(pk=group_pk)
 
     if assignment_pk is not None:
-        assignment = StudentGroupAssignment.objects.get(pk=assignment_pk)
+        assignment = StudentGroupAssignment.objects.select_related(
+            "assignment"
+        ).get(pk=assignment_pk)
     else:
         assignment = None
 
-    memberships = StudentGroupMembership.objects.filter(group=group).order_by(
-        Lower("student__student__email")
+    memberships = (
+        StudentGroupMembership.objects.filter(group=group)
+        .select_related("student__student")
+        .order_by(Lower("student__student__email"))
     )
 
     if assignment is None:
-        assignments = group.studentgroupassignment_set.filter(
-            distribution_date__isnull=False
-        ).order_by("distribution_date")
-        results = {
+        assignments = list(
+            group.studentgroupassignment_set.filter(
+                distribution_date__isnull=False
+            )
+            .select_related("assignment")
+            .order_by("distribution_date")
+        )
+        return {
             "group": group.title,
             "assignments": [
                 _assignment.assignment.identifier
                 for _assignment in assignments
             ],
             "school_id_needed": group.student_id_needed,
-            "results": [
-                {
-                    "school_id": membership.student_school_id
-                    if group.student_id_needed
-                    else None,
-                    "email": membership.student.student.email,
-                    "assignments": [
-                        {
-                            key: val
-                            for key, val in _assignment.studentassignment_set.get(  # noqa
-                                student=membership.student
-                            ).results.items()
-                            if key in ("n_completed", "grade")
-                        }
-                        if _assignment.studentassignment_set.filter(
-                            student=membership.student
-                        ).exists()
-                        else None
-                        for _assignment in assignments
-                    ],
-                }
-                for membership in memberships
-            ],
+            "results": _iter_group_results(group, assignments, memberships),
         }
 
     else:
-        answers = Answer.objects.filter(assignment=assignment.assignment)
         questions = assignment.questions
-        results = {
+        return {
             "group": group.title,
             "assignment": assignment.assignment.title,
             "questions": [question.title for question in questions],
             "school_id_needed": group.student_id_needed,
-            "results": [
-                {
-                    "school_id": membership.student_school_id
-                    if group.student_id_needed
-                    else None,
-                    "email": membership.student.student.email,
-                    "questions": [
-                        answers.get(
-                            question=question,
-                            user_token=membership.student.student.username,
-                        ).grade
-                        if answers.filter(
-                            question=question,
-                            user_token=membership.student.student.username,
-                        ).exists()
-                        else None
-                        for question in questions
-                    ],
-                }
-                for membership in memberships
-            ],
+            "results": _iter_assignment_results(
+                group, assignment, questions, memberships
+            ),
         }
 
-    return results
+
+def _iter_memberships(memberships):
+    chunk_size = getattr(settings, "GRADEBOOK_CHUNK_SIZE", 100)
+    memberships = memberships.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(memberships, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_group_results(group, assignments, memberships):
+    questions = {
+        _assignment.pk: _assignment.questions for _assignment in assignments
+    }
+
+    for memberships_ in _iter_memberships(memberships):
+        student_assignments = set(
+            StudentAssignment.objects.filter(
+                group_assignment__in=assignments,
+                student__in=[
+                    membership.student_id for membership in memberships_
+                ],
+            ).values_list("group_assignment", "student")
+        )
+        answers = _first_answers(
+            [_assignment.assignment_id for _assignment in assignments],
+            [
+                membership.student.student.username
+                for membership in memberships_
+            ],
+        )
+
+        for membership in memberships_:
+            results = []
+            for _assignment in assignments:
+                if (
+                    _assignment.pk,
+                    membership.student_id,
+                ) not in student_assignments:
+                    results.append(None)
+                    continue
+                answers_ = [
+                    answers.get(
+                        (
+                            _assignment.assignment_id,
+                            membership.student.student.username,
+                            question.pk,
+                        )
+                    )
+                    for question in questions[_assignment.pk]
+                ]
+                results.append(
+                    {
+                        "n_completed": sum(
+                            answer is not None and answer.completed
+                            for answer in answers_
+                        ),
+                        "grade": sum(
+                            0 if answer is None else answer.grade
+                            for answer in answers_
+                        ),
+                    }
+                )
+
+            yield {
+                "school_id": membership.student_school_id
+                if group.student_id_needed
+                else None,
+                "email": membership.student.student.email,
+                "assignments": results,
+            }
+
+
+def _iter_assignment_results(group, assignment, questions, memberships):
+    for memberships_ in _iter_memberships(memberships):
+        answers = _first_answers(
+            [assignment.assignment_id],
+            [
+                membership.student.student.username
+                for membership in memberships_
+            ],
+        )
+
+        for membership in memberships_:
+            answers_ = [
+                answers.get(
+                    (
+                        assignment.assignment_id,
+                        membership.student.student.username,
+                        question.pk,
+                    )
+                )
+                for question in questions
+            ]
+            yield {
+                "school_id": membership.student_school_id
+                if group.student_id_needed
+                else None,
+                "email": membership.student.student.email,
+                "questions": [
+                    None if answer is None else answer.grade
+                    for answer in answers_
+                ],
+            }
+
+
+def _first_answers(assignment_pks, usernames):
+    """
+    Fetches in a single query the answers of the students to the given
+    assignments, keeping the first answer to each question.
+
+    Parameters
+    ----------
+    assignment_pks : List[str]
+        Primary keys of the assignments
+    usernames : List[str]
+        Usernames of the students
+
+    Returns
+    -------
+    Dict[Tuple[str, str, int], Answer]
+        First answer for each assignment, username and question
+    """
+    answers = {}
+    for answer in (
+        Answer.objects.filter(
+            assignment__in=assignment_pks, user_token__in=usernames
+        )
+        .with_grading()
+        .order_by("pk")
+    ):
+        answers.setdefault(
+            (answer.assignment_id, answer.user_token, answer.question_id),
+            answer,
+        )
+    return answers
 
 
 def convert_gradebook_to_csv(results):
     """
-    Converts the gradebook results to a csv generator.
+    Converts the gradebook results to a csv generator. The `results` may be
+    the iterator of `iter_gradebook`, in which case rows are computed as the
+    csv is consumed.
     Parameters
     ----------
     results : Dict[str, Any]
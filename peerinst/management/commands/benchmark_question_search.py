@@ -0,0 +1,225 @@
+import random
+from timeit import default_timer as timer
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.test import override_settings
+
+from peerinst.models import (
+    Answer,
+    AnswerChoice,
+    Category,
+    Discipline,
+    Question,
+    QuestionSearchIndex,
+)
+from peerinst.util import question_search_function, ranked_question_search
+
+WORDS = (
+    "force acceleration velocity energy momentum charge field current "
+    "voltage resistance wave frequency light lens mirror pressure volume "
+    "temperature entropy heat gas molecule atom electron photon nucleus "
+    "reaction equilibrium acid base cell protein enzyme gene membrane "
+    "population function derivative integral limit matrix vector graph "
+    "probability distribution sample mean variance angle triangle circle"
+).split()
+
+
+USERNAME = "benchmark-question-search"
+
+
+def _bulk_create(model, objs):
+    # bulk_create only sets the primary keys on some databases, so the new
+    # rows are fetched back as those after the previous last primary key
+    last = model.objects.aggregate(last=Max("pk"))["last"] or 0
+    model.objects.bulk_create(objs)
+    return list(model.objects.filter(pk__gt=last).order_by("pk"))
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the question search with and without the search index on a "
+        "synthetic corpus. InnoDB full-text indexes only include committed "
+        "rows, so the corpus is committed to the default database and "
+        "deleted at the end: run it on a scratch database, whose name must "
+        "be given with --database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            required=True,
+            help="Name of the default database, as a confirmation that it "
+            "is a scratch database",
+        )
+        parser.add_argument(
+            "--n-questions",
+            type=int,
+            default=50000,
+            help="Number of questions to create",
+        )
+        parser.add_argument(
+            "--max-answers",
+            type=int,
+            default=5,
+            help="Maximum number of answers to each question",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of times each search is timed",
+        )
+        parser.add_argument(
+            "terms",
+            nargs="*",
+            default=["force", "light wave", "entropy of a gas", "zzz"],
+            help="Searches to time",
+        )
+
+    def handle(self, *args, **options):
+        if options["database"] != connection.settings_dict["NAME"]:
+            raise CommandError(
+                f"The default database is "
+                f"{connection.settings_dict['NAME']!r}, not "
+                f"{options['database']!r}."
+            )
+        if User.objects.filter(username=USERNAME).exists():
+            raise CommandError(
+                f"The user {USERNAME!r} already exists, probably from an "
+                "interrupted run whose corpus wasn't deleted."
+            )
+
+        start = timer()
+        with transaction.atomic():
+            corpus = self._create_corpus(
+                options["n_questions"], options["max_answers"]
+            )
+        self.stdout.write(f"Corpus created in {timer() - start:.1f}s")
+
+        try:
+            start = timer()
+            QuestionSearchIndex.refresh(corpus["questions"])
+            self.stdout.write(f"Index built in {timer() - start:.1f}s")
+
+            for term in options["terms"]:
+                for indexed in (False, True):
+                    with override_settings(QUESTION_SEARCH_INDEX=indexed):
+                        self._time(term, indexed, options["repeat"])
+        finally:
+            self._delete_corpus(corpus)
+
+    def _time(self, term, indexed, repeat):
+        searches = {
+            "search": lambda: list(
+                question_search_function(term, is_old_query=True)[:50]
+            ),
+            "ranked search": lambda: list(
+                ranked_question_search(
+                    [term] + term.split(), Question.objects.all()
+                )[:50]
+            ),
+            "ranked count": lambda: ranked_question_search(
+                [term] + term.split(), Question.objects.all()
+            ).count(),
+        }
+        for name, search in searches.items():
+            times = []
+            for _ in range(repeat):
+                start = timer()
+                search()
+                times.append(timer() - start)
+            self.stdout.write(
+                f"{term!r:20} {name:14} "
+                f"{'index' if indexed else 'legacy':7} "
+                f"{min(times) * 1000:10.1f}ms"
+            )
+
+    def _delete_corpus(self, corpus):
+        # the corpus was created without signals, so it is deleted without
+        # them, child tables first
+        questions = corpus["questions"]
+        with transaction.atomic():
+            for queryset in (
+                Answer.objects.filter(question__in=questions),
+                AnswerChoice.objects.filter(question__in=questions),
+                Question.category.through.objects.filter(
+                    question__in=questions
+                ),
+                QuestionSearchIndex.objects.filter(question__in=questions),
+                Question.objects.filter(pk__in=questions),
+                Category.objects.filter(pk__in=corpus["categories"]),
+                Discipline.objects.filter(pk__in=corpus["disciplines"]),
+                User.objects.filter(pk=corpus["user"]),
+            ):
+                queryset._raw_delete(queryset.db)
+
+    def _create_corpus(self, n_questions, max_answers):
+        user = User.objects.create(username=USERNAME)
+        disciplines = _bulk_create(
+            Discipline,
+            [Discipline(title=f"benchmark {word}") for word in WORDS[:10]],
+        )
+        categories = _bulk_create(
+            Category, [Category(title=f"benchmark {word}") for word in WORDS]
+        )
+        Question.objects.bulk_create(
+            [
+                Question(
+                    title=f"benchmark {i} "
+                    + " ".join(random.sample(WORDS, 3)),
+                    text=" ".join(random.choices(WORDS, k=40)),
+                    user=user,
+                    discipline=random.choice(disciplines),
+                )
+                for i in range(n_questions)
+            ],
+            batch_size=1000,
+        )
+        questions = list(
+            Question.objects.filter(user=user).only("pk").order_by("pk")
+        )
+        Question.category.through.objects.bulk_create(
+            [
+                Question.category.through(
+                    question_id=question.pk,
+                    category_id=random.choice(categories).pk,
+                )
+                for question in questions
+            ],
+            batch_size=1000,
+        )
+        AnswerChoice.objects.bulk_create(
+            [
+                AnswerChoice(
+                    question_id=question.pk,
+                    text=" ".join(random.choices(WORDS, k=5)),
+                    correct=i == 0,
+                )
+                for question in questions
+                for i in range(4)
+            ],
+            batch_size=1000,
+        )
+        Answer.objects.bulk_create(
+            [
+                Answer(
+                    question_id=question.pk,
+                    first_answer_choice=random.randint(1, 4),
+                    second_answer_choice=random.randint(1, 4),
+                    rationale=" ".join(random.choices(WORDS, k=10)),
+                    user_token=f"benchmark{i}",
+                )
+                for question in questions
+                for i in range(random.randint(0, max_answers))
+            ],
+            batch_size=1000,
+        )
+        return {
+            "user": user.pk,
+            "disciplines": [discipline.pk for discipline in disciplines],
+            "categories": [category.pk for category in categories],
+            "questions": [question.pk for question in questions],
+        }
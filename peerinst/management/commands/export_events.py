@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_datetime
+
+from peerinst.models import LtiEvent
+from peerinst.util import export_events
+
+
+class Command(BaseCommand):
+    help = "Export the LtiEvents to a csv file or a parquet directory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=str)
+        parser.add_argument(
+            "--format", choices=["csv", "parquet"], default="csv"
+        )
+        parser.add_argument("--start", type=parse_datetime)
+        parser.add_argument("--end", type=parse_datetime)
+        parser.add_argument("--chunk-size", type=int, default=100000)
+
+    def handle(self, *args, **options):
+        start = time.time()
+
+        events = LtiEvent.objects.order_by("timestamp", "pk")
+        if options["start"]:
+            events = events.filter(timestamp__gte=options["start"])
+        if options["end"]:
+            events = events.filter(timestamp__lt=options["end"])
+
+        n = export_events(
+            events,
+            options["path"],
+            file_format=options["format"],
+            chunk_size=options["chunk_size"],
+        )
+
+        elapsed = time.time() - start
+        print(f"{n} events exported to {options['path']}")
+        print(
+            f"Took {elapsed:.2f} seconds "
+            f"({n / max(elapsed, 1e-6):.0f} events/s)"
+        )
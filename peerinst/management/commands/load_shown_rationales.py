@@ -9,6 +9,7 @@ from peerinst.util import (
     load_shown_rationales_from_ltievent_logs,
     make_daterange,
 )
+from reputation.models import ReputationCounter
 
 LOGGER = logging.getLogger("peerinst")
 
@@ -31,9 +32,24 @@ class Command(BaseCommand):
             day=31, month=12, year=2018, tzinfo=pytz.utc
         )
 
+        n_events = 0
+        n_created = 0
         for day_of_logs in make_daterange(start_date, end_date):
             print(day_of_logs)
-            load_shown_rationales_from_ltievent_logs(day_of_logs)
+            events, created = load_shown_rationales_from_ltievent_logs(
+                day_of_logs
+            )
+            n_events += events
+            n_created += created
 
+        # bulk_create doesn't send the signals updating the counters
+        if n_created:
+            ReputationCounter.refresh()
+
+        elapsed = time.time() - start
         print("Completed loading shown rationales")
-        print(f"Took {time.time() - start:.2f} seconds")
+        print(f"{n_events} events read, {n_created} shown rationales created")
+        print(
+            f"Took {elapsed:.2f} seconds "
+            f"({n_events / max(elapsed, 1e-6):.0f} events/s)"
+        )
@@ -5,7 +5,7 @@ import time
 import pytz
 from django.core.management.base import BaseCommand
 
-from peerinst.task import populate_answer_start_time_from_ltievent_logs_task
+from peerinst.tasks import populate_answer_start_time_from_ltievent_logs_task
 from peerinst.util import make_daterange
 
 LOGGER = logging.getLogger("peerinst-models")
@@ -31,11 +31,23 @@ class Command(BaseCommand):
 
         event_type = options["event_type"][0]
 
+        n_events = 0
+        n_updated = 0
         for day_of_logs in make_daterange(start_date, end_date):
             LOGGER.info(day_of_logs)
-            populate_answer_start_time_from_ltievent_logs_task(
+            (
+                events,
+                updated,
+            ) = populate_answer_start_time_from_ltievent_logs_task(
                 day_of_logs=day_of_logs, event_type=event_type
             )
+            n_events += events
+            n_updated += updated
 
+        elapsed = time.time() - start
         LOGGER.info("Completed populating datetime_start for Answer objects")
-        LOGGER.info(f"Took {time.time() - start:.2f} seconds")
+        LOGGER.info(f"{n_events} events read, {n_updated} answers updated")
+        LOGGER.info(
+            f"Took {elapsed:.2f} seconds "
+            f"({n_events / max(elapsed, 1e-6):.0f} events/s)"
+        )
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from peerinst.models import QuestionSearchIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuild the question search index from the questions."
+
+    def handle(self, *args, **options):
+        QuestionSearchIndex.refresh()
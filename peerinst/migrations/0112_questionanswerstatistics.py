@@ -0,0 +1,80 @@
+# Generated by Django 3.2.23 on 2026-10-18 20:49
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def populate_question_answer_statistics(apps, _):
+    Answer = apps.get_model("peerinst", "Answer")
+    QuestionAnswerStatistics = apps.get_model(
+        "peerinst", "QuestionAnswerStatistics"
+    )
+
+    rows = (
+        Answer.objects.values("question", "first_answer_choice")
+        .annotate(
+            second=Coalesce("second_answer_choice", 0),
+            n_student=Count(
+                "pk",
+                filter=Q(expert=False, second_answer_choice__gt=0)
+                & ~Q(user_token=""),
+            ),
+            n_frequency=Count(
+                "pk",
+                filter=Q(
+                    expert=False,
+                    first_answer_choice__gt=0,
+                    second_answer_choice__gt=0,
+                ),
+            ),
+            n_all=Count(
+                "pk", filter=Q(first_answer_choice__gt=0, expert=False)
+            ),
+        )
+        .filter(Q(n_student__gt=0) | Q(n_all__gt=0))
+        .order_by()
+    )
+    QuestionAnswerStatistics.objects.bulk_create(
+        (
+            QuestionAnswerStatistics(
+                question_id=row["question"],
+                first_answer_choice=row["first_answer_choice"],
+                second_answer_choice=row["second"],
+                n_student=row["n_student"],
+                n_frequency=row["n_frequency"],
+                n_all=row["n_all"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('peerinst', '0111_auto_20220809_0311'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionAnswerStatistics',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_answer_choice', models.PositiveSmallIntegerField()),
+                ('second_answer_choice', models.PositiveSmallIntegerField()),
+                ('n_student', models.PositiveIntegerField(default=0)),
+                ('n_frequency', models.PositiveIntegerField(default=0)),
+                ('n_all', models.PositiveIntegerField(default=0)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='peerinst.question')),
+            ],
+            options={
+                'unique_together': {('question', 'first_answer_choice', 'second_answer_choice')},
+            },
+        ),
+        migrations.RunPython(
+            populate_question_answer_statistics, migrations.RunPython.noop
+        ),
+    ]
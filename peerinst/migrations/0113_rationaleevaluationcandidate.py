@@ -0,0 +1,27 @@
+# Generated by Django 3.2.23 on 2026-10-18 21:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('peerinst', '0112_questionanswerstatistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RationaleEvaluationCandidate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField()),
+                ('answer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='peerinst.answer')),
+                ('discipline', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='peerinst.discipline')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='rationaleevaluationcandidate',
+            index=models.Index(fields=['discipline', 'rank'], name='peerinst_ra_discipl_8f19ae_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.23 on 2026-10-18 22:05
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('peerinst', '0113_rationaleevaluationcandidate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ltievent',
+            name='event_log',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='ltievent',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, null=True),
+        ),
+    ]
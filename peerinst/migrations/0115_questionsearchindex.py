@@ -0,0 +1,47 @@
+# Generated by Django 3.2.23 on 2026-10-18 22:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+import peerinst.models.search
+
+
+TABLE = "peerinst_questionsearchindex"
+
+
+def add_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        for column in ("text", "extended_text"):
+            schema_editor.execute(
+                f"CREATE FULLTEXT INDEX {TABLE}_{column}_ft "
+                f"ON {TABLE} ({column})"
+            )
+
+
+def remove_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        for column in ("text", "extended_text"):
+            schema_editor.execute(f"DROP INDEX {TABLE}_{column}_ft ON {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('peerinst', '0114_ltievent_event_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSearchIndex',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_index', serialize=False, to='peerinst.question')),
+                ('text', peerinst.models.search.SearchTextField(blank=True)),
+                ('extended_text', peerinst.models.search.SearchTextField(blank=True)),
+                ('n_answers', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='questionsearchindex',
+            index=models.Index(fields=['n_answers'], name='peerinst_qu_n_answe_02b0e3_idx'),
+        ),
+        migrations.RunPython(add_fulltext_indexes, remove_fulltext_indexes),
+    ]
@@ -2,6 +2,19 @@ import bleach
 from django.apps import apps
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import (
+    BooleanField,
+    Case,
+    Count,
+    Exists,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -9,7 +22,7 @@ from peerinst.templatetags.bleach_html import ALLOWED_TAGS
 from quality.models import Quality
 
 from .assignment import Assignment
-from .question import GradingScheme, Question
+from .question import Discipline, GradingScheme, Question
 
 
 class AnswerMayShowManager(models.Manager):
@@ -24,6 +37,109 @@ class AnswerMayShowManager(models.Manager):
         )
 
 
+class AnswerQuerySet(models.QuerySet):
+    def with_grading(self):
+        """
+        Annotates the answers with their correctness, completion and grade,
+        computed in the database with the same rules as the `first_correct`,
+        `correct`, `completed` and `grade` properties.
+
+        Returns
+        -------
+        QuerySet[Answer]
+            Answers annotated with:
+                is_first_correct : bool
+                is_correct : bool
+                is_completed : bool
+                grade_value : Optional[float]
+                    None if the grading scheme isn't implemented
+        """
+        second_answer_needed = Q(question__second_answer_needed=True)
+        return (
+            self.annotate(
+                is_first_correct=Case(
+                    When(question__type="RO", then=Value(True)),
+                    default=_choice_is_correct("first_answer_choice"),
+                    output_field=BooleanField(),
+                ),
+            )
+            .annotate(
+                is_correct=Case(
+                    When(
+                        second_answer_needed,
+                        then=Case(
+                            When(
+                                Q(second_answer_choice__isnull=True),
+                                then=Value(False),
+                            ),
+                            default=_choice_is_correct("second_answer_choice"),
+                            output_field=BooleanField(),
+                        ),
+                    ),
+                    default=F("is_first_correct"),
+                    output_field=BooleanField(),
+                ),
+                is_completed=Case(
+                    When(
+                        second_answer_needed
+                        & Q(second_answer_choice__isnull=True),
+                        then=Value(False),
+                    ),
+                    default=Value(True),
+                    output_field=BooleanField(),
+                ),
+            )
+            .annotate(
+                grade_value=Case(
+                    When(
+                        Q(question__grading_scheme=GradingScheme.STANDARD)
+                        | Q(question__type="RO"),
+                        then=Case(
+                            When(Q(is_correct=True), then=Value(1.0)),
+                            default=Value(0.0),
+                        ),
+                    ),
+                    When(
+                        question__grading_scheme=GradingScheme.ADVANCED,
+                        then=Case(
+                            When(
+                                Q(is_correct=True, is_first_correct=True),
+                                then=Value(1.0),
+                            ),
+                            When(
+                                Q(is_correct=True) | Q(is_first_correct=True),
+                                then=Value(0.5),
+                            ),
+                            default=Value(0.0),
+                        ),
+                    ),
+                    default=None,
+                    output_field=FloatField(),
+                )
+            )
+        )
+
+
+def _choice_is_correct(field):
+    # answer choices are numbered from 1 in the order of their pk
+    position = (
+        AnswerChoice.objects.filter(
+            question=OuterRef("question"), pk__lte=OuterRef("pk")
+        )
+        .values("question")
+        .annotate(n=Count("pk"))
+        .values("n")
+        .order_by()
+    )
+    return Exists(
+        AnswerChoice.objects.filter(
+            question=OuterRef("question"), correct=True
+        )
+        .annotate(position=Subquery(position))
+        .filter(position=OuterRef(field))
+    )
+
+
 class AnswerChoice(models.Model):
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     text = models.CharField(_("Text"), max_length=500)
@@ -48,7 +164,7 @@ class AnswerChoice(models.Model):
 
 
 class Answer(models.Model):
-    objects = models.Manager()
+    objects = AnswerQuerySet.as_manager()
     may_show = AnswerMayShowManager()
 
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
@@ -144,6 +260,8 @@ class Answer(models.Model):
         bool:
             Answer is correct or not
         """
+        if hasattr(self, "is_correct"):
+            return bool(self.is_correct)
         if self.question.second_answer_needed:
             if self.second_answer_choice is None:
                 return False
@@ -162,6 +280,8 @@ class Answer(models.Model):
         bool:
             First answer is correct or not
         """
+        if hasattr(self, "is_first_correct"):
+            return bool(self.is_first_correct)
         if self.question.type == "RO":
             return RationaleOnlyQuestion.is_correct(self.first_answer_choice)
 
@@ -177,6 +297,8 @@ class Answer(models.Model):
         bool:
             if the answer corresponds to a completed question.
         """
+        if hasattr(self, "is_completed"):
+            return bool(self.is_completed)
 
         if self.question.second_answer_needed:
             return self.second_answer_choice is not None
@@ -186,6 +308,8 @@ class Answer(models.Model):
     @property
     def grade(self):
         """Compute grade based on grading scheme of question."""
+        if getattr(self, "grade_value", None) is not None:
+            return self.grade_value
         if (
             self.question.grading_scheme == GradingScheme.STANDARD
             or isinstance(self.question, RationaleOnlyQuestion)
@@ -356,3 +480,21 @@ class AnswerAnnotation(models.Model):
 
     class Meta:
         unique_together = ["answer", "annotator"]
+
+
+class RationaleEvaluationCandidate(models.Model):
+    """
+    Answer of a discipline which teachers may be asked to evaluate, with its
+    position in the discipline's evaluation queue. The queue is rebuilt in
+    the background by `rationale_annotation.refresh_evaluation_queue`.
+    """
+
+    discipline = models.ForeignKey(Discipline, on_delete=models.CASCADE)
+    answer = models.OneToOneField(Answer, on_delete=models.CASCADE)
+    rank = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.answer_id} at {self.rank} for {self.discipline}"
+
+    class Meta:
+        indexes = [models.Index(fields=["discipline", "rank"])]
@@ -1,12 +1,26 @@
 import base64
 import logging
+import uuid
+from collections import defaultdict
 from datetime import datetime, timedelta
 
 import bleach
 import pytz
+from django.apps import apps
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core import validators
+from django.core.cache import cache
 from django.db import models
+from django.db.models import (
+    Avg,
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Min,
+    Q,
+)
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -16,10 +30,6 @@ from quality.models import Quality
 from reputation.models import Reputation
 
 from ..tasks import distribute_assignment_to_students_async
-from ..util import (
-    get_average_time_spent_on_all_question_start,
-    student_list_from_student_groups,
-)
 from ..utils import format_time
 from .group import StudentGroup
 from .question import Question
@@ -452,6 +462,10 @@ class StudentGroupAssignment(models.Model):
     @property
     def student_progress(self):
         """
+        Returns the progress of the students on each question, cached for
+        `STUDENT_PROGRESS_TIMEOUT` seconds or until an answer to the
+        assignment is saved.
+
         Returns
         -------
         [
@@ -466,37 +480,108 @@ class StudentGroupAssignment(models.Model):
                     number of correct first answers
                 "n_correct": int
                     number of correct answers
+                "time_spent": Optional[str]
+                    average time spent on the question by the students of
+                    the group
 
             }
         ]
         """
-        results = [
-            student_assignment.detailed_results
-            for student_assignment in self.studentassignment_set.all()
-        ]
+        version = cache.get_or_set(
+            f"student_progress_version:{self.assignment_id}",
+            lambda: uuid.uuid4().hex,
+            None,
+        )
+        return cache.get_or_set(
+            f"student_progress:{version}:{self.pk}",
+            self.compute_student_progress,
+            getattr(settings, "STUDENT_PROGRESS_TIMEOUT", 30),
+        )
+
+    @staticmethod
+    def invalidate_student_progress(assignment_pk):
+        """
+        Removes the cached progress of all groups for the given assignment.
+
+        Parameters
+        ----------
+        assignment_pk : str
+            Primary key of the assignment
+        """
+        cache.delete(f"student_progress_version:{assignment_pk}")
+
+    def compute_student_progress(self):
+        """
+        Computes `student_progress` with one query counting the completed
+        and correct first answers of each student to each question and one
+        query averaging the time spent on each question.
+        """
+        Answer = apps.get_model(app_label="peerinst", model_name="answer")
 
+        questions = self.questions
+        questions_ = [question.pk for question in questions]
+
+        first_answers = (
+            Answer.objects.filter(
+                assignment=self.assignment_id,
+                question__in=questions_,
+                user_token__in=self.studentassignment_set.values(
+                    "student__student__username"
+                ),
+            )
+            .values("user_token", "question")
+            .annotate(first=Min("pk"))
+            .values("first")
+        )
+
+        counts = defaultdict(
+            lambda: {"n_completed": 0, "n_first_correct": 0, "n_correct": 0}
+        )
+        for row in (
+            Answer.objects.filter(pk__in=first_answers)
+            .with_grading()
+            .values("question")
+            .annotate(
+                n_completed=Count("pk", filter=Q(is_completed=True)),
+                n_first_correct=Count("pk", filter=Q(is_first_correct=True)),
+                n_correct=Count("pk", filter=Q(is_correct=True)),
+            )
+            .values("question", "n_completed", "n_first_correct", "n_correct")
+            .order_by()
+        ):
+            counts[row.pop("question")] = row
+
+        times = {
+            question_pk: time.seconds
+            for question_pk, time in Answer.objects.filter(
+                question__in=questions_,
+                user_token__in=self.group.students.exclude(
+                    student__username="student"
+                ).values("student__username"),
+            )
+            .annotate(
+                time_spent=ExpressionWrapper(
+                    F("datetime_second") - F("datetime_start"),
+                    DurationField(),
+                )
+            )
+            .values("question")
+            .annotate(time=Avg("time_spent"))
+            .values_list("question", "time")
+            .order_by()
+            if time is not None
+        }
+
+        n_students = self.studentassignment_set.count()
         return [
             {
                 "question_id": question.id,
                 "question_title": question.title,
-                "n_students": len(results),
-                "n_completed": sum(
-                    result[i]["completed"] for result in results
-                ),
-                "n_first_correct": sum(
-                    result[i]["first_correct"] for result in results
-                ),
-                "n_correct": sum(result[i]["correct"] for result in results),
-                "time_spent": format_time(
-                    get_average_time_spent_on_all_question_start(
-                        student_list=student_list_from_student_groups(
-                            group_list=[self.group.pk]
-                        ),
-                        question_id=question.pk,
-                    )
-                ),
+                "n_students": n_students,
+                **counts[question.pk],
+                "time_spent": format_time(times.get(question.pk)),
             }
-            for i, question in enumerate(self.questions)
+            for question in questions
         ]
 
     @property
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -23,7 +24,8 @@ class LtiEvent(models.Model):
     assignment_id = models.CharField(max_length=100, blank=True, null=True)
     username = models.CharField(max_length=100, blank=True, null=True)
     event_type = models.CharField(max_length=100)
-    timestamp = models.DateTimeField(auto_now_add=True, null=True)
+    event_log = models.JSONField(default=dict, blank=True)
+    timestamp = models.DateTimeField(default=timezone.now, null=True)
 
     def __str__(self):
         return str(self.timestamp)
@@ -1,19 +1,22 @@
 import hashlib
 import itertools
 import string
+import uuid
+from collections import Counter, defaultdict
 from datetime import datetime
 
 import bleach
 import pandas as pd
 import pytz
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericRelation
 from django.core import exceptions
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery
 from django.utils.html import escape, strip_tags
 from django.utils.translation import gettext_lazy as _
 
@@ -384,29 +387,68 @@ class Question(models.Model):
     @classmethod
     def deleted_questions(cls):
         """
-        Exclude questions which are part of any Teacher's deleted_questions,
-        and have no answers
+        Questions which are part of any Teacher's deleted_questions and have
+        no answers, as a lazy queryset.
         """
         Teacher = apps.get_model(app_label="peerinst", model_name="teacher")
+        Answer = apps.get_model(app_label="peerinst", model_name="answer")
 
-        return cache.get_or_set(
-            "deleted_questions",
-            cls.objects.filter(
-                pk__in=set(
-                    Teacher.objects.all()
-                    .prefetch_related("deleted_questions__question")
-                    .values_list("deleted_questions__question", flat=True)
-                ).intersection(
-                    set(
-                        cls.objects.all()
-                        .annotate(answer_count=Count("answer"))
-                        .filter(answer_count=0)
-                        .values_list("id", flat=True)
-                    )
+        return cls.objects.filter(
+            Exists(
+                Teacher.deleted_questions.through.objects.filter(
+                    question=OuterRef("pk")
                 )
             ),
-            60,
+            ~Exists(Answer.objects.filter(question=OuterRef("pk"))),
+        )
+
+    @classmethod
+    def deleted_question_pks(cls):
+        """
+        Primary keys of the `deleted_questions`, cached until a teacher's
+        deleted questions change or one of these questions is answered.
+
+        Returns
+        -------
+        FrozenSet[int]
+            Primary keys of the deleted questions
+        """
+        return cache.get_or_set(
+            cls._deleted_questions_key(),
+            lambda: frozenset(
+                cls.deleted_questions().values_list("pk", flat=True)
+            ),
+            getattr(settings, "DELETED_QUESTIONS_TIMEOUT", 60 * 60),
+        )
+
+    @classmethod
+    def invalidate_deleted_questions(cls, answered_question_pk=None):
+        """
+        Removes the cached `deleted_question_pks`.
+
+        Parameters
+        ----------
+        answered_question_pk : Optional[int] (default : None)
+            Question which was just answered. As a new answer can only
+            remove its question from the deleted questions, the cache is only
+            removed if that question is in it.
+        """
+        if answered_question_pk is not None:
+            deleted = cache.get(cls._deleted_questions_key())
+            if deleted is None or answered_question_pk not in deleted:
+                return
+        cache.delete("deleted_questions_version")
+
+    @staticmethod
+    def _deleted_questions_key():
+        version = cache.get_or_set(
+            "deleted_questions_version", lambda: uuid.uuid4().hex, None
         )
+        return f"deleted_questions:{version}"
+
+    @property
+    def is_deleted(self):
+        return self.pk in Question.deleted_question_pks()
 
     @classmethod
     def is_missing_answer_choices(cls, queryset):
@@ -718,9 +760,10 @@ class Question(models.Model):
         return self.answerchoice_set.all()[index - 1].correct
 
     def get_correct_choices(self):
-        answerchoice_correct = self.answerchoice_set.values_list(
-            "correct", flat=True
-        )
+        # Read from `all` so prefetched answer choices are reused
+        answerchoice_correct = [
+            choice.correct for choice in self.answerchoice_set.all()
+        ]
         return list(
             itertools.compress(itertools.count(1), answerchoice_correct)
         )
@@ -778,14 +821,140 @@ class Question(models.Model):
 
         return qs
 
+    @staticmethod
+    def compute_answer_statistics(questions):
+        """
+        Counts in a single query the answers to each question for each pair
+        of first and second answer choices. Each count is given for the three
+        sets of answers used by the statistics:
+            student : answers of `get_student_answers`
+            frequency : student answers with both choices
+            all : non expert answers with a first choice
+
+        Parameters
+        ----------
+        questions : Iterable[Question]
+            Questions for which to compute the statistics
+
+        Returns
+        -------
+        Dict[int, Dict[Tuple[Optional[int], Optional[int]], Dict[str, int]]]
+            Counts for each first and second choice, by question pk
+        """
+        Answer = apps.get_model(app_label="peerinst", model_name="Answer")
+
+        questions = list(questions)
+        statistics = {question.pk: {} for question in questions}
+        rows = (
+            Answer.objects.filter(question__in=questions)
+            .values("question", "first_answer_choice", "second_answer_choice")
+            .annotate(
+                student=Count(
+                    "pk",
+                    filter=Q(expert=False, second_answer_choice__gt=0)
+                    & ~Q(user_token=""),
+                ),
+                frequency=Count(
+                    "pk",
+                    filter=Q(
+                        expert=False,
+                        first_answer_choice__gt=0,
+                        second_answer_choice__gt=0,
+                    ),
+                ),
+                all=Count(
+                    "pk", filter=Q(first_answer_choice__gt=0, expert=False)
+                ),
+            )
+            .order_by()
+        )
+        for row in rows:
+            statistics[row["question"]][
+                (row["first_answer_choice"], row["second_answer_choice"])
+            ] = {
+                "student": row["student"],
+                "frequency": row["frequency"],
+                "all": row["all"],
+            }
+        return statistics
+
+    @staticmethod
+    def prefetch_answer_statistics(questions):
+        """
+        Reads the materialized answer statistics of all `questions` in a
+        single query and stores them on each instance, like
+        `prefetch_related` would, so that `get_difficulty`,
+        `get_peer_impact`, `get_matrix` and `get_frequency` don't query them.
+
+        Parameters
+        ----------
+        questions : Iterable[Question]
+            Questions for which to read the statistics
+
+        Returns
+        -------
+        List[Question]
+            The questions
+        """
+        questions = list(questions)
+        statistics = {question.pk: {} for question in questions}
+        for row in QuestionAnswerStatistics.objects.filter(
+            question__in=questions
+        ):
+            statistics[row.question_id][
+                (row.first_answer_choice, row.second_answer_choice or None)
+            ] = {
+                "student": row.n_student,
+                "frequency": row.n_frequency,
+                "all": row.n_all,
+            }
+        for question in questions:
+            question._answer_statistics = statistics[question.pk]
+        return questions
+
+    def get_answer_statistics(self):
+        """
+        Returns the prefetched or materialized answer statistics.
+
+        Returns
+        -------
+        Dict[Tuple[Optional[int], Optional[int]], Dict[str, int]]
+            Counts for each first and second choice as returned by
+            `compute_answer_statistics`
+        """
+        statistics = getattr(self, "_answer_statistics", None)
+        if statistics is None:
+            question = Question(pk=self.pk)
+            Question.prefetch_answer_statistics([question])
+            statistics = question._answer_statistics
+        return statistics
+
+    def _count_answers_by_type(self, statistics, correct_choices):
+        """
+        Counts the student answers of each type of `get_answers_by_type`
+        from the answer statistics.
+        """
+        counts = {"RR": 0, "RW": 0, "WR": 0, "WW": 0}
+        for (first, second), n in statistics.items():
+            type_ = ("R" if first in correct_choices else "W") + (
+                "R" if second in correct_choices else "W"
+            )
+            counts[type_] += n["student"]
+        counts["*R"] = counts["RR"] + counts["WR"]
+        counts["*W"] = counts["RW"] + counts["WW"]
+        return counts
+
     def get_difficulty(self):
         MIN_ANSWERS = 30
         UPPER_BOUND = 0.50
         LOWER_BOUND = 0.25
 
-        N = self.get_student_answers().count()
+        counts = self._count_answers_by_type(
+            self.get_answer_statistics(), self.get_correct_choices()
+        )
+        N = counts["*R"] + counts["*W"]
         if N > MIN_ANSWERS:
-            difficulty = self.get_answers_by_type(answer_type="*W").count() / N
+            difficulty = counts["*W"] / N
             if difficulty >= UPPER_BOUND:
                 difficulty_label = self.DIFFICULTY_LABELS[2]
             elif difficulty < LOWER_BOUND:
@@ -801,13 +970,13 @@ class Question(models.Model):
         MIN_ANSWERS = 30
         UPPER_BOUND = 0.25
         LOWER_BOUND = 0.05
-        N = self.get_student_answers().count()
 
+        counts = self._count_answers_by_type(
+            self.get_answer_statistics(), self.get_correct_choices()
+        )
+        N = counts["*R"] + counts["*W"]
         if N > MIN_ANSWERS:
-            peer_impact = (
-                self.get_answers_by_type(answer_type="RW").count()
-                + self.get_answers_by_type(answer_type="WR").count()
-            ) / N
+            peer_impact = (counts["RW"] + counts["WR"]) / N
             if peer_impact >= UPPER_BOUND:
                 peer_impact_label = self.PEER_IMPACT_LABELS[2]
             elif peer_impact < LOWER_BOUND:
@@ -827,36 +996,23 @@ class Question(models.Model):
         matrix["peer"] = 0
 
         answer_choices = self.answerchoice_set.all()
-        correct_choices = self.get_correct_choices()
+        correct_choices = [
+            i
+            for i, answer_choice in enumerate(answer_choices, 1)
+            if answer_choice.correct
+        ]
 
         # There must be more choices than correct choices for valid matrix
-        if answer_choices.count() > len(correct_choices):
-            student_answers = self.get_student_answers()
-            N = len(student_answers)
+        if len(answer_choices) > len(correct_choices):
+            counts = self._count_answers_by_type(
+                self.get_answer_statistics(), correct_choices
+            )
+            N = counts["*R"] + counts["*W"]
             if N > 0:
-
-                easy = self.get_answers_by_type(answer_type="RR").count()
-
-                hard = self.get_answers_by_type(answer_type="WW").count()
-
-                tricky = self.get_answers_by_type(answer_type="RW").count()
-
-                # peer = (
-                #     student_answers.exclude(
-                #         first_answer_choice__in=correct_choices
-                #     )
-                #     .filter(second_answer_choice__in=correct_choices)
-                #     .count()
-                # )
-
-                # assert easy + hard + tricky + peer == N
-
-                peer = N - easy - tricky - hard
-
-                matrix["easy"] = float(easy) / N
-                matrix["hard"] = float(hard) / N
-                matrix["tricky"] = float(tricky) / N
-                matrix["peer"] = float(peer) / N
+                matrix["easy"] = float(counts["RR"]) / N
+                matrix["hard"] = float(counts["WW"]) / N
+                matrix["tricky"] = float(counts["RW"]) / N
+                matrix["peer"] = float(counts["WR"]) / N
 
         return matrix
 
@@ -864,20 +1020,20 @@ class Question(models.Model):
         choice1 = {}
         choice2 = {}
         frequency = {}
-        if all_rationales:
-            # all rationales, including those entered as samples by teachers,
-            # but exclude expert rationales, since they are no longer shown
-            # to students on review step
-            student_answers = self.answer_set.filter(
-                first_answer_choice__gt=0
-            ).exclude(expert=True)
-        else:
-            # only rationales entered by students
-            student_answers = (
-                self.answer_set.filter(expert=False)
-                .filter(first_answer_choice__gt=0)
-                .filter(second_answer_choice__gt=0)
+        # With all rationales, include those entered as samples by teachers,
+        # but exclude expert rationales, since they are no longer shown to
+        # students on review step. Otherwise, only rationales entered by
+        # students.
+        statistics = self.get_answer_statistics()
+        population = "all" if all_rationales else "frequency"
+        first_counts = {}
+        second_counts = {}
+        for (first, second), n in statistics.items():
+            first_counts[first] = first_counts.get(first, 0) + n[population]
+            second_counts[second] = (
+                second_counts.get(second, 0) + n[population]
             )
+
         c = 1
         for answerChoice in self.answerchoice_set.all():
             label = (
@@ -889,12 +1045,8 @@ class Question(models.Model):
             )
             if len(label) > 50:
                 label = label[0:50] + "..."
-            choice1[label] = student_answers.filter(
-                first_answer_choice=c
-            ).count()
-            choice2[label] = student_answers.filter(
-                second_answer_choice=c
-            ).count()
+            choice1[label] = first_counts.get(c, 0)
+            choice2[label] = second_counts.get(c, 0)
             c = c + 1
 
         frequency["first_choice"] = choice1
@@ -989,9 +1141,8 @@ class Question(models.Model):
             }
         ]
         """
-        answerchoice_correct = self.answerchoice_set.values_list(
-            "correct", flat=True
-        )
+        answerchoices = self.answerchoice_set.all()
+        answerchoice_correct = [choice.correct for choice in answerchoices]
 
         q_answerchoices = {
             i: (
@@ -1013,7 +1164,7 @@ class Question(models.Model):
         # possible number of answer_choices.
         # Remove those answers
         answer_qs = self.answer_set.filter(
-            first_answer_choice__lte=self.answerchoice_set.count()
+            first_answer_choice__lte=len(answerchoices)
         )
 
         if answer_qs.count() > 0:
@@ -1074,6 +1225,170 @@ class Question(models.Model):
         verbose_name_plural = _("questions")
 
 
+class QuestionAnswerStatistics(models.Model):
+    """
+    Materialized answer counts of `Question.compute_answer_statistics`, with
+    one row for each question and pair of first and second answer choices.
+    The counts are updated incrementally when answers are saved or deleted
+    and reconciled periodically by `refresh`. A missing second answer choice
+    is stored as 0.
+    """
+
+    question = models.ForeignKey(Question, on_delete=models.CASCADE)
+    first_answer_choice = models.PositiveSmallIntegerField()
+    second_answer_choice = models.PositiveSmallIntegerField()
+    n_student = models.PositiveIntegerField(default=0)
+    n_frequency = models.PositiveIntegerField(default=0)
+    n_all = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = (
+            "question",
+            "first_answer_choice",
+            "second_answer_choice",
+        )
+
+    @staticmethod
+    def answer_values(answer, saved=False):
+        """
+        Returns the values of the answer used by the statistics, read from
+        its saved row if `saved`, or None if they aren't available.
+        """
+        fields = (
+            "question_id",
+            "first_answer_choice",
+            "second_answer_choice",
+            "expert",
+            "user_token",
+        )
+        if saved:
+            if answer._state.adding:
+                return None
+            values = (
+                type(answer)
+                ._base_manager.filter(pk=answer.pk)
+                .values_list(*fields)
+                .first()
+            )
+            if values is None:
+                return None
+        elif answer.get_deferred_fields() & set(fields):
+            return None
+        else:
+            values = tuple(getattr(answer, field) for field in fields)
+        question_pk, first, second, expert, user_token = values
+        return (question_pk, first, second or 0, expert, user_token)
+
+    @classmethod
+    def _add(cls, values, n):
+        question_pk, first, second, expert, user_token = values
+        counts = {
+            "n_student": n * (not expert and second > 0 and user_token != ""),
+            "n_frequency": n * (not expert and bool(first) and second > 0),
+            "n_all": n * (not expert and bool(first)),
+        }
+        if not any(counts.values()):
+            return
+
+        filters = {
+            "question_id": question_pk,
+            "first_answer_choice": first or 0,
+            "second_answer_choice": second,
+        }
+        updates = {key: F(key) + val for key, val in counts.items()}
+        if cls.objects.filter(**filters).update(**updates) or n < 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(**filters, **counts)
+        except IntegrityError:
+            # Created by another process in the meantime
+            cls.objects.filter(**filters).update(**updates)
+
+    @classmethod
+    def update_answer(
+        cls, answer, previous_values=None, created=False, deleted=False
+    ):
+        """
+        Updates the counts for a saved or deleted answer. The counts of the
+        question are recomputed if the previous or current values of the
+        answer aren't known.
+
+        Parameters
+        ----------
+        answer : Answer
+            Answer that was saved or deleted
+        previous_values : Optional[Tuple]
+            Values of the answer as returned by `answer_values` before it was
+            saved or deleted
+        created : bool (default : False)
+            If the answer was just created
+        deleted : bool (default : False)
+            If the answer was deleted
+        """
+        values = None if deleted else cls.answer_values(answer)
+        if (previous_values is None and not created) or (
+            values is None and not deleted
+        ):
+            cls.refresh([answer.question_id])
+            return
+
+        if previous_values is not None:
+            cls._add(previous_values, -1)
+        if values is not None:
+            cls._add(values, 1)
+
+    @classmethod
+    def refresh(cls, question_pks=None, batch_size=500):
+        """
+        Recomputes the counts from the answers.
+
+        Parameters
+        ----------
+        question_pks : Optional[Iterable[int]]
+            Questions to refresh. All questions with answers if None
+        batch_size : int (default : 500)
+            Number of questions computed in each query
+        """
+        if question_pks is None:
+            question_pks = (
+                Question.objects.filter(answer__isnull=False)
+                .values_list("pk", flat=True)
+                .distinct()
+                .order_by("pk")
+                .iterator()
+            )
+        question_pks = iter(question_pks)
+
+        while True:
+            batch = list(itertools.islice(question_pks, batch_size))
+            if not batch:
+                return
+            # missing and 0 choices are both stored as 0
+            rows = defaultdict(Counter)
+            for question_pk, statistics_ in Question.compute_answer_statistics(
+                Question(pk=pk) for pk in batch
+            ).items():
+                for (first, second), counts in statistics_.items():
+                    rows[question_pk, first or 0, second or 0].update(counts)
+            with transaction.atomic():
+                cls.objects.filter(question__in=batch).delete()
+                cls.objects.bulk_create(
+                    [
+                        cls(
+                            question_id=key[0],
+                            first_answer_choice=key[1],
+                            second_answer_choice=key[2],
+                            n_student=counts["student"],
+                            n_frequency=counts["frequency"],
+                            n_all=counts["all"],
+                        )
+                        for key, counts in rows.items()
+                        if any(counts.values())
+                    ]
+                )
+
+
 class QuestionFlagReason(models.Model):
 
     CHOICES = (
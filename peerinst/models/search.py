@@ -1,6 +1,12 @@
+import itertools
+import re
+
+from django.apps import apps
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Count, F, Q
 
 
 class MetaFeature(models.Model):
@@ -46,3 +52,181 @@ class MetaSearch(models.Model):
 
     def __str__(self):
         return f"{self.content_object}: {self.meta_feature}"
+
+
+class SearchTextField(models.TextField):
+    """
+    Text field supporting the `match` lookup, which uses the FULLTEXT index
+    of the column on MySQL.
+    """
+
+
+@SearchTextField.register_lookup
+class Match(models.Lookup):
+    """
+    Matches rows containing all the words of the value, or words starting
+    with them, with `MATCH ... AGAINST` in boolean mode. Only implemented
+    for MySQL: other databases should use `icontains`.
+    """
+
+    lookup_name = "match"
+
+    def get_db_prep_lookup(self, value, connection):
+        query = " ".join(f"+{word}*" for word in re.findall(r"\w+", value))
+        return "%s", [query]
+
+    def as_mysql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return (
+            f"MATCH ({lhs}) AGAINST ({rhs} IN BOOLEAN MODE)",
+            lhs_params + rhs_params,
+        )
+
+
+class QuestionSearchIndex(models.Model):
+    """
+    Searchable text and answer count of a question, used for the question
+    search when `QUESTION_SEARCH_INDEX` is set. Searching a single column of
+    this table replaces the joins on categories, discipline, answer choices
+    and user and the answer count of each search. On MySQL, the text columns
+    have FULLTEXT indexes.
+
+    The rows are updated from signals while the setting is on and rebuilt by
+    `refresh`, which must be run after turning it on.
+    """
+
+    question = models.OneToOneField(
+        "Question",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_index",
+    )
+    # title and text
+    text = SearchTextField(blank=True)
+    # also id, categories, discipline, answer choices and username
+    extended_text = SearchTextField(blank=True)
+    n_answers = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["n_answers"])]
+
+    @staticmethod
+    def is_enabled():
+        return getattr(settings, "QUESTION_SEARCH_INDEX", False)
+
+    @staticmethod
+    def search_filter(search_string, extended=False):
+        """
+        Returns the filter on questions for the search string.
+
+        Parameters
+        ----------
+        search_string : str
+            String searched
+        extended : bool (default : False)
+            If the id, categories, discipline, answer choices and username
+            are also searched
+
+        Returns
+        -------
+        Q
+            Filter on `Question`
+        """
+        field = (
+            "search_index__extended_text" if extended else "search_index__text"
+        )
+        words = re.findall(r"\w+", search_string)
+        # words shorter than the minimum token size of InnoDB aren't indexed
+        if (
+            connection.vendor == "mysql"
+            and words
+            and min(map(len, words)) >= 3
+        ):
+            return Q(**{f"{field}__match": search_string})
+        return Q(**{f"{field}__icontains": search_string})
+
+    @classmethod
+    def update_answers(cls, question_pk, n):
+        """
+        Adds `n` to the answer count of the question, or creates its row if
+        missing.
+
+        Parameters
+        ----------
+        question_pk : int
+            Primary key of the question
+        n : int
+            Number of answers added, negative if removed
+        """
+        if not cls.objects.filter(question_id=question_pk).update(
+            n_answers=F("n_answers") + n
+        ):
+            cls.refresh([question_pk])
+
+    @classmethod
+    def refresh(cls, question_pks=None, batch_size=500):
+        """
+        Recomputes the rows from the questions and their answers.
+
+        Parameters
+        ----------
+        question_pks : Optional[Iterable[int]]
+            Questions to refresh. All questions if None
+        batch_size : int (default : 500)
+            Number of questions computed in each query
+        """
+        Answer = apps.get_model(app_label="peerinst", model_name="Answer")
+        Question = apps.get_model(app_label="peerinst", model_name="Question")
+
+        if question_pks is None:
+            question_pks = (
+                Question.objects.order_by("pk")
+                .values_list("pk", flat=True)
+                .iterator()
+            )
+        question_pks = iter(question_pks)
+
+        while True:
+            batch = list(itertools.islice(question_pks, batch_size))
+            if not batch:
+                return
+            questions = (
+                Question.objects.filter(pk__in=batch)
+                .select_related("discipline", "user")
+                .prefetch_related("category", "answerchoice_set")
+            )
+            n_answers = dict(
+                Answer.objects.filter(question__in=batch)
+                .values("question")
+                .annotate(n=Count("pk"))
+                .values_list("question", "n")
+                .order_by()
+            )
+            with transaction.atomic():
+                cls.objects.filter(question__in=batch).delete()
+                cls.objects.bulk_create(
+                    [
+                        cls(
+                            question=question,
+                            text=cls._text(question),
+                            extended_text=cls._extended_text(question),
+                            n_answers=n_answers.get(question.pk, 0),
+                        )
+                        for question in questions
+                    ]
+                )
+
+    @staticmethod
+    def _text(question):
+        return "\n".join([question.title, question.text])
+
+    @classmethod
+    def _extended_text(cls, question):
+        return "\n".join(
+            [str(question.pk), cls._text(question)]
+            + [category.title for category in question.category.all()]
+            + ([question.discipline.title] if question.discipline else [])
+            + [choice.text for choice in question.answerchoice_set.all()]
+            + ([question.user.username] if question.user else [])
+        )
@@ -1,4 +1,5 @@
 import logging
+from collections import defaultdict
 from datetime import datetime
 from operator import itemgetter
 from urllib.parse import urlparse
@@ -16,7 +17,7 @@ from reputation.models import Reputation
 from ..students import create_student_token, get_student_username_and_password
 from ..tasks import send_mail_async
 from .answer import Answer, ShownRationale
-from .assignment import StudentGroupAssignment
+from .assignment import AssignmentQuestions, StudentGroupAssignment
 from .group import StudentGroup
 
 logger = logging.getLogger("peerinst-models")
@@ -650,6 +651,124 @@ class StudentAssignment(models.Model):
                         self.save()
         return err
 
+    @staticmethod
+    def get_results(student_assignments):
+        """
+        Computes the results of many student assignments at once, with one
+        query for the questions of all assignments and one for the answers
+        of all students.
+
+        Parameters
+        ----------
+        student_assignments : Iterable[StudentAssignment]
+            Student assignments, ideally with `group_assignment` and
+            `student__student` already selected
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            For each student assignment, in the same order
+            {
+                "completed" : bool
+                    if the assignment was completed
+                "detailed_results" : List[Dict[str, Any]]
+                    as in `detailed_results`
+                "results" : Dict[str, Any]
+                    as in `results`
+            }
+        """
+        student_assignments = list(student_assignments)
+        if not student_assignments:
+            return []
+
+        assignment_pks = {
+            student_assignment.group_assignment.assignment_id
+            for student_assignment in student_assignments
+        }
+        usernames = {
+            student_assignment.student.student.username
+            for student_assignment in student_assignments
+        }
+
+        questions = defaultdict(list)
+        for assignment_pk, question_pk in (
+            AssignmentQuestions.objects.filter(assignment__in=assignment_pks)
+            .order_by("rank")
+            .values_list("assignment", "question")
+        ):
+            questions[assignment_pk].append(question_pk)
+
+        # first and last answer for each assignment, student and question
+        answers = {}
+        for answer in (
+            Answer.objects.filter(
+                assignment__in=assignment_pks, user_token__in=usernames
+            )
+            .with_grading()
+            .order_by("pk")
+        ):
+            key = (answer.assignment_id, answer.user_token, answer.question_id)
+            answers.setdefault(key, [answer, answer])[1] = answer
+
+        results = []
+        for student_assignment in student_assignments:
+            group_assignment = student_assignment.group_assignment
+            question_pks = questions[group_assignment.assignment_id]
+            if question_pks and not group_assignment.order:
+                # sets and saves the default order
+                group_assignment.questions
+            if question_pks:
+                question_pks = [
+                    question_pks[i]
+                    for i in map(int, group_assignment.order.split(","))
+                ]
+
+            first_and_last = [
+                answers.get(
+                    (
+                        group_assignment.assignment_id,
+                        student_assignment.student.student.username,
+                        question_pk,
+                    ),
+                    (None, None),
+                )
+                for question_pk in question_pks
+            ]
+            detailed_results = [
+                {
+                    "completed": first is not None and first.completed,
+                    "first_correct": first is not None and first.first_correct,
+                    "correct": first is not None and first.correct,
+                    "grade": 0 if first is None else first.grade,
+                }
+                for first, last in first_and_last
+            ]
+            results.append(
+                {
+                    "completed": all(
+                        last is not None and last.completed
+                        for first, last in first_and_last
+                    ),
+                    "detailed_results": detailed_results,
+                    "results": {
+                        "n": len(detailed_results),
+                        "n_completed": sum(
+                            map(itemgetter("completed"), detailed_results)
+                        ),
+                        "n_first_correct": sum(
+                            map(itemgetter("first_correct"), detailed_results)
+                        ),
+                        "n_correct": sum(
+                            map(itemgetter("correct"), detailed_results)
+                        ),
+                        "grade": sum(
+                            map(itemgetter("grade"), detailed_results)
+                        ),
+                    },
+                }
+            )
+        return results
+
     @property
     def completed(self):
         """
@@ -658,21 +777,7 @@ class StudentAssignment(models.Model):
         bool
             If the assignment was completed
         """
-        return not any(
-            not Answer.objects.filter(
-                assignment=self.group_assignment.assignment,
-                user_token=self.student.student.username,
-                question=question,
-            ).exists()
-            or not Answer.objects.filter(
-                assignment=self.group_assignment.assignment,
-                user_token=self.student.student.username,
-                question=question,
-            )
-            .last()
-            .completed
-            for question in self.group_assignment.questions
-        )
+        return StudentAssignment.get_results([self])[0]["completed"]
 
     @property
     def detailed_results(self):
@@ -693,27 +798,7 @@ class StudentAssignment(models.Model):
                 }
             ]
         """
-        answers = [
-            (
-                Answer.objects.filter(
-                    assignment=self.group_assignment.assignment,
-                    user_token=self.student.student.username,
-                    question=question,
-                )
-                or [None]
-            )[0]
-            for question in self.group_assignment.questions
-        ]
-
-        return [
-            {
-                "completed": answer is not None and answer.completed,
-                "first_correct": answer is not None and answer.first_correct,
-                "correct": answer is not None and answer.correct,
-                "grade": 0 if answer is None else answer.grade,
-            }
-            for answer in answers
-        ]
+        return StudentAssignment.get_results([self])[0]["detailed_results"]
 
     @property
     def results(self):
@@ -734,18 +819,11 @@ class StudentAssignment(models.Model):
                     number of correct answers
             }
         """
-        results = self.detailed_results
-        return {
-            "n": len(results),
-            "n_completed": sum(map(itemgetter("completed"), results)),
-            "n_first_correct": sum(map(itemgetter("first_correct"), results)),
-            "n_correct": sum(map(itemgetter("correct"), results)),
-            "grade": sum(map(itemgetter("grade"), results)),
-        }
+        return StudentAssignment.get_results([self])[0]["results"]
 
     @property
     def grade(self):
-        return sum(map(itemgetter("grade"), self.detailed_results))
+        return self.results["grade"]
 
 
 class StudentNotificationType(models.Model):
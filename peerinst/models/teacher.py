@@ -4,19 +4,17 @@ from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
-from django.db.models import Q
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from quality.models import Quality
 from reputation.models import Reputation
 
-from .answer import Answer
+from ..student_activity import count_new_answers
 from .assignment import Assignment
 from .group import StudentGroup
 from .institution import Institution
 from .question import Discipline, Question
-from .student import Student, StudentGroupAssignment
 
 
 class Teacher(models.Model):
@@ -50,32 +48,7 @@ class Teacher(models.Model):
         return reverse("teacher", kwargs={"pk": self.pk})
 
     def student_activity(self):
-        last_login = self.user.last_login
-        current_groups = self.current_groups.all()
-
-        all_current_students = Student.objects.filter(
-            groups__in=current_groups
-        ).values("student__username")
-
-        all_assignments = StudentGroupAssignment.objects.filter(
-            group__in=current_groups
-        ).values("assignment")
-
-        if last_login is not None:
-            activity = (
-                Answer.objects.filter(assignment__in=all_assignments)
-                .filter(user_token__in=all_current_students)
-                .filter(
-                    Q(datetime_start__gt=last_login)
-                    | Q(datetime_first__gt=last_login)
-                    | Q(datetime_second__gt=last_login)
-                )
-                .count()
-            )
-        else:
-            activity = 0
-
-        return activity
+        return count_new_answers(self)
 
     @staticmethod
     def get(hash_):
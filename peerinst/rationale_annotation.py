@@ -1,10 +1,21 @@
+import heapq
 from operator import itemgetter
 
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Count, Q
 
 from quality.models import Quality
 
-from .models import Answer, AnswerAnnotation, Question, Teacher
+from .models import (
+    Answer,
+    AnswerAnnotation,
+    Discipline,
+    Question,
+    RationaleEvaluationCandidate,
+    Teacher,
+)
+from .utils import batch
 
 
 def choose_questions(teacher):
@@ -25,10 +36,89 @@ def choose_questions(teacher):
     return question_list
 
 
+def refresh_evaluation_queue(disciplines=None):
+    """
+    Rebuilds the evaluation queue of each discipline, ordering its answers
+    by increasing global validation quality if it exists and by most recent
+    first otherwise. Only the first `RATIONALE_EVALUATION_QUEUE_SIZE` answers
+    are kept. The answers are streamed and evaluated `BATCH_SIZE` at a time.
+
+    Parameters
+    ----------
+    disciplines : Optional[Iterable[Discipline]] (default : None)
+        Disciplines for which to rebuild the queue. All of them if None
+    """
+    if disciplines is None:
+        disciplines = Discipline.objects.all()
+    queue_size = getattr(settings, "RATIONALE_EVALUATION_QUEUE_SIZE", 1000)
+
+    if Quality.objects.filter(
+        quality_type__type="global", quality_use_type__type="validation"
+    ).exists():
+        quality = Quality.objects.get(
+            quality_type__type="global", quality_use_type__type="validation"
+        )
+        # without criterions, a single result is returned for all answers
+        if not quality.criterions.exists():
+            quality = None
+    else:
+        quality = None
+
+    batch_size = getattr(settings, "BATCH_SIZE", 128)
+
+    for discipline in disciplines:
+        answers = Answer.objects.filter(
+            question__discipline=discipline
+        ).order_by("-datetime_first")
+
+        if quality is None:
+            ranked = answers.values_list("pk", flat=True)[:queue_size]
+        else:
+            # ties keep the most recent answers first
+            ranked = map(
+                itemgetter(2),
+                heapq.nsmallest(
+                    queue_size,
+                    _evaluate(quality, answers, batch_size),
+                    key=itemgetter(0, 1),
+                ),
+            )
+        ranked = list(ranked)
+
+        with transaction.atomic():
+            # answers whose question changed discipline are removed from
+            # their previous queue
+            RationaleEvaluationCandidate.objects.filter(
+                Q(discipline=discipline)
+                | Q(answer__question__discipline=discipline)
+            ).delete()
+            RationaleEvaluationCandidate.objects.bulk_create(
+                RationaleEvaluationCandidate(
+                    discipline=discipline, answer_id=answer, rank=rank
+                )
+                for rank, answer in enumerate(ranked)
+            )
+
+
+def _evaluate(quality, answers, batch_size):
+    """
+    Yields the (quality, position, pk) of each answer, evaluated in batches.
+    """
+    i = 0
+    for answers_ in batch(answers.iterator(chunk_size=batch_size), batch_size):
+        answers_ = list(answers_)
+        for answer, q in zip(answers_, quality.batch_evaluate(answers_)):
+            yield q[0], i, answer.pk
+            i += 1
+
+
 def choose_rationales(teacher, n=5):
     """
-    Evaluates each rationale based on if the `teacher` should evaluate and
-    returns the top `n` ones.
+    Returns the top `n` rationales of the evaluation queues of the
+    `teacher`'s disciplines which weren't already evaluated by them. The
+    queues are rebuilt by the `refresh_rationale_evaluation_queue` task; while
+    they are empty for the `teacher`'s disciplines, the rationales are chosen
+    with `choose_rationales_no_quality`.
 
     Parameters
     ----------
@@ -45,38 +135,22 @@ def choose_rationales(teacher, n=5):
     assert isinstance(teacher, Teacher), "Precondition failed for `teacher`"
     assert isinstance(n, int), "Precondition failed for `n`"
 
-    answers = (
-        Answer.objects.filter(
-            question__discipline__in=teacher.disciplines.all()
-        )
-        .exclude(
-            pk__in=AnswerAnnotation.objects.filter(
-                annotator=teacher.user
-            ).values_list("answer", flat=True)
-        )
-        .order_by("-datetime_first")
+    candidates = RationaleEvaluationCandidate.objects.filter(
+        discipline__in=teacher.disciplines.all()
     )
-
-    if not answers:
-        return []
-
-    if Quality.objects.filter(
-        quality_type__type="global", quality_use_type__type="validation"
-    ).exists():
-        qualities = list(
-            map(
-                itemgetter(0),
-                Quality.objects.get(
-                    quality_type__type="global",
-                    quality_use_type__type="validation",
-                ).batch_evaluate(answers),
-            )
+    rationales = [
+        candidate.answer
+        for candidate in candidates.exclude(
+            answer__in=AnswerAnnotation.objects.filter(
+                annotator=teacher.user
+            ).values("answer")
         )
-        answers = [
-            a for a, q in sorted(zip(answers, qualities), key=itemgetter(1))
-        ]
-
-    return answers[:n]
+        .select_related("answer")
+        .order_by("rank")[:n]
+    ]
+    if not rationales and not candidates.exists():
+        return list(choose_rationales_no_quality(teacher, n))
+    return rationales
 
 
 def choose_rationales_no_quality(teacher, n=5):
@@ -28,9 +28,11 @@ the "algorithms" dictionary at the end of this file.
 """
 
 import random
-from itertools import chain
+import uuid
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Count, Max
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
@@ -48,86 +50,251 @@ class RationaleSelectionError(Exception):
     """
 
 
-def _base_selection_algorithm(
-    rng,
-    first_answer_choice,
-    unused_entered_rationale,
-    question,
-    selection_callback,
-):
-    """Select the rationales at random."""
-    from . import models  # Local import to avoid circular dependency
+def _rationale_pool_key(question_pk):
+    version = cache.get_or_set(
+        "rationale_pool_version", lambda: uuid.uuid4().hex, None
+    )
+    return f"rationale_pool:{version}:{question_pk}"
 
-    first_choice = first_answer_choice
-    answer_choices = question.answerchoice_set.all()
-    # Find all public rationales for this question.
+
+def _excluded_usernames():
     # Rationales are selected based on those who have not refused
     # to include rationales prior to implementation of TOS
-    usernames_to_exclude = (
+    return (
         Consent.objects.filter(tos__role="student")
         .values("user__username")
         .annotate(Max("datetime"))
         .filter(accepted=False)
         .values_list("user__username")
     )
-    all_rationales = models.Answer.may_show.filter(
-        question=question, show_to_others=True
-    ).exclude(user_token__in=usernames_to_exclude)
 
+
+def _filter_by_quality(answers):
+    """
+    Returns the answers passing every criterion threshold of the global
+    validation quality, or all of them if there is no such quality.
+    """
     try:
         quality = Quality.objects.get(
             quality_type__type="global", quality_use_type__type="validation"
         )
-        batch_size = getattr(settings, "BATCH_SIZE", 128)
-        qualities = chain(
-            *(
-                quality.batch_evaluate(answers)
-                for answers in batch(all_rationales.iterator(), batch_size)
-            )
-        )
-        kept_answers = [
-            answer.pk
-            for answer, q in zip(all_rationales.iterator(), qualities)
+    except Quality.DoesNotExist:
+        return list(answers)
+
+    if not quality.criterions.exists():
+        return list(answers)
+
+    batch_size = getattr(settings, "BATCH_SIZE", 128)
+    kept = []
+    for answers_ in batch(answers, batch_size):
+        answers_ = list(answers_)
+        kept.extend(
+            answer
+            for answer, q in zip(answers_, quality.batch_evaluate(answers_))
             if all(
                 c["quality"]["quality"] >= c["quality"]["threshold"]
                 for c in q[1]
             )
-        ]
-        all_rationales = all_rationales.filter(pk__in=kept_answers)
-    except Quality.DoesNotExist:
-        pass
+        )
+    return kept
 
-    try:
-        """
-        test
-        t = is there at least two answer choices with rationales
-        tt = does my choice have a sample rationale
-        ttt = does at least one correct choice have a sample rationale
-        """
-        t = all_rationales.values("first_answer_choice").annotate(
-            answer_count=Count("first_answer_choice")
-        )[1]
-        tt = (
-            all_rationales.filter(first_answer_choice=first_choice)
-            .values("first_answer_choice")
-            .annotate(answer_count=Count("first_answer_choice"))[0]
+
+def build_rationale_pool(question):
+    """
+    Computes the rationales which may be shown for the question and stores
+    them in the cache.
+
+    Parameters
+    ----------
+    question : Question
+        Question for which to build the pool
+
+    Returns
+    -------
+    Dict[int, List[int]]
+        Primary keys of eligible answers for each first answer choice
+    """
+    from . import models  # Local import to avoid circular dependency
+
+    answers = (
+        models.Answer.may_show.filter(question=question, show_to_others=True)
+        .exclude(user_token__in=_excluded_usernames())
+        .iterator()
+    )
+
+    pool = {}
+    for answer in _filter_by_quality(answers):
+        pool.setdefault(answer.first_answer_choice, []).append(answer.pk)
+
+    cache.set(
+        _rationale_pool_key(question.pk),
+        pool,
+        getattr(settings, "RATIONALE_POOL_TIMEOUT", 60 * 60),
+    )
+    return pool
+
+
+def get_rationale_pool(question):
+    """
+    Returns the rationales which may be shown for the question, building the
+    pool if it isn't cached.
+
+    Parameters
+    ----------
+    question : Question
+        Question for which to get the pool
+
+    Returns
+    -------
+    Dict[int, List[int]]
+        Primary keys of eligible answers for each first answer choice
+    """
+    pool = cache.get(_rationale_pool_key(question.pk))
+    if pool is None:
+        pool = build_rationale_pool(question)
+    return pool
+
+
+def update_rationale_pool(answer, deleted=False):
+    """
+    Adds the answer to the pool of its question if it is eligible, or
+    removes the pool from the cache if it contains the answer and it isn't
+    eligible anymore, so a removal can't be overwritten by a concurrent
+    update. Nothing is done if the pool isn't cached, as it will be built on
+    next use.
+
+    Parameters
+    ----------
+    answer : Answer
+        Answer which was saved, annotated or deleted
+    deleted : bool (default : False)
+        If the answer was deleted
+    """
+    key = _rationale_pool_key(answer.question_id)
+    pool = cache.get(key)
+    if pool is None:
+        return
+
+    eligible = (
+        not deleted
+        and answer.show_to_others
+        and not answer.expert
+        and not answer.answerannotation_set.filter(score=0).exists()
+        and not Consent.objects.filter(
+            tos__role="student",
+            user__username=answer.user_token,
+            accepted=False,
+        ).exists()
+        and bool(_filter_by_quality([answer]))
+    )
+    if eligible:
+        _add_to_rationale_pool(key, answer.first_answer_choice, answer.pk)
+    elif any(answer.pk in pks for pks in pool.values()):
+        _delete_rationale_pool(key)
+
+
+def _add_to_rationale_pool(key, first_answer_choice, pk, retries=3):
+    """
+    Adds the answer to the cached pool with a compare-and-set, so concurrent
+    additions aren't lost. The pool is removed from the cache instead if the
+    cache doesn't support it, the answer moved to another choice or the
+    pool keeps changing.
+    """
+    client = getattr(cache, "_cache", None)
+    if hasattr(client, "gets") and hasattr(client, "cas"):
+        raw_key = cache.make_key(key)
+        timeout = cache.get_backend_timeout(
+            getattr(settings, "RATIONALE_POOL_TIMEOUT", 60 * 60)
         )
-        for i, answer_choice in enumerate(answer_choices, 1):
-            if answer_choice.correct:
-                ttt = (
-                    all_rationales.filter(first_answer_choice=i)
-                    .values("first_answer_choice")
-                    .annotate(answer_count=Count("first_answer_choice"))[0]
-                )
+        for _ in range(retries):
+            pool, token = client.gets(raw_key) or (None, None)
+            if pool is None:
+                return
+            if any(
+                pk in pks
+                for choice, pks in pool.items()
+                if choice != first_answer_choice
+            ):
                 break
+            if pk in pool.get(first_answer_choice, []):
+                return
+            pool.setdefault(first_answer_choice, []).append(pk)
+            if client.cas(raw_key, pool, token, timeout):
+                return
+    _delete_rationale_pool(key)
+
+
+def _delete_rationale_pool(key):
+    # also after the commit, in case the pool was rebuilt from the previous
+    # state in the meantime
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_rationale_pools(question_pks=None):
+    """
+    Removes the cached pools of the given questions, or of all questions if
+    none are given.
 
-    except IndexError:
+    Parameters
+    ----------
+    question_pks : Optional[Iterable[int]] (default : None)
+        Questions for which to invalidate the pool
+    """
+    if question_pks is None:
+        cache.set("rationale_pool_version", uuid.uuid4().hex, None)
+    else:
+        cache.delete_many([_rationale_pool_key(pk) for pk in question_pks])
+
+
+def _base_selection_algorithm(
+    rng,
+    first_answer_choice,
+    unused_entered_rationale,
+    question,
+    selection_callback,
+):
+    """Select the rationales at random."""
+    from . import models  # Local import to avoid circular dependency
+
+    first_choice = first_answer_choice
+    answer_choices = list(question.answerchoice_set.all())
+    # Find all public rationales for this question, grouped by choice.
+    pool = get_rationale_pool(question)
+    counts = {choice: len(pks) for choice, pks in pool.items() if pks}
+
+    """
+    test
+    t = is there at least two answer choices with rationales
+    tt = does my choice have a sample rationale
+    ttt = does at least one correct choice have a sample rationale
+    """
+    first_correct = next(
+        (
+            i
+            for i, answer_choice in enumerate(answer_choices, 1)
+            if answer_choice.correct
+        ),
+        None,
+    )
+    if (
+        len(counts) < 2
+        or first_choice not in counts
+        or (first_correct is not None and first_correct not in counts)
+    ):
         raise RationaleSelectionError(
             gettext(
                 """Can't proceed since the course staff did not
                 provide example answers."""
             )
         )
+
+    def sorted_choices(excluded):
+        return sorted(
+            (choice for choice in counts if choice not in excluded),
+            key=lambda choice: (-counts[choice], choice),
+        )
+
     # Select a second answer to offer at random.
     # If the user's answer wasn't correct, the
     # second answer choice offered must be correct.
@@ -135,36 +302,10 @@ def _base_selection_algorithm(
         # We must make sure that rationales for the second answer exist.
         # The choice is
         # weighted by the number of rationales available.
-        other_rationales = all_rationales.exclude(
-            first_answer_choice=first_choice
-        )
-
-        sorted_choices = (
-            other_rationales.values("first_answer_choice")
-            .annotate(answer_count=Count("first_answer_choice"))
-            .order_by("-answer_count")
-        )
-
-        if len(sorted_choices) > 0:
-            second_choice = sorted_choices[0]["first_answer_choice"]
-        else:
-            second_choice = None
-        if len(sorted_choices) > 1:
-            third_choice = sorted_choices[1]["first_answer_choice"]
-        else:
-            third_choice = None
-
-        # We don't use rng.choice() to avoid fetching all rationales
-        # from the database.
-        try:
-            t = sorted_choices[0]
-        except IndexError:
-            raise RationaleSelectionError(
-                gettext(
-                    """Can't proceed since the course staff did not
-                    provide example answers."""
-                )
-            )
+        others = sorted_choices([first_choice])
+        # At least two choices have rationales, so there is another one
+        second_choice = others[0]
+        third_choice = others[1] if len(others) > 1 else None
 
     else:
         # Select a random correct answer.  We assume that a correct
@@ -173,18 +314,8 @@ def _base_selection_algorithm(
             [i for i, choice in enumerate(answer_choices, 1) if choice.correct]
         )
         if len(answer_choices) > 2:
-            other_rationales = all_rationales.exclude(
-                first_answer_choice__in=[first_choice, second_choice]
-            )
-            sorted_choices = (
-                other_rationales.values("first_answer_choice")
-                .annotate(answer_count=Count("first_answer_choice"))
-                .order_by("-answer_count")
-            )
-            if len(sorted_choices) > 0:
-                third_choice = sorted_choices[0]["first_answer_choice"]
-            else:
-                third_choice = None
+            others = sorted_choices([first_choice, second_choice])
+            third_choice = others[0] if others else None
         else:
             third_choice = None
     chosen_choices = []
@@ -201,19 +332,11 @@ def _base_selection_algorithm(
         if choice:
             label = question.get_choice_label(choice)
             # Get all rationales for the current choice.
-            """
-            only shows expert rationale if there aren't enough non-expert rationales
-            """
-            rationales = (
-                all_rationales.filter(first_answer_choice=choice, expert=False)
-                if all_rationales.filter(
-                    first_answer_choice=choice, expert=False
-                ).count()
-                > 1
-                else all_rationales.filter(first_answer_choice=choice)
+            rationales = models.Answer.objects.filter(
+                pk__in=pool.get(choice, [])
             )
             # Select up to four rationales for each choice, if available.
-            if rationales:
+            if choice in counts:
                 rationales = selection_callback(rng, rationales)
                 rationales = [(r.id, r.rationale) for r in rationales]
             else:
@@ -232,9 +355,10 @@ def simple(
     rng, first_answer_choice, entered_rationale, question, max_rationales=10
 ):
     def callback(rng, rationales):
-        return rng.sample(
-            list(rationales), min(max_rationales, rationales.count())
-        )
+        pks = list(rationales.values_list("pk", flat=True))
+        pks = rng.sample(pks, min(max_rationales, len(pks)))
+        by_pk = rationales.in_bulk(pks)
+        return [by_pk[pk] for pk in pks]
 
     return _base_selection_algorithm(
         rng, first_answer_choice, entered_rationale, question, callback
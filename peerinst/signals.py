@@ -1,11 +1,35 @@
 from django.contrib.auth.signals import user_logged_out
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.signals import request_started
-from django.db.models.signals import post_migrate
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_save,
+)
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import LastLogout, MessageType, StudentNotificationType, UserType
+from quality.models import UsesCriterion
+from tos.models import Consent
+
+from .models import (
+    Answer,
+    AnswerAnnotation,
+    AnswerChoice,
+    LastLogout,
+    MessageType,
+    Question,
+    QuestionAnswerStatistics,
+    QuestionSearchIndex,
+    StudentGroupAssignment,
+    StudentNotificationType,
+    Teacher,
+    UserType,
+)
+from .rationale_choice import invalidate_rationale_pools, update_rationale_pool
+from .student_activity import invalidate_student_activity
 
 
 @receiver(request_started)
@@ -69,3 +93,135 @@ def init_user_types(sender, **kwargs):
     for type_ in types:
         if not UserType.objects.filter(type=type_["type"]).exists():
             UserType.objects.create(**type_)
+
+
+@receiver(post_save, sender=Answer)
+def update_rationale_pool_on_answer_save(sender, instance, **kwargs):
+    update_rationale_pool(instance)
+
+
+@receiver(post_delete, sender=Answer)
+def update_rationale_pool_on_answer_delete(sender, instance, **kwargs):
+    update_rationale_pool(instance, deleted=True)
+
+
+@receiver(post_save, sender=AnswerAnnotation)
+@receiver(post_delete, sender=AnswerAnnotation)
+def update_rationale_pool_on_annotation(sender, instance, **kwargs):
+    update_rationale_pool(instance.answer)
+
+
+@receiver(post_save, sender=Consent)
+def invalidate_rationale_pools_on_consent(sender, instance, **kwargs):
+    if instance.tos.role_id == "student":
+        invalidate_rationale_pools(
+            Answer.objects.filter(user_token=instance.user.username)
+            .values_list("question", flat=True)
+            .distinct()
+        )
+
+
+@receiver(post_save, sender=UsesCriterion)
+@receiver(post_delete, sender=UsesCriterion)
+def invalidate_rationale_pools_on_quality(sender, instance, **kwargs):
+    invalidate_rationale_pools()
+
+
+@receiver(pre_save, sender=Answer)
+def store_answer_statistics_values(sender, instance, **kwargs):
+    instance._statistics_values = QuestionAnswerStatistics.answer_values(
+        instance, saved=True
+    )
+
+
+@receiver(post_save, sender=Answer)
+def update_question_statistics_on_answer_save(
+    sender, instance, created, **kwargs
+):
+    QuestionAnswerStatistics.update_answer(
+        instance, instance._statistics_values, created=created
+    )
+
+
+@receiver(post_delete, sender=Answer)
+def update_question_statistics_on_answer_delete(sender, instance, **kwargs):
+    QuestionAnswerStatistics.update_answer(
+        instance,
+        QuestionAnswerStatistics.answer_values(instance),
+        deleted=True,
+    )
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def invalidate_student_progress_on_answer(sender, instance, **kwargs):
+    if instance.assignment_id is not None:
+        StudentGroupAssignment.invalidate_student_progress(
+            instance.assignment_id
+        )
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def invalidate_student_activity_on_answer(sender, instance, **kwargs):
+    if instance.assignment_id is not None:
+        invalidate_student_activity(instance.assignment_id)
+
+
+@receiver(m2m_changed, sender=Teacher.deleted_questions.through)
+def invalidate_deleted_questions_on_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        Question.invalidate_deleted_questions()
+
+
+@receiver(post_save, sender=Answer)
+def invalidate_deleted_questions_on_answer_save(
+    sender, instance, created, **kwargs
+):
+    if created:
+        Question.invalidate_deleted_questions(instance.question_id)
+
+
+@receiver(post_delete, sender=Answer)
+def invalidate_deleted_questions_on_answer_delete(sender, instance, **kwargs):
+    Question.invalidate_deleted_questions()
+
+
+@receiver(post_save, sender=Question)
+def update_search_index_on_question_save(sender, instance, **kwargs):
+    if QuestionSearchIndex.is_enabled():
+        QuestionSearchIndex.refresh([instance.pk])
+
+
+@receiver(m2m_changed, sender=Question.category.through)
+def update_search_index_on_category_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if QuestionSearchIndex.is_enabled() and action in (
+        "post_add",
+        "post_remove",
+        "post_clear",
+    ):
+        # questions cleared from a category are fixed by the next refresh
+        QuestionSearchIndex.refresh(
+            (pk_set or []) if reverse else [instance.pk]
+        )
+
+
+@receiver(post_save, sender=AnswerChoice)
+@receiver(post_delete, sender=AnswerChoice)
+def update_search_index_on_answer_choice(sender, instance, **kwargs):
+    if QuestionSearchIndex.is_enabled():
+        QuestionSearchIndex.refresh([instance.question_id])
+
+
+@receiver(post_save, sender=Answer)
+def update_search_index_on_answer_save(sender, instance, created, **kwargs):
+    if created and QuestionSearchIndex.is_enabled():
+        QuestionSearchIndex.update_answers(instance.question_id, 1)
+
+
+@receiver(post_delete, sender=Answer)
+def update_search_index_on_answer_delete(sender, instance, **kwargs):
+    if QuestionSearchIndex.is_enabled():
+        QuestionSearchIndex.update_answers(instance.question_id, -1)
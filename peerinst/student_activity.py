@@ -0,0 +1,354 @@
+"""
+Activity of the students of a teacher's current groups, shown on the teacher
+dashboard and in the teacher menu.
+
+Both are computed with a constant number of grouped queries and cached per
+teacher along with the version of each assignment they depend on. Saving or
+deleting an answer changes the version of its assignment, which invalidates
+the cached activity of every teacher following it. The dashboard activity
+doesn't depend on the last dashboard access, which changes on every load:
+the new answers are counted against it from the cached answer times.
+"""
+
+import uuid
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytz
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Min, Q
+from django.db.models.functions import Coalesce
+
+
+def _version_key(assignment_pk):
+    return f"student_activity_version:{assignment_pk}"
+
+
+def invalidate_student_activity(assignment_pk):
+    """
+    Removes the cached activity of all teachers for the given assignment.
+
+    Parameters
+    ----------
+    assignment_pk : str
+        Primary key of the assignment
+    """
+    cache.delete(_version_key(assignment_pk))
+
+
+def _get_or_compute(key, get_assignment_pks, compute):
+    cached = cache.get(key)
+    if cached is not None:
+        versions, value = cached
+        if cache.get_many(list(versions)) == versions:
+            return value
+
+    # versions are read before computing so an answer saved meanwhile
+    # invalidates the result
+    keys = [_version_key(pk) for pk in set(get_assignment_pks())]
+    versions = cache.get_many(keys)
+    missing = {key_: uuid.uuid4().hex for key_ in keys if key_ not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+
+    value = compute()
+    cache.set(
+        key,
+        (versions, value),
+        getattr(settings, "STUDENT_ACTIVITY_TIMEOUT", 5 * 60),
+    )
+    return value
+
+
+def _new_answers(since):
+    return (
+        Q(datetime_start__gt=since)
+        | Q(datetime_first__gt=since)
+        | Q(datetime_second__gt=since)
+    )
+
+
+def count_new_answers(teacher):
+    """
+    Counts the answers given to the group assignments of the teacher's
+    current groups since the teacher last logged in.
+
+    Parameters
+    ----------
+    teacher : Teacher
+        Teacher
+
+    Returns
+    -------
+    int
+        Number of new answers
+    """
+    Answer = apps.get_model(app_label="peerinst", model_name="Answer")
+    Student = apps.get_model(app_label="peerinst", model_name="Student")
+    StudentGroupAssignment = apps.get_model(
+        app_label="peerinst", model_name="StudentGroupAssignment"
+    )
+
+    last_login = teacher.user.last_login
+    if last_login is None:
+        return 0
+
+    group_assignments = StudentGroupAssignment.objects.filter(
+        group__current_groups=teacher
+    )
+
+    def compute():
+        return Answer.objects.filter(
+            _new_answers(last_login),
+            assignment__in=group_assignments.values("assignment"),
+            user_token__in=Student.objects.filter(
+                groups__current_groups=teacher
+            ).values("student__username"),
+        ).count()
+
+    return _get_or_compute(
+        f"student_activity_count:{teacher.pk}:{last_login.timestamp()}",
+        lambda: group_assignments.values_list("assignment", flat=True),
+        compute,
+    )
+
+
+def get_student_activity_data(teacher):
+    """
+    Returns the activity of the students of the teacher's current groups on
+    their recent group assignments and, for lti, on the teacher's recently
+    answered assignments.
+
+    Parameters
+    ----------
+    teacher : Teacher
+        Teacher
+
+    Returns
+    -------
+    Dict[StudentGroup, Dict[Union[StudentGroupAssignment, Assignment], Dict]]
+        For each group and assignment:
+            n_answers : int
+                Number of answers by the students of the group
+            n_new : int
+                Number of these answers since the last dashboard access
+            percent_complete : int
+                Percentage of the questions answered by the students
+    Dict[str, Dict[str, Dict[str, Any]]]
+        Data of the progress charts keyed by group name and assignment
+        identifier, for assignments with answers
+    """
+    StudentGroupAssignment = apps.get_model(
+        app_label="peerinst", model_name="StudentGroupAssignment"
+    )
+
+    def get_assignment_pks():
+        return list(
+            StudentGroupAssignment.objects.filter(
+                group__current_groups=teacher
+            ).values_list("assignment", flat=True)
+        ) + list(teacher.assignments.values_list("pk", flat=True))
+
+    data, json_data = _get_or_compute(
+        f"student_activity:{teacher.pk}",
+        get_assignment_pks,
+        lambda: _compute_student_activity_data(teacher),
+    )
+
+    now = datetime.now(pytz.utc)
+    last_access = teacher.last_dashboard_access or now - timedelta(days=7)
+    for assignments in data.values():
+        for activity in assignments.values():
+            updated = activity.pop("updated")
+            activity["n_new"] = len(updated) - bisect_right(
+                updated, last_access
+            )
+    for assignments in json_data.values():
+        for assignment in assignments.values():
+            assignment["last_login"] = str(last_access)
+            assignment["now"] = str(now)
+
+    return data, json_data
+
+
+def _compute_student_activity_data(teacher):
+    Answer = apps.get_model(app_label="peerinst", model_name="Answer")
+    Student = apps.get_model(app_label="peerinst", model_name="Student")
+    StudentGroupAssignment = apps.get_model(
+        app_label="peerinst", model_name="StudentGroupAssignment"
+    )
+
+    now = datetime.now(pytz.utc)
+    last_week = now - timedelta(days=7)
+    next_week = now + timedelta(days=7)
+    three_months_ago = now - timedelta(days=90)
+
+    groups = list(teacher.current_groups.all())
+    members = defaultdict(set)
+    for group_pk, username in Student.groups.through.objects.filter(
+        group__in=groups
+    ).values_list("group", "student__student__username"):
+        members[group_pk].add(username)
+    usernames = set().union(*members.values())
+
+    # Standalone
+    standalone_assignments_all = StudentGroupAssignment.objects.filter(
+        group__in=groups, distribution_date__isnull=False
+    )
+    standalone_assignments = list(
+        standalone_assignments_all.filter(
+            distribution_date__gte=last_week, due_date__lte=next_week
+        )
+        .select_related("assignment")
+        .annotate(n_questions=Count("assignment__questions"))
+    )
+    # if in between semesters, find most recent standalone assignment
+    if not standalone_assignments:
+        standalone_assignments = list(
+            standalone_assignments_all.select_related("assignment")
+            .annotate(n_questions=Count("assignment__questions"))
+            .order_by("-due_date")[:1]
+        )
+
+    # LTI
+    lti_assignments = teacher.assignments.exclude(
+        identifier__in=standalone_assignments_all.values(
+            "assignment__identifier"
+        )
+    )
+    last_answers = dict(
+        Answer.objects.filter(
+            assignment__in=lti_assignments, user_token__in=usernames
+        )
+        .values("assignment")
+        .annotate(last=Max("datetime_second"))
+        .filter(last__isnull=False)
+        .values_list("assignment", "last")
+        .order_by()
+    )
+    recent_assignments = {
+        assignment
+        for assignment, last in last_answers.items()
+        if last >= last_week
+    }
+    # if in between semesters, simply get assignment of most recent answer,
+    # unless it is older than 3 months
+    if not recent_assignments and last_answers:
+        assignment = max(last_answers, key=last_answers.get)
+        if last_answers[assignment] >= three_months_ago:
+            recent_assignments = {assignment}
+    recent_assignments = list(
+        lti_assignments.filter(pk__in=recent_assignments).annotate(
+            n_questions=Count("questions")
+        )
+    )
+
+    answers = Answer.objects.filter(
+        assignment__in=[ga.assignment_id for ga in standalone_assignments]
+        + [assignment.pk for assignment in recent_assignments],
+        user_token__in=usernames,
+    ).annotate(time=Coalesce("datetime_first", "datetime_second"))
+
+    counts = defaultdict(dict)
+    for row in (
+        answers.values("assignment", "user_token")
+        .annotate(
+            n=Count("pk"),
+            first=Min("time"),
+            last=Max("time"),
+        )
+        .order_by()
+    ):
+        counts[row["assignment"]][row["user_token"]] = row
+
+    # the answers are new since a date if any of their times is after it
+    times = defaultdict(list)
+    updated = defaultdict(list)
+    for assignment, username, time, *times_ in answers.values_list(
+        "assignment",
+        "user_token",
+        "time",
+        "datetime_start",
+        "datetime_first",
+        "datetime_second",
+    ).order_by("time", "pk"):
+        if time is not None:
+            times[assignment].append((username, time))
+        times_ = [time_ for time_ in times_ if time_ is not None]
+        if times_:
+            updated[assignment].append((username, max(times_)))
+
+    all_answers_by_group = {}
+    json_data = {}
+    for group in groups:
+        all_answers_by_group[group] = {}
+        json_data[group.name] = {}
+        students = members[group.pk]
+        if not students:
+            continue
+
+        activities = [
+            (ga, ga.assignment, ga.distribution_date, ga.due_date)
+            for ga in standalone_assignments
+            if ga.group_id == group.pk
+        ] + [
+            (assignment, assignment, None, None)
+            for assignment in recent_assignments
+        ]
+
+        for key, assignment, start, end in activities:
+            if not assignment.n_questions:
+                continue
+            rows = [
+                row
+                for username, row in counts[assignment.pk].items()
+                if username in students
+            ]
+            n_answers = sum(row["n"] for row in rows)
+            if start is None and not n_answers:
+                # lti assignments are only shown if they were answered
+                continue
+
+            # replaced by the number of new answers once read from the cache
+            all_answers_by_group[group][key] = {
+                "n_answers": n_answers,
+                "updated": sorted(
+                    time
+                    for username, time in updated[assignment.pk]
+                    if username in students
+                ),
+                "percent_complete": int(
+                    100.0
+                    * n_answers
+                    / (len(students) * assignment.n_questions)
+                ),
+            }
+
+            if n_answers:
+                # the chart spans the group assignment dates and the answers
+                start = min(
+                    [row["first"] for row in rows if row["first"]]
+                    + ([start] if start else []),
+                    default=None,
+                )
+                end = max(
+                    [row["last"] for row in rows if row["last"]]
+                    + ([end] if end else []),
+                    default=None,
+                )
+                json_data[group.name][assignment.identifier] = {
+                    "distribution_date": str(start),
+                    "due_date": str(end),
+                    "total": len(students) * assignment.n_questions,
+                    "answers": [
+                        str(time)
+                        for username, time in times[assignment.pk]
+                        if username in students
+                    ],
+                }
+
+    return all_answers_by_group, json_data
@@ -25,8 +25,8 @@ def update_question_meta_search_difficulty():
         if created:
             logger.info(f"New difficulty level created: {f}")
 
-    for q in qs:
-        level = max(q.get_matrix().iteritems(), key=operator.itemgetter(1))[0]
+    for q in _iter_with_answer_statistics(qs):
+        level = max(q.get_matrix().items(), key=operator.itemgetter(1))[0]
         f = MetaFeature.objects.get(key="difficulty", value=level, type="S")
         s = MetaSearch.objects.create(meta_feature=f, content_object=q)
         q.meta_search.add(s)
@@ -43,7 +43,7 @@ def update_question_meta_search_difficulty():
 @shared_task
 def elasticsearch_reindex():
     logger.info("start rebuild elasticsearch index")
-    call_command("search_index", "--rebuild", "-f")
+    call_command("search_index", "--rebuild", "-f", "--parallel")
     logger.info("rebuilt elasticsearch index")
     return
 
@@ -83,6 +83,17 @@ def mail_managers_async(*args, **kwargs):
         raise
 
 
+def _iter_with_answer_statistics(questions, batch_size=500):
+    # Prevent circular import
+    from peerinst.models import Question
+
+    questions = questions.prefetch_related("answerchoice_set").order_by("pk")
+    for i in range(0, questions.count(), batch_size):
+        yield from Question.prefetch_answer_statistics(
+            questions[i : i + batch_size]
+        )
+
+
 @try_async
 @shared_task
 def distribute_assignment_to_students_async(student_group_assignment_pk):
@@ -102,10 +113,12 @@ def distribute_assignment_to_students_async(student_group_assignment_pk):
 
 
 @try_async
-@shared_task
-def compute_gradebook_async(group_pk, assignment_pk):
+@shared_task(bind=True)
+def compute_gradebook_async(self, group_pk, assignment_pk):
     """
-    Sends the compute_gradebook task to celery returning the task id.
+    Sends the compute_gradebook task to celery returning the task id. When
+    run synchronously, the `results` are the iterator of `iter_gradebook`
+    so the gradebook can be streamed as it is computed.
 
     Parameters
     ----------
@@ -156,8 +169,10 @@ def compute_gradebook_async(group_pk, assignment_pk):
                 }
     """
     # Prevent circular import
-    from .gradebooks import compute_gradebook
+    from .gradebooks import compute_gradebook, iter_gradebook
 
+    if self.request.called_directly:
+        return iter_gradebook(group_pk, assignment_pk)
     return compute_gradebook(group_pk, assignment_pk)
 
 
@@ -167,7 +182,9 @@ def populate_answer_start_time_from_ltievent_logs_task(
 ):
     from .util import populate_answer_start_time_from_ltievent_logs
 
-    populate_answer_start_time_from_ltievent_logs(day_of_logs, event_type)
+    return populate_answer_start_time_from_ltievent_logs(
+        day_of_logs, event_type
+    )
 
 
 @app.task
@@ -175,3 +192,17 @@ def clean_notifications():
     from .models import StudentNotification
 
     StudentNotification.clean()
+
+
+@app.task
+def refresh_question_statistics():
+    from .models import QuestionAnswerStatistics
+
+    QuestionAnswerStatistics.refresh()
+
+
+@app.task
+def refresh_rationale_evaluation_queue():
+    from .rationale_annotation import refresh_evaluation_queue
+
+    refresh_evaluation_queue()
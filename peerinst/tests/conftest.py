@@ -1,5 +1,6 @@
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 
 from .fixtures import *  # noqa
 
@@ -9,6 +10,11 @@ def enable_db_access_for_all_tests(db):
     pass
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
 @pytest.fixture(scope="session")
 def celery_config():
     setattr(settings, "CELERY_BROKER_URL", "memory://")
@@ -0,0 +1,81 @@
+import pytest
+
+from peerinst.models import Answer, GradingScheme, Question
+from peerinst.tests.fixtures import *  # noqa
+
+
+def add_all_answers(question, student):
+    n_choices = question.answerchoice_set.count()
+    return [
+        Answer.objects.create(
+            question=question,
+            first_answer_choice=first,
+            second_answer_choice=second,
+            rationale="test",
+            user_token=student.student.username,
+        )
+        for first in range(1, n_choices + 1)
+        for second in [None] + list(range(1, n_choices + 1))
+    ]
+
+
+@pytest.mark.parametrize(
+    "grading_scheme", [GradingScheme.STANDARD, GradingScheme.ADVANCED]
+)
+@pytest.mark.parametrize("second_answer_needed", [True, False])
+def test_with_grading(
+    question, answer_choices, student, grading_scheme, second_answer_needed
+):
+    question.grading_scheme = grading_scheme
+    question.second_answer_needed = second_answer_needed
+    question.save()
+    answers = add_all_answers(question, student)
+
+    graded = {
+        answer.pk: answer
+        for answer in Answer.objects.with_grading().filter(
+            pk__in=[answer.pk for answer in answers]
+        )
+    }
+
+    for answer in Answer.objects.filter(pk__in=graded):
+        graded_answer = graded[answer.pk]
+        assert graded_answer.is_first_correct == answer.first_correct
+        assert graded_answer.is_correct == answer.correct
+        assert graded_answer.is_completed == answer.completed
+        assert graded_answer.grade_value == answer.grade
+
+
+def test_with_grading__rationale_only(
+    rationale_only_question, student, assignment
+):
+    Question.objects.filter(pk=rationale_only_question.pk).update(
+        type="RO", second_answer_needed=False
+    )
+    answer = Answer.objects.create(
+        question=rationale_only_question,
+        assignment=assignment,
+        first_answer_choice=0,
+        rationale="test",
+        user_token=student.student.username,
+    )
+
+    answer = Answer.objects.with_grading().get(pk=answer.pk)
+
+    assert answer.is_first_correct
+    assert answer.is_correct
+    assert answer.is_completed
+    assert answer.grade_value == 1.0
+
+
+def test_with_grading__properties(
+    question, answer_choices, student, django_assert_num_queries
+):
+    add_all_answers(question, student)
+
+    with django_assert_num_queries(1):
+        for answer in Answer.objects.with_grading():
+            answer.first_correct
+            answer.correct
+            answer.completed
+            answer.grade
@@ -764,6 +764,93 @@ def test_student_progress__all_answers_correct_all_second_answers_done(
         )
 
 
+def test_student_progress__cached(
+    questions,
+    students_with_assignment,
+    student_group_assignment,
+    django_assert_num_queries,
+):
+    progress = student_group_assignment.student_progress
+
+    with django_assert_num_queries(0):
+        assert student_group_assignment.student_progress == progress
+
+    question = student_group_assignment.questions[0]
+    add_answers(
+        [
+            {
+                "question": question,
+                "assignment": student_group_assignment.assignment,
+                "user_token": students_with_assignment[0].student.username,
+                "first_answer_choice": 1,
+                "rationale": "test",
+            }
+        ]
+    )
+
+    progress = student_group_assignment.student_progress
+    assert progress[0]["question_id"] == question.pk
+    assert progress[0]["n_first_correct"] == 1
+
+
+def test_compute_student_progress__time_spent(
+    questions, students_with_assignment, student_group_assignment
+):
+    start = datetime.now(pytz.utc)
+    add_answers(
+        [
+            {
+                "question": question,
+                "assignment": student_group_assignment.assignment,
+                "user_token": student.student.username,
+                "first_answer_choice": 1,
+                "rationale": "test",
+                "second_answer_choice": 1,
+                "datetime_start": start,
+                "datetime_first": start,
+                "datetime_second": start + timedelta(minutes=1 + i % 2),
+            }
+            for question in questions
+            for i, student in enumerate(students_with_assignment[:2])
+        ]
+    )
+
+    progress = student_group_assignment.compute_student_progress()
+
+    assert all(
+        question["time_spent"] == "1 minute, 30 seconds"
+        for question in progress
+    )
+
+
+def test_compute_student_progress__queries(
+    questions,
+    students_with_assignment,
+    student_group_assignment,
+    django_assert_num_queries,
+):
+    add_answers(
+        [
+            {
+                "question": question,
+                "assignment": student_group_assignment.assignment,
+                "user_token": student.student.username,
+                "first_answer_choice": 1,
+                "rationale": "test",
+            }
+            for question in questions
+            for student in students_with_assignment
+        ]
+    )
+    student_group_assignment = StudentGroupAssignment.objects.select_related(
+        "assignment", "group"
+    ).get(pk=student_group_assignment.pk)
+
+    # questions, answer counts, times and students
+    with django_assert_num_queries(4):
+        student_group_assignment.compute_student_progress()
+
+
 def test_hashing(student_group_assignment):
     assert student_group_assignment == StudentGroupAssignment.get(
         student_group_assignment.hash
@@ -0,0 +1,58 @@
+from peerinst.models import Answer, Question
+from peerinst.tests.fixtures import *  # noqa
+
+
+def test_deleted_questions(questions, teacher, assignment):
+    teacher.deleted_questions.add(*questions[:3])
+    Answer.objects.create(
+        question=questions[0],
+        assignment=assignment,
+        first_answer_choice=1,
+        rationale="test",
+    )
+
+    assert set(Question.deleted_questions()) == set(questions[1:3])
+    assert Question.deleted_question_pks() == {q.pk for q in questions[1:3]}
+    assert questions[1].is_deleted
+    assert not questions[0].is_deleted
+    assert not questions[3].is_deleted
+
+
+def test_deleted_question_pks__cached(
+    questions, teacher, django_assert_num_queries
+):
+    teacher.deleted_questions.add(questions[0])
+    Question.deleted_question_pks()
+
+    with django_assert_num_queries(0):
+        assert questions[0].is_deleted
+
+
+def test_deleted_question_pks__teacher_changed(questions, teacher):
+    teacher.deleted_questions.add(questions[0])
+    assert Question.deleted_question_pks() == {questions[0].pk}
+
+    teacher.deleted_questions.add(questions[1])
+    assert Question.deleted_question_pks() == {
+        questions[0].pk,
+        questions[1].pk,
+    }
+
+    teacher.deleted_questions.remove(questions[0])
+    assert Question.deleted_question_pks() == {questions[1].pk}
+
+
+def test_deleted_question_pks__answers_changed(questions, teacher, assignment):
+    teacher.deleted_questions.add(questions[0])
+    assert Question.deleted_question_pks() == {questions[0].pk}
+
+    answer = Answer.objects.create(
+        question=questions[0],
+        assignment=assignment,
+        first_answer_choice=1,
+        rationale="test",
+    )
+    assert Question.deleted_question_pks() == set()
+
+    answer.delete()
+    assert Question.deleted_question_pks() == {questions[0].pk}
@@ -0,0 +1,138 @@
+import pytest
+
+from peerinst.models import (
+    Answer,
+    AnswerChoice,
+    Category,
+    Question,
+    QuestionSearchIndex,
+)
+from peerinst.tests.fixtures import *  # noqa
+from peerinst.util import question_search_function, ranked_question_search
+
+
+@pytest.fixture
+def search_index(settings):
+    settings.QUESTION_SEARCH_INDEX = True
+
+
+def add_answer(question, user_token="student"):
+    return Answer.objects.create(
+        question=question,
+        first_answer_choice=1,
+        second_answer_choice=1,
+        rationale="test",
+        user_token=user_token,
+    )
+
+
+def test_refresh(question, answer_choices, category):
+    question.category.add(category)
+    for i in range(3):
+        add_answer(question, f"student{i}")
+
+    QuestionSearchIndex.refresh()
+
+    index = QuestionSearchIndex.objects.get(question=question)
+    assert question.title in index.text
+    assert question.text in index.text
+    assert category.title not in index.text
+    assert category.title in index.extended_text
+    assert question.user.username in index.extended_text
+    assert all(choice.text in index.extended_text for choice in answer_choices)
+    assert index.n_answers == 3
+
+
+def test_signals(search_index, question):
+    index = QuestionSearchIndex.objects.get(question=question)
+    assert index.n_answers == 0
+
+    answer = add_answer(question)
+    index.refresh_from_db()
+    assert index.n_answers == 1
+
+    answer.delete()
+    index.refresh_from_db()
+    assert index.n_answers == 0
+
+    AnswerChoice.objects.create(
+        question=question, text="gravitation", correct=True
+    )
+    index.refresh_from_db()
+    assert "gravitation" in index.extended_text
+
+    question.title = "a new title"
+    question.save()
+    index.refresh_from_db()
+    assert "a new title" in index.text
+
+    category = Category.objects.create(title="thermodynamics")
+    question.category.add(category)
+    index.refresh_from_db()
+    assert "thermodynamics" in index.extended_text
+
+
+def test_signals__disabled(question):
+    add_answer(question)
+
+    assert not QuestionSearchIndex.objects.exists()
+
+
+# InnoDB full-text indexes only include committed rows
+@pytest.mark.django_db(transaction=True)
+def test_question_search_function(search_index, teacher):
+    matching = Question.objects.create(
+        title="momentum", text="conservation", user=teacher.user
+    )
+    add_answer(matching)
+    Question.objects.create(title="other", text="other", user=teacher.user)
+
+    results = list(question_search_function("conservation"))
+
+    assert results == [matching]
+    assert results[0].answer_total == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_question_search_function__extended(search_index, teacher):
+    question = Question.objects.create(
+        title="title", text="text", user=teacher.user
+    )
+    AnswerChoice.objects.create(
+        question=question, text="electromagnetism", correct=True
+    )
+
+    assert not question_search_function("electromagnetism").exists()
+    assert list(
+        question_search_function("electromagnetism", is_old_query=True)
+    ) == [question]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_ranked_question_search(search_index, teacher):
+    questions = [
+        Question.objects.create(title=title, text="text", user=teacher.user)
+        for title in (
+            "momentum conservation",
+            "momentum",
+            "momentum energy",
+            "conservation",
+        )
+    ]
+    for question in questions:
+        for i in range(2):
+            AnswerChoice.objects.create(
+                question=question, text=f"choice{i}", correct=i == 0
+            )
+    add_answer(questions[2])
+
+    results = list(
+        ranked_question_search(
+            ["momentum conservation", "momentum", "conservation"],
+            Question.objects.all(),
+        )
+    )
+
+    assert results == [questions[0], questions[2], questions[1], questions[3]]
+    assert [q.rank for q in results] == [0, 1, 1, 2]
+    assert [q.answer_total for q in results] == [0, 1, 0, 0]
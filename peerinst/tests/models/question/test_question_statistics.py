@@ -0,0 +1,149 @@
+import random
+
+import pytest
+
+from peerinst.models import Answer, Question, QuestionAnswerStatistics
+from peerinst.tests.fixtures import *  # noqa
+
+
+@pytest.fixture
+def statistics_answers(question, assignment, answer_choices):
+    random.seed(0)
+    return [
+        Answer.objects.create(
+            question=question,
+            assignment=assignment,
+            first_answer_choice=random.randint(1, len(answer_choices)),
+            second_answer_choice=random.choice(
+                [None] + list(range(1, len(answer_choices) + 1))
+            ),
+            rationale=f"rationale{i}",
+            user_token="" if i % 7 == 0 else f"student{i}",
+            expert=i % 11 == 0,
+        )
+        for i in range(80)
+    ]
+
+
+def test_compute_answer_statistics(question, statistics_answers):
+    statistics = Question.compute_answer_statistics([question])[question.pk]
+
+    for (first, second), counts in statistics.items():
+        answers = question.answer_set.filter(
+            first_answer_choice=first, second_answer_choice=second
+        )
+        assert (
+            counts["student"]
+            == (question.get_student_answers() & answers).count()
+        )
+        assert counts["all"] == answers.filter(expert=False).count()
+    assert (
+        sum(counts["student"] for counts in statistics.values())
+        == question.get_student_answers().count()
+    )
+
+
+def test_statistics(question, statistics_answers):
+    N = question.get_student_answers().count()
+    by_type = {
+        type_: question.get_answers_by_type(type_).count()
+        for type_ in ("*W", "RR", "RW", "WR", "WW")
+    }
+
+    assert question.get_difficulty()[0] == by_type["*W"] / N
+    assert question.get_peer_impact()[0] == (by_type["RW"] + by_type["WR"]) / N
+    assert question.get_matrix() == {
+        "easy": by_type["RR"] / N,
+        "hard": by_type["WW"] / N,
+        "tricky": by_type["RW"] / N,
+        "peer": by_type["WR"] / N,
+    }
+
+    frequency = question.get_frequency()
+    frequency_all = question.get_frequency(all_rationales=True)
+    for i, label in enumerate(frequency["first_choice"], 1):
+        assert (
+            frequency["first_choice"][label]
+            == question.answer_set.filter(
+                expert=False,
+                first_answer_choice=i,
+                second_answer_choice__gt=0,
+            ).count()
+        )
+        assert (
+            frequency["second_choice"][label]
+            == question.answer_set.filter(
+                expert=False, second_answer_choice=i
+            ).count()
+        )
+        assert (
+            frequency_all["first_choice"][label]
+            == question.answer_set.filter(
+                expert=False, first_answer_choice=i
+            ).count()
+        )
+
+
+def test_prefetch_answer_statistics(
+    question, statistics_answers, django_assert_num_queries
+):
+    question = Question.objects.prefetch_related("answerchoice_set").get(
+        pk=question.pk
+    )
+    matrix = question.get_matrix()
+
+    with django_assert_num_queries(1):
+        Question.prefetch_answer_statistics([question])
+
+    with django_assert_num_queries(0):
+        assert question.get_matrix() == matrix
+        question.get_frequency()
+
+
+def test_question_answer_statistics__incremental(question, statistics_answers):
+    expected = Question.compute_answer_statistics([question])[question.pk]
+    assert question.get_answer_statistics() == {
+        key: counts for key, counts in expected.items() if any(counts.values())
+    }
+
+    answer = Answer.objects.get(pk=statistics_answers[1].pk)
+    answer.second_answer_choice = None
+    answer.save()
+    answer.second_answer_choice = 2
+    answer.save()
+    Answer.objects.get(pk=statistics_answers[2].pk).delete()
+    Answer.objects.only("pk", "question").get(
+        pk=statistics_answers[3].pk
+    ).save()
+
+    expected = Question.compute_answer_statistics([question])[question.pk]
+    assert question.get_answer_statistics() == {
+        key: counts for key, counts in expected.items() if any(counts.values())
+    }
+
+
+def test_question_answer_statistics__refresh(question, statistics_answers):
+    expected = question.get_answer_statistics()
+    QuestionAnswerStatistics.objects.all().delete()
+    assert question.get_answer_statistics() == {}
+
+    QuestionAnswerStatistics.refresh()
+
+    assert question.get_answer_statistics() == expected
+
+
+def test_question_answer_statistics__refresh_missing_and_0(question):
+    for second in (None, 0):
+        Answer.objects.create(
+            question=question,
+            first_answer_choice=1,
+            second_answer_choice=second,
+            rationale="rationale",
+            user_token="student",
+        )
+    expected = question.get_answer_statistics()
+
+    QuestionAnswerStatistics.refresh()
+
+    assert question.get_answer_statistics() == expected
+    assert expected[(1, None)]["all"] == 2
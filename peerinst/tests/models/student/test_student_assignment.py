@@ -10,7 +10,13 @@ from peerinst.models import (
     StudentGroupMembership,
     StudentNotification,
 )
-from peerinst.tests.generators import add_answers, new_student_assignments
+from peerinst.tests.generators import (
+    add_answers,
+    add_student_assignments,
+    add_students,
+    new_student_assignments,
+    new_students,
+)
 
 from .fixtures import *  # noqa F403
 
@@ -852,3 +858,90 @@ def test_results__none_answered_correct_first_and_second(student_assignment):
 
     result = student_assignment.results
     assert result == correct
+
+
+def test_get_results(student_assignment, student):
+    assignment = student_assignment.group_assignment.assignment
+    questions = assignment.questions.all()
+    n = len(questions)
+    other = add_students(new_students(1))[0]
+    other_assignment = add_student_assignments(
+        new_student_assignments(1, student_assignment.group_assignment, other)
+    )[0]
+
+    add_answers(
+        [
+            {
+                "question": question,
+                "assignment": assignment,
+                "user_token": student.student.username,
+                "first_answer_choice": 2,
+                "rationale": "test",
+                "second_answer_choice": 1,
+                "chosen_rationale": None,
+            }
+            for question in questions
+        ]
+        + [
+            {
+                "question": questions[0],
+                "assignment": assignment,
+                "user_token": other.student.username,
+                "first_answer_choice": 1,
+                "rationale": "test",
+            }
+        ]
+    )
+
+    student_assignments = list(
+        StudentAssignment.objects.filter(
+            pk__in=[student_assignment.pk, other_assignment.pk]
+        ).select_related("group_assignment", "student__student")
+    )
+    expected = {
+        student_assignment.pk: (True, n),
+        other_assignment.pk: (False, 0),
+    }
+
+    results = StudentAssignment.get_results(student_assignments)
+
+    assert [
+        (result["completed"], result["results"]["n_completed"])
+        for result in results
+    ] == [
+        expected[student_assignment_.pk]
+        for student_assignment_ in student_assignments
+    ]
+    for result, student_assignment_ in zip(results, student_assignments):
+        assert result["results"] == student_assignment_.results
+        assert result["completed"] == student_assignment_.completed
+        assert (
+            result["detailed_results"] == student_assignment_.detailed_results
+        )
+
+
+def test_get_results__queries(
+    student_assignment, student, django_assert_num_queries
+):
+    assignment = student_assignment.group_assignment.assignment
+    add_answers(
+        [
+            {
+                "question": question,
+                "assignment": assignment,
+                "user_token": student.student.username,
+                "first_answer_choice": 1,
+                "rationale": "test",
+            }
+            for question in assignment.questions.all()
+        ]
+    )
+    student_assignments = list(
+        StudentAssignment.objects.select_related(
+            "group_assignment", "student__student"
+        )
+    )
+
+    # questions and answers
+    with django_assert_num_queries(2):
+        StudentAssignment.get_results(student_assignments)
@@ -158,7 +158,7 @@ class TopRationalesTestCase(TestCase):
 
     @ddt.data(0, 100, 2, 1500)
     def test_large_data(self, perpage):
-        with self.assertNumQueries(6 if perpage else 5):
+        with self.assertNumQueries(5 if perpage else 3):
             sums, rationales = admin_views.get_question_rationale_aggregates(
                 self.assignment, self.question, perpage
             )
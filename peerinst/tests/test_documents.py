@@ -0,0 +1,48 @@
+from peerinst.documents import QuestionDocument
+from peerinst.models import AnswerChoice, Question, QuestionFlag
+from peerinst.tests.fixtures import *  # noqa
+
+
+def test_get_indexing_queryset(
+    questions, collections, category, teacher, settings
+):
+    for i, question in enumerate(questions):
+        question.category.add(category)
+        for j in range(i % 3):
+            AnswerChoice.objects.create(
+                question=question, text=f"choice{j}", correct=j == 0
+            )
+    QuestionFlag.objects.create(question=questions[0], user=teacher.user)
+    document = QuestionDocument()
+
+    expected = {
+        question.pk: document.prepare(Question.objects.get(pk=question.pk))
+        for question in questions
+    }
+    QuestionDocument.django.queryset_pagination = 3
+    try:
+        indexed = list(document.get_indexing_queryset())
+    finally:
+        QuestionDocument.django.queryset_pagination = 500
+
+    assert sorted(question.pk for question in indexed) == sorted(expected)
+    for question in indexed:
+        data = document.prepare(question)
+        assert sorted(
+            data.pop("collections"), key=lambda c: c["title"]
+        ) == sorted(
+            expected[question.pk].pop("collections"),
+            key=lambda c: c["title"],
+        )
+        assert data == expected[question.pk]
+
+
+def test_get_indexing_queryset__queries(
+    questions, collections, django_assert_max_num_queries
+):
+    document = QuestionDocument()
+
+    # The most convincing rationales are still looked up for each question
+    with django_assert_max_num_queries(13 + len(questions)):
+        for question in document.get_indexing_queryset():
+            document.prepare(question)
@@ -0,0 +1,106 @@
+import json
+import logging
+from datetime import datetime
+
+import pytest
+
+from peerinst.events import EventQueue, write_to_database
+from peerinst.models import LtiEvent
+
+
+def new_event(i):
+    return {
+        "event_type": "problem_show",
+        "username": f"user{i}",
+        "event": {"assignment_id": "assignment", "question_id": i},
+        "time": datetime.now().isoformat(),
+    }
+
+
+def test_event_queue__synchronous():
+    written = []
+    queue = EventQueue(written.append, 10, 5, None)
+
+    event = new_event(0)
+    queue.put(event)
+
+    assert written == [[event]]
+
+
+def test_event_queue__flush():
+    written = []
+    queue = EventQueue(written.append, 10, 5, 60)
+
+    for i in range(3):
+        queue.put(new_event(i))
+    queue.flush()
+
+    assert len(written) == 1
+    assert [event["username"] for event in written[0]] == [
+        "user0",
+        "user1",
+        "user2",
+    ]
+
+    queue.flush()
+    assert len(written) == 1
+
+
+def test_event_queue__backpressure():
+    written = []
+    queue = EventQueue(written.append, 2, 5, 60)
+
+    for i in range(5):
+        queue.put(new_event(i))
+    queue.flush()
+
+    assert sum(len(events) for events in written) == 5
+    assert all(len(events) <= 2 for events in written)
+
+
+def test_event_queue__write_error():
+    def write(events):
+        raise ValueError()
+
+    queue = EventQueue(write, 10, 5, None)
+
+    queue.put(new_event(0))
+
+
+def test_event_queue__write_error__one_by_one(caplog):
+    written = []
+
+    def write(events):
+        if len(events) > 1 or events[0]["username"] == "user1":
+            raise ValueError()
+        written.extend(events)
+
+    queue = EventQueue(write, 10, 5, 60)
+
+    for i in range(3):
+        queue.put(new_event(i))
+    with caplog.at_level(logging.INFO, logger="peerinst.views.views"):
+        queue.flush()
+
+    assert [event["username"] for event in written] == ["user0", "user2"]
+    assert [
+        json.loads(record.message)["username"]
+        for record in caplog.records
+        if record.name == "peerinst.views.views"
+    ] == ["user1"]
+
+
+@pytest.mark.django_db
+def test_write_to_database():
+    events = [new_event(i) for i in range(3)]
+
+    write_to_database(events)
+
+    assert LtiEvent.objects.count() == 3
+    for event in events:
+        lti_event = LtiEvent.objects.get(username=event["username"])
+        assert lti_event.event_type == "problem_show"
+        assert lti_event.assignment_id == "assignment"
+        assert lti_event.question_id == event["event"]["question_id"]
+        assert lti_event.event_log == event
+        assert lti_event.timestamp is not None
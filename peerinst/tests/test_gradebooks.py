@@ -1,6 +1,10 @@
 import pytest
 
-from peerinst.gradebooks import compute_gradebook, convert_gradebook_to_csv
+from peerinst.gradebooks import (
+    compute_gradebook,
+    convert_gradebook_to_csv,
+    iter_gradebook,
+)
 from peerinst.tests.fixtures import *  # noqa
 from peerinst.tests.fixtures.question import add_answers
 
@@ -398,3 +402,80 @@ def test_convert_gradebook_to_csv__assignment__school_id():
         )
     with pytest.raises(StopIteration):
         next(csv_gen)
+
+
+def test_compute_gradebook__group__queries(
+    group,
+    students,
+    student_group_assignments,
+    student_assignments,
+    django_assert_max_num_queries,
+):
+    for assignment in student_group_assignments:
+        for assignment_ in assignment.studentassignment_set.all():
+            add_answers(
+                student=assignment_.student,
+                questions=assignment.questions,
+                assignment=assignment.assignment,
+                correct_first=True,
+                correct_second=False,
+            )
+
+    # The number of queries doesn't depend on the number of students
+    with django_assert_max_num_queries(6 + len(student_group_assignments)):
+        gradebook = compute_gradebook(group.pk)
+
+    assert len(gradebook["results"]) == len(students)
+
+
+def test_compute_gradebook__assignment__queries(
+    group,
+    students,
+    student_group_assignments,
+    student_assignments,
+    django_assert_max_num_queries,
+):
+    assignment = student_group_assignments[0]
+    for assignment_ in assignment.studentassignment_set.all():
+        add_answers(
+            student=assignment_.student,
+            questions=assignment.questions,
+            assignment=assignment.assignment,
+            correct_first=True,
+            correct_second=False,
+        )
+
+    with django_assert_max_num_queries(6):
+        gradebook = compute_gradebook(group.pk, assignment.pk)
+
+    assert len(gradebook["results"]) == len(students)
+
+
+@pytest.mark.parametrize("assignment", [False, True])
+def test_iter_gradebook(
+    group,
+    students,
+    student_group_assignments,
+    student_assignments,
+    settings,
+    assignment,
+):
+    for assignment_ in student_group_assignments:
+        for student_assignment in assignment_.studentassignment_set.all():
+            add_answers(
+                student=student_assignment.student,
+                questions=assignment_.questions,
+                assignment=assignment_.assignment,
+                correct_first=True,
+                correct_second=False,
+            )
+    assignment_pk = student_group_assignments[0].pk if assignment else None
+
+    gradebook = compute_gradebook(group.pk, assignment_pk)
+    settings.GRADEBOOK_CHUNK_SIZE = 2
+    gradebook_iter = iter_gradebook(group.pk, assignment_pk)
+
+    assert not isinstance(gradebook_iter["results"], list)
+    assert list(convert_gradebook_to_csv(gradebook_iter)) == list(
+        convert_gradebook_to_csv(gradebook)
+    )
@@ -2,8 +2,11 @@ from unittest import mock
 
 import pytest
 
-from peerinst.models import AnswerAnnotation
-from peerinst.rationale_annotation import choose_rationales
+from peerinst.models import AnswerAnnotation, RationaleEvaluationCandidate
+from peerinst.rationale_annotation import (
+    choose_rationales,
+    refresh_evaluation_queue,
+)
 from peerinst.tests.fixtures import *  # noqa
 from quality.models import Quality
 from quality.tests.fixtures import *  # noqa
@@ -21,6 +24,7 @@ def test_choose_rationales(teacher, answers, discipline):
         Quality.objects.get.return_value.batch_evaluate.return_value = [
             (q, None) for q in qualities
         ]
+        refresh_evaluation_queue()
         chosen = choose_rationales(teacher, n=5)
         assert len(chosen) == 5
 
@@ -41,6 +45,7 @@ def test_choose_rationales__no_quality(teacher, answers, discipline):
         answer.question.discipline = discipline
         answer.question.save()
     Quality.objects.all().delete()
+    refresh_evaluation_queue()
     chosen = choose_rationales(teacher, n=5)
     assert len(chosen) == 5
 
@@ -49,9 +54,31 @@ def test_choose_rationales__no_quality(teacher, answers, discipline):
 
 
 def test_choose_rationales__no_answers(teacher):
+    refresh_evaluation_queue()
     assert choose_rationales(teacher) == []
 
 
+def test_choose_rationales__empty_queue(teacher, answers, discipline):
+    teacher.disciplines.add(discipline)
+
+    with mock.patch(
+        "peerinst.rationale_annotation.choose_rationales_no_quality"
+    ) as choose_rationales_no_quality:
+        choose_rationales_no_quality.return_value = answers[:1]
+        assert choose_rationales(teacher, n=1) == answers[:1]
+        choose_rationales_no_quality.assert_called_with(teacher, 1)
+
+        for answer in answers:
+            answer.question.discipline = discipline
+            answer.question.save()
+        Quality.objects.all().delete()
+        refresh_evaluation_queue()
+        choose_rationales_no_quality.reset_mock()
+
+        assert choose_rationales(teacher, n=1) == answers[-1:]
+        choose_rationales_no_quality.assert_not_called()
+
+
 def test_choose_rationales__all_annotated(teacher, answers, discipline):
     teacher.disciplines.add(discipline)
     for answer in answers:
@@ -60,6 +87,7 @@ def test_choose_rationales__all_annotated(teacher, answers, discipline):
         AnswerAnnotation.objects.create(
             answer=answer, annotator=teacher.user, score=0
         )
+    refresh_evaluation_queue()
     assert choose_rationales(teacher) == []
 
 
@@ -77,9 +105,10 @@ def test_choose_rationales__some_annotated(teacher, answers, discipline):
         qualities = [float(i) / len(answers) for i in range(len(answers))]
         Quality.objects.filter.return_value.exists.return_value = True
         Quality.objects.get.return_value.batch_evaluate.return_value = [
-            (q, None) for q in qualities[::2]
+            (q, None) for q in qualities
         ]
 
+        refresh_evaluation_queue()
         chosen = choose_rationales(teacher, n=5)
         assert len(chosen) == 5
 
@@ -109,8 +138,78 @@ def test_choose_rationales__different_discipline(
             (q, None) for q in qualities[::2]
         ]
 
+        refresh_evaluation_queue()
         chosen = choose_rationales(teacher, n=5)
         assert len(chosen) == 5
 
         for a, a_ in zip(chosen, answers[::2][::-1]):
             assert a == a_
+
+
+def test_choose_rationales__single_query(
+    teacher, answers, discipline, django_assert_num_queries
+):
+    teacher.disciplines.add(discipline)
+    for answer in answers:
+        answer.question.discipline = discipline
+        answer.question.save()
+    Quality.objects.all().delete()
+    refresh_evaluation_queue()
+
+    with django_assert_num_queries(1):
+        chosen = choose_rationales(teacher, n=5)
+        assert [a.pk for a in chosen] == [a.pk for a in answers[::-1][:5]]
+
+
+def test_refresh_evaluation_queue__discipline_changed(
+    answers, questions, disciplines
+):
+    questions[0].discipline = disciplines[0]
+    questions[0].save()
+    for answer in answers:
+        answer.question = questions[0]
+        answer.save()
+    Quality.objects.all().delete()
+    refresh_evaluation_queue()
+
+    questions[0].discipline = disciplines[1]
+    questions[0].save()
+    refresh_evaluation_queue(disciplines[1:2])
+
+    assert not RationaleEvaluationCandidate.objects.filter(
+        discipline=disciplines[0]
+    ).exists()
+    assert RationaleEvaluationCandidate.objects.filter(
+        discipline=disciplines[1]
+    ).count() == len(answers)
+
+
+def test_refresh_evaluation_queue__batches(
+    settings, answers, questions, discipline
+):
+    settings.BATCH_SIZE = 4
+    settings.RATIONALE_EVALUATION_QUEUE_SIZE = 5
+    questions[0].discipline = discipline
+    questions[0].save()
+    for answer in answers:
+        answer.question = questions[0]
+        answer.save()
+
+    with mock.patch("peerinst.rationale_annotation.Quality") as Quality:
+        Quality.objects.filter.return_value.exists.return_value = True
+        batch_evaluate = Quality.objects.get.return_value.batch_evaluate
+        batch_evaluate.side_effect = lambda answers: [
+            (-answer.pk, None) for answer in answers
+        ]
+        refresh_evaluation_queue()
+
+    assert batch_evaluate.call_count == -(-len(answers) // 4)
+    assert all(len(c.args[0]) <= 4 for c in batch_evaluate.call_args_list)
+    assert (
+        list(
+            RationaleEvaluationCandidate.objects.filter(discipline=discipline)
+            .order_by("rank")
+            .values_list("answer", flat=True)
+        )
+        == sorted((answer.pk for answer in answers), reverse=True)[:5]
+    )
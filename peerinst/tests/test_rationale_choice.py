@@ -0,0 +1,141 @@
+import random
+
+import pytest
+from django.core.cache import cache
+
+from peerinst.models import Answer, AnswerAnnotation
+from peerinst.rationale_choice import (
+    RationaleSelectionError,
+    _rationale_pool_key,
+    get_rationale_pool,
+    invalidate_rationale_pools,
+    simple,
+)
+from peerinst.tests.fixtures import *  # noqa
+from tos.models import Consent
+
+
+def test_get_rationale_pool(answers, question, answer_choices):
+    pool = get_rationale_pool(question)
+
+    assert sorted(pool) == list(range(1, len(answer_choices) + 1))
+    for choice, pks in pool.items():
+        assert sorted(pks) == sorted(
+            a.pk for a in answers if a.first_answer_choice == choice
+        )
+
+
+def test_get_rationale_pool__cached(
+    answers, question, answer_choices, django_assert_num_queries
+):
+    get_rationale_pool(question)
+
+    with django_assert_num_queries(0):
+        pool = get_rationale_pool(question)
+
+    assert sum(len(pks) for pks in pool.values()) == len(answers)
+
+
+def test_rationale_pool__answer_added(answers, question, assignment):
+    get_rationale_pool(question)
+
+    answer = Answer.objects.create(
+        question=question,
+        assignment=assignment,
+        first_answer_choice=2,
+        rationale="new rationale",
+        user_token=answers[0].user_token,
+    )
+
+    assert answer.pk in get_rationale_pool(question)[2]
+
+
+def test_rationale_pool__answer_hidden(answers, question):
+    get_rationale_pool(question)
+
+    answer = answers[0]
+    answer.show_to_others = False
+    answer.save()
+
+    pool = get_rationale_pool(question)
+    assert all(answer.pk not in pks for pks in pool.values())
+
+
+def test_rationale_pool__answer_never_show(answers, question, teacher):
+    get_rationale_pool(question)
+
+    AnswerAnnotation.objects.create(
+        answer=answers[0], annotator=teacher.user, score=0
+    )
+
+    pool = get_rationale_pool(question)
+    assert all(answers[0].pk not in pks for pks in pool.values())
+
+
+def test_rationale_pool__removal_invalidates(answers, question, teacher):
+    get_rationale_pool(question)
+
+    AnswerAnnotation.objects.create(
+        answer=answers[0], annotator=teacher.user, score=0
+    )
+
+    assert cache.get(_rationale_pool_key(question.pk)) is None
+
+
+def test_rationale_pool__answer_moved(answers, question, answer_choices):
+    get_rationale_pool(question)
+
+    answer = next(a for a in answers if a.first_answer_choice == 1)
+    answer.first_answer_choice = 2
+    answer.save()
+
+    pool = get_rationale_pool(question)
+    assert answer.pk not in pool[1]
+    assert answer.pk in pool[2]
+
+
+def test_rationale_pool__consent_refused(
+    answers, question, students, tos_student
+):
+    get_rationale_pool(question)
+
+    Consent.objects.create(
+        user=students[0].student, tos=tos_student, accepted=False
+    )
+
+    pool = get_rationale_pool(question)
+    for answer in answers:
+        if answer.user_token == students[0].student.username:
+            assert all(answer.pk not in pks for pks in pool.values())
+        else:
+            assert answer.pk in pool[answer.first_answer_choice]
+
+
+def test_invalidate_rationale_pools(answers, question):
+    get_rationale_pool(question)
+    Answer.objects.filter(pk=answers[0].pk).update(show_to_others=False)
+
+    invalidate_rationale_pools([question.pk])
+
+    pool = get_rationale_pool(question)
+    assert all(answers[0].pk not in pks for pks in pool.values())
+
+
+def test_simple(answers, question, answer_choices):
+    chosen = simple(random.Random(0), 2, "", question, max_rationales=3)
+
+    assert chosen[0][0] == 2
+    assert {choice for choice, _, _ in chosen} == {1, 2, 3}
+    for choice, _, rationales in chosen:
+        pks = [pk for pk, _ in rationales if pk is not None]
+        assert len(pks) == 3
+        assert all(
+            Answer.objects.get(pk=pk).first_answer_choice == choice
+            for pk in pks
+        )
+    assert chosen[0][2][-1][0] is None
+
+
+def test_simple__no_sample_answers(question, answer_choices):
+    with pytest.raises(RationaleSelectionError):
+        simple(random.Random(0), 1, "", question)
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+
+import pytz
+
+from peerinst.student_activity import (
+    count_new_answers,
+    get_student_activity_data,
+)
+from peerinst.tests.fixtures import *  # noqa
+from peerinst.tests.fixtures.question.utils import add_answers
+
+
+def test_get_student_activity_data(
+    teacher, group, questions, student, student_group_assignments
+):
+    teacher.current_groups.add(group)
+    student.groups.add(group)
+    assignment = student_group_assignments[0].assignment
+    add_answers(student, questions, assignment)
+
+    data, json_data = get_student_activity_data(teacher)
+
+    activity = data[group][student_group_assignments[0]]
+    n_questions = assignment.questions.count()
+    assert activity["n_answers"] == len(questions)
+    assert activity["n_new"] == len(questions)
+    assert activity["percent_complete"] == 100
+    assert data[group][student_group_assignments[1]]["n_answers"] == 0
+
+    chart = json_data[group.name][assignment.identifier]
+    assert chart["total"] == n_questions
+    assert len(chart["answers"]) == len(questions)
+    assert student_group_assignments[1].assignment.identifier not in (
+        json_data[group.name]
+    )
+
+
+def test_get_student_activity_data__cached(
+    teacher,
+    group,
+    questions,
+    student,
+    student_group_assignments,
+    django_assert_num_queries,
+):
+    teacher.current_groups.add(group)
+    student.groups.add(group)
+    add_answers(student, questions, student_group_assignments[0].assignment)
+    get_student_activity_data(teacher)
+
+    with django_assert_num_queries(0):
+        get_student_activity_data(teacher)
+
+
+def test_get_student_activity_data__dashboard_accessed(
+    teacher,
+    group,
+    questions,
+    student,
+    student_group_assignments,
+    django_assert_num_queries,
+):
+    teacher.current_groups.add(group)
+    student.groups.add(group)
+    add_answers(student, questions, student_group_assignments[0].assignment)
+    data, _ = get_student_activity_data(teacher)
+    assert data[group][student_group_assignments[0]]["n_new"] == len(questions)
+
+    teacher.last_dashboard_access = datetime.now(pytz.utc)
+    teacher.save()
+
+    with django_assert_num_queries(0):
+        data, json_data = get_student_activity_data(teacher)
+
+    assert data[group][student_group_assignments[0]]["n_new"] == 0
+    assert data[group][student_group_assignments[0]]["n_answers"] == len(
+        questions
+    )
+    assert json_data[group.name][
+        student_group_assignments[0].assignment.identifier
+    ]["last_login"] == str(teacher.last_dashboard_access)
+
+
+def test_get_student_activity_data__answer_added(
+    teacher, group, questions, student, student_group_assignments
+):
+    teacher.current_groups.add(group)
+    student.groups.add(group)
+    assignment = student_group_assignments[0].assignment
+    add_answers(student, questions[:1], assignment)
+    data, _ = get_student_activity_data(teacher)
+    assert data[group][student_group_assignments[0]]["n_answers"] == 1
+
+    add_answers(student, questions[1:], assignment)
+
+    data, _ = get_student_activity_data(teacher)
+    assert data[group][student_group_assignments[0]]["n_answers"] == len(
+        questions
+    )
+
+
+def test_count_new_answers(
+    teacher, group, questions, student, student_group_assignments
+):
+    teacher.current_groups.add(group)
+    student.groups.add(group)
+    teacher.user.last_login = datetime.now(pytz.utc) - timedelta(days=1)
+    teacher.user.save()
+    assignment = student_group_assignments[0].assignment
+
+    assert count_new_answers(teacher) == 0
+
+    add_answers(student, questions, assignment)
+
+    assert count_new_answers(teacher) == len(questions)
+
+
+def test_count_new_answers__never_logged_in(
+    teacher, group, questions, student, student_group_assignments
+):
+    teacher.current_groups.add(group)
+    student.groups.add(group)
+    teacher.user.last_login = None
+    teacher.user.save()
+    add_answers(student, questions, student_group_assignments[0].assignment)
+
+    assert count_new_answers(teacher) == 0
@@ -49,3 +49,11 @@ def test_compute_gradebook_async__celery_not_running():
         result = compute_gradebook_async(group_pk, assignment_pk)
         assert not isinstance(result, AsyncResult)
         gradebook.compute_gradebook.called_with(group_pk, assignment_pk)
+
+
+def test_compute_gradebook_async__called_directly(group):
+    with mock.patch("peerinst.gradebooks.iter_gradebook") as iter_gradebook:
+        result = compute_gradebook_async.__wrapped__(group.pk, None)
+
+        iter_gradebook.assert_called_with(group.pk, None)
+        assert result is iter_gradebook.return_value
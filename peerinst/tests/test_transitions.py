@@ -0,0 +1,103 @@
+from collections import Counter
+
+from peerinst.models import Answer
+from peerinst.tests.fixtures import *  # noqa
+from peerinst.transitions import (
+    get_top_rationales,
+    get_transition_matrix,
+    get_transitions,
+    load_rationales,
+)
+
+
+def test_get_transitions(answers, question, assignment):
+    Answer.objects.filter(pk=answers[0].pk).update(user_token="")
+
+    transitions = get_transitions(
+        Answer.objects.filter(question=question, assignment=assignment)
+    )
+
+    expected = Counter(
+        (a.first_answer_choice, a.second_answer_choice, a.chosen_rationale_id)
+        for a in Answer.objects.filter(
+            question=question, assignment=assignment
+        )
+    )
+    assert {
+        (t["first"], t["second"], t["chosen"]): t["n_all"] for t in transitions
+    } == expected
+    assert sum(t["n"] for t in transitions) == len(answers) - 1
+
+
+def test_get_transitions__include_own_rationales(
+    answers, question, assignment
+):
+    transitions = get_transitions(
+        Answer.objects.filter(question=question, assignment=assignment),
+        include_own_rationales=True,
+    )
+
+    assert None not in {t["chosen"] for t in transitions}
+    assert sum(t["n"] for t in transitions) == len(answers)
+
+
+def test_get_transition_matrix(answers, question, assignment, answer_choices):
+    transitions = get_transitions(
+        Answer.objects.filter(question=question, assignment=assignment)
+    )
+
+    matrix = get_transition_matrix(transitions, len(answer_choices))
+
+    assert len(matrix) == len(answer_choices)
+    for i, row in enumerate(matrix, 1):
+        for j, count in enumerate(row, 1):
+            assert (
+                count
+                == Answer.objects.filter(
+                    question=question,
+                    assignment=assignment,
+                    first_answer_choice=i,
+                    second_answer_choice=j,
+                ).count()
+            )
+
+
+def test_get_top_rationales():
+    transitions = [
+        {"first": 1, "second": 1, "chosen": 3, "n": 1, "order": 5},
+        {"first": 1, "second": 2, "chosen": 4, "n": 2, "order": 7},
+        {"first": 2, "second": 1, "chosen": 3, "n": 2, "order": 2},
+        {"first": 2, "second": 2, "chosen": None, "n": 1, "order": 1},
+        {"first": 2, "second": 2, "chosen": 5, "n": 0, "order": None},
+    ]
+
+    rationales, n = get_top_rationales(transitions, 2)
+    assert rationales == [
+        {"rationale": 3, "count": 3},
+        {"rationale": 4, "count": 2},
+    ]
+    assert n == 3
+
+    rationales, n = get_top_rationales(
+        transitions, 5, lambda t: t["second"] == 2
+    )
+    assert rationales == [
+        {"rationale": 4, "count": 2},
+        {"rationale": None, "count": 1},
+    ]
+    assert n == 2
+
+
+def test_load_rationales(answers, django_assert_num_queries):
+    first = [{"rationale": answers[0].pk, "count": 2}]
+    second = [
+        {"rationale": answers[1].pk, "count": 1},
+        {"rationale": None, "count": 1},
+    ]
+
+    with django_assert_num_queries(1):
+        load_rationales(first, second)
+
+    assert first[0]["rationale"] == answers[0]
+    assert second[0]["rationale"] == answers[1]
+    assert second[1]["rationale"] is None
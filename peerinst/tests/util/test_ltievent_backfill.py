@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+
+import pytz
+
+from peerinst.models import Answer, LtiEvent, ShownRationale
+from peerinst.tests.fixtures import *  # noqa
+from peerinst.util import (
+    load_shown_rationales_from_ltievent_logs,
+    populate_answer_start_time_from_ltievent_logs,
+)
+
+DAY = datetime(2019, 1, 10, tzinfo=pytz.utc)
+
+
+def add_answer(question, assignment, user_token, **kwargs):
+    return Answer.objects.create(
+        question=question,
+        assignment=assignment,
+        first_answer_choice=1,
+        rationale="test",
+        user_token=user_token,
+        **kwargs,
+    )
+
+
+def add_event(event_type, answer, timestamp, **data):
+    data = {
+        "question_id": answer.question_id,
+        "assignment_id": answer.assignment_id,
+        **data,
+    }
+    return LtiEvent.objects.create(
+        event_type=event_type,
+        username=answer.user_token,
+        question_id=answer.question_id,
+        assignment_id=answer.assignment_id,
+        event_log={
+            "event_type": event_type,
+            "username": answer.user_token,
+            "event": data,
+        },
+        timestamp=timestamp,
+    )
+
+
+def test_load_shown_rationales(
+    question, assignment, django_assert_num_queries
+):
+    shown = [add_answer(question, assignment, f"shown{i}") for i in range(3)]
+    answers = [
+        add_answer(question, assignment, f"student{i}") for i in range(4)
+    ]
+    for i, answer in enumerate(answers):
+        add_event(
+            "save_problem_success",
+            answer,
+            DAY + timedelta(hours=i),
+            rationales=[{"id": a.pk} for a in shown[: i % 3 + 1]],
+        )
+    ShownRationale.objects.create(
+        shown_for_answer=answers[0], shown_answer=shown[0]
+    )
+
+    # events, then answers, shown answers, existing shown rationales and
+    # insert for each of the two chunks
+    with django_assert_num_queries(9):
+        n_events, n_created = load_shown_rationales_from_ltievent_logs(
+            DAY, chunk_size=2
+        )
+
+    assert n_events == 4
+    assert n_created == 6
+    for i, answer in enumerate(answers):
+        assert set(
+            ShownRationale.objects.filter(shown_for_answer=answer).values_list(
+                "shown_answer", flat=True
+            )
+        ) == {a.pk for a in shown[: i % 3 + 1]}
+
+    assert load_shown_rationales_from_ltievent_logs(DAY) == (4, 0)
+
+
+def test_load_shown_rationales__skipped_events(question, assignment):
+    shown = add_answer(question, assignment, "shown")
+    answer = add_answer(question, assignment, "student")
+    duplicate = add_answer(question, assignment, "duplicate")
+    add_answer(question, assignment, "duplicate")
+    missing = Answer(
+        question=question, assignment=assignment, user_token="missing"
+    )
+
+    add_event("save_problem_success", answer, DAY)
+    add_event(
+        "save_problem_success", duplicate, DAY, rationales=[{"id": shown.pk}]
+    )
+    add_event(
+        "save_problem_success", missing, DAY, rationales=[{"id": shown.pk}]
+    )
+    add_event("problem_check", answer, DAY, rationales=[{"id": shown.pk}])
+    add_event(
+        "save_problem_success",
+        answer,
+        DAY - timedelta(days=1),
+        rationales=[{"id": shown.pk}],
+    )
+
+    assert load_shown_rationales_from_ltievent_logs(DAY) == (3, 0)
+    assert not ShownRationale.objects.exists()
+
+
+def test_populate_answer_start_time__problem_show(question, assignment):
+    empty = add_answer(question, assignment, "student0")
+    filled = add_answer(question, assignment, "student1", datetime_start=DAY)
+    for i in range(3):
+        add_event("problem_show", empty, DAY + timedelta(hours=i))
+        add_event("problem_show", filled, DAY - timedelta(hours=i))
+
+    assert populate_answer_start_time_from_ltievent_logs(
+        DAY, "problem_show", chunk_size=2
+    ) == (4, 1)
+
+    empty.refresh_from_db()
+    filled.refresh_from_db()
+    assert empty.datetime_start == DAY + timedelta(hours=2)
+    assert filled.datetime_start == DAY
+
+
+def test_populate_answer_start_time__problem_check(question, assignment):
+    answer = add_answer(question, assignment, "student")
+    add_event("problem_check", answer, DAY, rationales=[{"id": answer.pk}])
+    for i in range(1, 3):
+        add_event("problem_check", answer, DAY + timedelta(hours=i))
+
+    assert populate_answer_start_time_from_ltievent_logs(
+        DAY, "problem_check"
+    ) == (3, 1)
+
+    answer.refresh_from_db()
+    assert answer.datetime_first == DAY + timedelta(hours=1)
@@ -0,0 +1,82 @@
+import pytest
+
+from peerinst.models import Answer, AnswerChoice, Question, QuestionFlag
+from peerinst.tests.fixtures import *  # noqa
+from peerinst.util import ranked_question_search
+
+
+def add_search_question(teacher, title, text="", n_answers=0):
+    question = Question.objects.create(
+        title=title, text=text, user=teacher.user
+    )
+    for i in range(2):
+        AnswerChoice.objects.create(
+            question=question, text=f"choice{i + 1}", correct=i == 0
+        )
+    for i in range(n_answers):
+        Answer.objects.create(
+            question=question,
+            first_answer_choice=1,
+            second_answer_choice=1,
+            rationale="test",
+            user_token=f"student{i}",
+        )
+    return question
+
+
+@pytest.mark.django_db
+def test_ranked_question_search(teacher):
+    phrase = add_search_question(teacher, "newton force law")
+    term = add_search_question(teacher, "force", n_answers=2)
+    term_answered = add_search_question(teacher, "law", n_answers=3)
+    add_search_question(teacher, "other")
+
+    results = list(
+        ranked_question_search(
+            ["force law", "force", "law"], Question.objects.all()
+        )
+    )
+
+    assert results == [phrase, term_answered, term]
+    assert [q.rank for q in results] == [0, 1, 1]
+    assert [q.answer_total for q in results] == [0, 3, 2]
+
+
+@pytest.mark.django_db
+def test_ranked_question_search__multiple_matches(teacher):
+    question = add_search_question(teacher, "force", text="force law")
+
+    results = list(
+        ranked_question_search(["force", "law"], Question.objects.all())
+    )
+
+    assert results == [question]
+    assert results[0].rank == 0
+
+
+@pytest.mark.django_db
+def test_ranked_question_search__invalid_questions(teacher):
+    valid = add_search_question(teacher, "force valid")
+    flagged = add_search_question(teacher, "force flagged")
+    QuestionFlag.objects.create(question=flagged, user=teacher.user)
+    no_correct = add_search_question(teacher, "force no correct")
+    no_correct.answerchoice_set.update(correct=False)
+    single_choice = add_search_question(teacher, "force single choice")
+    single_choice.answerchoice_set.last().delete()
+
+    results = list(ranked_question_search(["force"], Question.objects.all()))
+
+    assert results == [valid]
+
+
+@pytest.mark.django_db
+def test_ranked_question_search__paginated(teacher, django_assert_num_queries):
+    for i in range(10):
+        add_search_question(teacher, f"force {i}")
+
+    with django_assert_num_queries(1):
+        results = list(
+            ranked_question_search(["force"], Question.objects.all())[:5]
+        )
+
+    assert len(results) == 5
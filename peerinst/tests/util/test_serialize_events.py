@@ -0,0 +1,122 @@
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+import pytz
+
+from peerinst.models import LtiEvent
+from peerinst.util import (
+    LTIEVENT_COLUMNS,
+    LTIEVENT_EVENT_COLUMNS,
+    export_events,
+    iter_event_dataframes,
+    serialize_events_to_dataframe,
+)
+
+DAY = datetime(2019, 1, 10, tzinfo=pytz.utc)
+
+
+def add_events(n):
+    return [
+        LtiEvent.objects.create(
+            event_type="problem_check",
+            username=f"student{i}",
+            event_log={
+                "event_type": "problem_check",
+                "username": f"student{i}",
+                "course_id": "course",
+                "event": {
+                    "question_id": i,
+                    "assignment_id": "assignment",
+                    "rationales": [{"id": i}],
+                    "first_answer_choice": 1,
+                },
+            },
+            timestamp=DAY + timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+
+
+def test_serialize_events_to_dataframe(django_assert_num_queries):
+    add_events(5)
+    LtiEvent.objects.create(event_type="problem_show", timestamp=DAY)
+
+    with django_assert_num_queries(1):
+        df = serialize_events_to_dataframe(LtiEvent.objects.order_by("pk"))
+
+    assert list(df.columns) == LTIEVENT_COLUMNS + LTIEVENT_EVENT_COLUMNS
+    assert len(df) == 6
+    assert list(df["username"]) == [f"student{i}" for i in range(5)] + [None]
+    assert list(df["question_id"][:5]) == list(range(5))
+    assert df["rationales"][2] == [{"id": 2}]
+    assert list(df["event_type"]) == ["problem_check"] * 5 + ["problem_show"]
+    assert df["timestamp"][5] == DAY
+
+
+def test_serialize_events_to_dataframe__objects():
+    events = add_events(3)
+
+    df = serialize_events_to_dataframe(events)
+
+    assert list(df["username"]) == [e.username for e in events]
+
+
+def test_serialize_events_to_dataframe__empty():
+    df = serialize_events_to_dataframe(LtiEvent.objects.none())
+
+    assert list(df.columns) == LTIEVENT_COLUMNS + LTIEVENT_EVENT_COLUMNS
+    assert df.empty
+
+
+def test_iter_event_dataframes():
+    add_events(5)
+
+    dfs = list(iter_event_dataframes(LtiEvent.objects.all(), chunk_size=2))
+
+    assert [len(df) for df in dfs] == [2, 2, 1]
+
+
+def test_export_events__csv(tmp_path):
+    add_events(5)
+    path = tmp_path / "events.csv"
+
+    n = export_events(LtiEvent.objects.order_by("pk"), path, chunk_size=2)
+
+    df = pd.read_csv(path)
+    assert n == 5
+    assert list(df.columns) == LTIEVENT_COLUMNS + LTIEVENT_EVENT_COLUMNS
+    assert list(df["username"]) == [f"student{i}" for i in range(5)]
+
+
+def test_export_events__parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    add_events(5)
+    LtiEvent.objects.create(event_type="problem_show", timestamp=DAY)
+    path = tmp_path / "events"
+
+    n = export_events(
+        LtiEvent.objects.order_by("pk"),
+        path,
+        file_format="parquet",
+        chunk_size=2,
+    )
+
+    assert n == 6
+    assert len(list(path.iterdir())) == 3
+    df = pd.read_parquet(path)
+    assert len(df) == 6
+    assert json.loads(df["rationales"][0]) == [{"id": 0}]
+
+
+def test_export_events__parquet_not_empty(tmp_path):
+    (tmp_path / "part-00000.parquet").touch()
+
+    with pytest.raises(ValueError):
+        export_events(LtiEvent.objects.all(), tmp_path, file_format="parquet")
+
+
+def test_export_events__unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        export_events(LtiEvent.objects.all(), tmp_path, file_format="xlsx")
@@ -0,0 +1,166 @@
+"""
+Counts of the answers to a question moving from a first to a second answer
+choice, shared by the answer summary chart and the admin reports.
+"""
+
+from django.db.models import Count, F, Min, Q
+from django.db.models.functions import Coalesce
+
+from .models import Answer
+
+
+def get_transitions(answers, include_own_rationales=False):
+    """
+    Counts, in a single aggregate query, the answers for each first answer
+    choice, second answer choice and chosen rationale.
+
+    Parameters
+    ----------
+    answers : QuerySet[Answer]
+        Answers to count, usually those of a question in an assignment
+    include_own_rationales : bool (default : False)
+        If answers without a chosen rationale are counted as having chosen
+        their own rationale instead of being grouped under None
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        [{
+            first : Optional[int]
+                First answer choice
+            second : Optional[int]
+                Second answer choice
+            chosen : Optional[int]
+                Primary key of the chosen rationale
+            n : int
+                Number of student answers
+            n_all : int
+                Number of answers, including the example answers
+            order : Optional[int]
+                Primary key of the first of these student answers, used to
+                keep ties in the order in which answers were given
+        }]
+    """
+    return list(
+        answers.annotate(
+            first=F("first_answer_choice"),
+            second=F("second_answer_choice"),
+            chosen=(
+                Coalesce("chosen_rationale", "pk")
+                if include_own_rationales
+                else F("chosen_rationale")
+            ),
+        )
+        .values("first", "second", "chosen")
+        .annotate(
+            n=Count("pk", filter=~Q(user_token="")),
+            n_all=Count("pk"),
+            order=Min("pk", filter=~Q(user_token="")),
+        )
+        .order_by()
+    )
+
+
+def get_transition_matrix(transitions, n_choices, key="n"):
+    """
+    Builds the matrix of the number of answers going from each first answer
+    choice to each second answer choice.
+
+    Parameters
+    ----------
+    transitions : List[Dict[str, Any]]
+        Counts as returned by `get_transitions`
+    n_choices : int
+        Number of answer choices of the question
+    key : str (default : "n")
+        Count to use, either "n" or "n_all"
+
+    Returns
+    -------
+    List[List[int]]
+        Number of answers with first choice `i + 1` and second choice `j + 1`
+        at index `[i][j]`
+    """
+    matrix = [[0] * n_choices for _ in range(n_choices)]
+    for transition in transitions:
+        if (
+            transition["first"] is not None
+            and transition["second"] is not None
+            and 1 <= transition["first"] <= n_choices
+            and 1 <= transition["second"] <= n_choices
+        ):
+            matrix[transition["first"] - 1][
+                transition["second"] - 1
+            ] += transition[key]
+    return matrix
+
+
+def get_top_rationales(transitions, n, condition=None):
+    """
+    Returns the most chosen rationales among the transitions satisfying the
+    condition, counting only student answers.
+
+    Parameters
+    ----------
+    transitions : List[Dict[str, Any]]
+        Counts as returned by `get_transitions`
+    n : int
+        Maximum number of rationales to return
+    condition : Optional[Callable[[Dict[str, Any]], bool]] (default : None)
+        Keeps only the transitions for which it is true
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        [{
+            rationale : Optional[int]
+                Primary key of the rationale
+            count : int
+                Number of times it was chosen
+        }]
+        sorted by decreasing count
+    int
+        Number of different rationales chosen
+    """
+    counts = {}
+    for transition in transitions:
+        if transition["n"] and (condition is None or condition(transition)):
+            count, order = counts.get(transition["chosen"], (0, None))
+            counts[transition["chosen"]] = (
+                count + transition["n"],
+                transition["order"]
+                if order is None
+                else min(order, transition["order"]),
+            )
+
+    rationales = sorted(counts, key=lambda r: (-counts[r][0], counts[r][1]))
+    return [
+        {"rationale": rationale, "count": counts[rationale][0]}
+        for rationale in rationales[:n]
+    ], len(rationales)
+
+
+def load_rationales(*rationale_lists):
+    """
+    Replaces in place the rationale primary keys of lists returned by
+    `get_top_rationales` by the corresponding answers, using a single query.
+
+    Parameters
+    ----------
+    rationale_lists : List[Dict[str, Any]]
+        Lists of rationales as returned by `get_top_rationales`
+    """
+    pks = {
+        rationale["rationale"]
+        for rationales in rationale_lists
+        for rationale in rationales
+        if rationale["rationale"] is not None
+    }
+    answers = (
+        {answer.pk: answer for answer in Answer.objects.filter(pk__in=pks)}
+        if pks
+        else {}
+    )
+    for rationales in rationale_lists:
+        for rationale in rationales:
+            rationale["rationale"] = answers.get(rationale["rationale"])
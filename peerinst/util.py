@@ -1,23 +1,32 @@
 import datetime
 import itertools
+import json
 import logging
+import operator
+import os
 import string
+import time
 from collections import Counter, defaultdict
+from functools import reduce
 
-import pytz
 from django.db.models import (
     Avg,
     Case,
     CharField,
     Count,
     DurationField,
+    Exists,
     ExpressionWrapper,
     F,
+    IntegerField,
+    OuterRef,
     Q,
     QuerySet,
+    Subquery,
     Value,
     When,
 )
+from django.db.models.functions import Coalesce
 from django.utils.safestring import mark_safe
 
 logger = logging.getLogger("peerinst_console_log")
@@ -282,6 +291,38 @@ def student_list_from_student_groups(group_list):
     return student_ids
 
 
+def _question_search_filter(search_string, is_old_query=False):
+    from peerinst.models import QuestionSearchIndex
+
+    if QuestionSearchIndex.is_enabled():
+        q = QuestionSearchIndex.search_filter(
+            search_string, extended=is_old_query
+        )
+        if search_string.isdigit() and not is_old_query:
+            q |= Q(pk=int(search_string))
+        return q
+    if is_old_query:
+        return (
+            Q(id__icontains=search_string)
+            | Q(text__icontains=search_string)
+            | Q(title__icontains=search_string)
+            | Q(category__title__icontains=search_string)
+            | Q(discipline__title__icontains=search_string)
+            | Q(answerchoice__text__icontains=search_string)
+            | Q(user__username__icontains=search_string)
+        )
+    elif search_string.isdigit():
+        return (
+            Q(text__icontains=search_string)
+            | Q(title__icontains=search_string)
+            | Q(pk=int(search_string))
+        )
+    else:
+        return Q(text__icontains=search_string) | Q(
+            title__icontains=search_string
+        )
+
+
 def question_search_function(
     search_string, pre_filtered_list=None, is_old_query=False
 ):
@@ -294,7 +335,7 @@ def question_search_function(
     """
     is_old_query is True when query is sent from assignment or blink view
     """
-    from peerinst.models import Question
+    from peerinst.models import Question, QuestionSearchIndex
 
     if pre_filtered_list:
         assert isinstance(pre_filtered_list, QuerySet)
@@ -302,41 +343,114 @@ def question_search_function(
     search_list = (
         pre_filtered_list if pre_filtered_list else Question.objects.all()
     )
-    if is_old_query:
-        query_result = (
-            search_list.filter(
-                Q(id__icontains=search_string)
-                | Q(text__icontains=search_string)
-                | Q(title__icontains=search_string)
-                | Q(category__title__icontains=search_string)
-                | Q(discipline__title__icontains=search_string)
-                | Q(answerchoice__text__icontains=search_string)
-                | Q(user__username__icontains=search_string)
+    query_result = search_list.filter(
+        _question_search_filter(search_string, is_old_query)
+    )
+    if QuestionSearchIndex.is_enabled():
+        # the index has no joins, so the answer count can be read directly
+        return query_result.annotate(
+            answer_total=_question_answer_total()
+        ).order_by("-answer_total")
+    return query_result.annotate(
+        answer_total=Count("answer", distinct=True)
+    ).order_by("-answer_total")
+
+
+def _question_answer_total():
+    from peerinst.models import Answer, QuestionSearchIndex
+
+    if QuestionSearchIndex.is_enabled():
+        return Coalesce(F("search_index__n_answers"), 0)
+    return Coalesce(
+        Subquery(
+            Answer.objects.filter(question=OuterRef("pk"))
+            .order_by()
+            .values("question")
+            .annotate(n=Count("pk"))
+            .values("n")
+        ),
+        0,
+    )
+
+
+def ranked_question_search(search_terms, search_list, is_old_query=False):
+    """
+    Searches `search_list` for all the search terms in a single query.
+    Questions matching an earlier term are ranked first, then the most
+    answered ones. Flagged questions and questions missing answer choices
+    are excluded in the query, so the result may be paginated by the
+    database.
+
+    Parameters
+    ----------
+    search_terms : List[str]
+        Search terms, in order of importance
+    search_list : QuerySet[Question]
+        Questions to search
+    is_old_query : bool (default : False)
+        If the search comes from the assignment or blink views, in which
+        case more fields are searched
+
+    Returns
+    -------
+    QuerySet[Question]
+        Matching questions, annotated with:
+            rank : int
+                Index of the first search term matched
+            answer_total : int
+                Number of answers
+    """
+    from peerinst.models import AnswerChoice, Question, QuestionFlag
+
+    matches = [
+        search_list.filter(_question_search_filter(term, is_old_query))
+        .order_by()
+        .values("pk")
+        for term in search_terms
+    ]
+
+    answer_choices = AnswerChoice.objects.filter(
+        question=OuterRef("pk")
+    ).order_by()
+
+    return (
+        Question.objects.filter(
+            reduce(operator.or_, (Q(pk__in=match) for match in matches))
+        )
+        .exclude(
+            Exists(
+                QuestionFlag.objects.filter(question=OuterRef("pk"), flag=True)
             )
-            .annotate(answer_total=Count("answer", distinct=True))
-            .order_by("-answer_total")
         )
-    elif search_string.isdigit():
-        query_result = (
-            search_list.filter(
-                Q(text__icontains=search_string)
-                | Q(title__icontains=search_string)
-                | Q(pk=int(search_string))
+        .annotate(
+            n_answer_choices=Coalesce(
+                Subquery(
+                    answer_choices.values("question")
+                    .annotate(n=Count("pk"))
+                    .values("n")
+                ),
+                0,
             )
-            .annotate(answer_total=Count("answer", distinct=True))
-            .order_by("-answer_total")
         )
-    else:
-        query_result = (
-            search_list.filter(
-                Q(text__icontains=search_string)
-                | Q(title__icontains=search_string)
+        .filter(
+            Q(type="RO")
+            | Q(
+                Exists(answer_choices.filter(correct=True)),
+                n_answer_choices__gt=1,
             )
-            .annotate(answer_total=Count("answer", distinct=True))
-            .order_by("-answer_total")
         )
-
-    return query_result
+        .annotate(
+            rank=Case(
+                *(
+                    When(pk__in=match, then=Value(i))
+                    for i, match in enumerate(matches)
+                ),
+                output_field=IntegerField(),
+            ),
+            answer_total=_question_answer_total(),
+        )
+        .order_by("rank", "-answer_total", "pk")
+    )
 
 
 def get_student_objects_from_group_list(student_groups):
@@ -920,24 +1034,96 @@ def report_data_by_question(assignment_list, student_groups):
     return gradebook_question
 
 
+LTIEVENT_COLUMNS = [
+    "username",
+    "course_id",
+    "referer",
+    "agent",
+    "accept_language",
+]
+
+LTIEVENT_EVENT_COLUMNS = [
+    "event_type",
+    "assignment_id",
+    "question_text",
+    "question_id",
+    "timestamp",
+    "rationales",
+    "success",
+    "assignment_title",
+    "rationale_algorithm",
+    "chosen_rationale_id",
+    "second_answer_choice",
+    "first_answer_choice",
+    "rationale",
+]
+
+
+def _flatten_event_log(
+    event_type, timestamp, event_log, columns, event_columns
+):
+    try:
+        event_dict = {c: event_log["event"].get(c) for c in event_columns}
+        event_dict.update({c: event_log.get(c) for c in columns})
+    except (AttributeError, KeyError, TypeError):
+        event_dict = {}
+    event_dict["event_type"] = event_type
+    event_dict["timestamp"] = timestamp
+    return event_dict
+
+
 def build_event_dict(e, columns, event_columns):
     """
     given and LtiEvent
     return flattened dict with specified columns
     """
-    try:
-        event_dict1 = {c: e.event_log["event"].get(c) for c in event_columns}
-        event_dict2 = {c: e.event_log.get(c) for c in columns}
-        event_dict = event_dict1.copy()
-        event_dict.update(event_dict2)
-        event_dict["event_type"] = e.event_type
-        event_dict["timestamp"] = e.timestamp
-    except TypeError:
-        event_dict = {}
-        event_dict["event_type"] = e.event_type
-        event_dict["timestamp"] = e.timestamp
+    return _flatten_event_log(
+        e.event_type, e.timestamp, e.event_log, columns, event_columns
+    )
 
-    return event_dict
+
+def iter_event_dataframes(events, chunk_size=10000):
+    """
+    Yields the events as dataframes of at most `chunk_size` rows, with the
+    columns of `serialize_events_to_dataframe`. Each frame is built once from
+    per-column lists, and the events of a queryset are streamed from the
+    database without instantiating the models.
+
+    Parameters
+    ----------
+    events : Union[QuerySet, Iterable[LtiEvent]]
+        Events to serialize
+    chunk_size : int (default : 10000)
+        Maximum number of rows of each dataframe
+
+    Returns
+    -------
+    Iterator[pd.DataFrame]
+        Dataframes of consecutive events
+    """
+    import pandas as pd
+
+    columns = LTIEVENT_COLUMNS + LTIEVENT_EVENT_COLUMNS
+
+    if isinstance(events, QuerySet):
+        rows = events.values_list(
+            "event_type", "timestamp", "event_log"
+        ).iterator(chunk_size=chunk_size)
+    else:
+        rows = ((e.event_type, e.timestamp, e.event_log) for e in events)
+
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        data = {c: [] for c in columns}
+        for row in chunk:
+            event_dict = _flatten_event_log(
+                *row, LTIEVENT_COLUMNS, LTIEVENT_EVENT_COLUMNS
+            )
+            for c, values in data.items():
+                values.append(event_dict.get(c))
+        yield pd.DataFrame(data, columns=columns)
 
 
 def serialize_events_to_dataframe(events):
@@ -948,30 +1134,66 @@ def serialize_events_to_dataframe(events):
     """
     import pandas as pd
 
-    columns = ["username", "course_id", "referer", "agent", "accept_language"]
-
-    event_columns = [
-        "event_type",
-        "assignment_id",
-        "question_text",
-        "question_id",
-        "timestamp",
-        "rationales",
-        "success",
-        "assignment_title",
-        "rationale_algorithm",
-        "chosen_rationale_id",
-        "second_answer_choice",
-        "first_answer_choice",
-        "rationale",
-    ]
+    dataframes = list(iter_event_dataframes(events))
+    if not dataframes:
+        return pd.DataFrame(columns=LTIEVENT_COLUMNS + LTIEVENT_EVENT_COLUMNS)
+    return pd.concat(dataframes, ignore_index=True)
 
-    df = pd.DataFrame(columns=columns + event_columns)
 
-    for i, e in enumerate(events):
-        df.loc[i] = pd.Series(build_event_dict(e, columns, event_columns))
+def _event_value_to_text(value):
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def export_events(events, path, file_format="csv", chunk_size=100000):
+    """
+    Writes the events to `path` chunk by chunk, so exports don't need to hold
+    all the events in memory.
+
+    Parameters
+    ----------
+    events : Union[QuerySet, Iterable[LtiEvent]]
+        Events to export
+    path : str
+        For csv, the file written. For parquet, a new or empty directory in
+        which each chunk is written as `part-<n>.parquet`, which
+        `pd.read_parquet` reads back as a whole.
+    file_format : str (default : "csv")
+        "csv" or "parquet", which needs pyarrow. In parquet files, all the
+        columns but the timestamp are stored as text, nested values as json.
+    chunk_size : int (default : 100000)
+        Number of events in each chunk
 
-    return df
+    Returns
+    -------
+    int
+        Number of events written
+    """
+    if file_format not in ("csv", "parquet"):
+        raise ValueError(f"Unknown file format {file_format}.")
+
+    if file_format == "parquet":
+        os.makedirs(path, exist_ok=True)
+        if os.listdir(path):
+            raise ValueError(f"The directory {path} isn't empty.")
+
+    n = 0
+    for i, df in enumerate(iter_event_dataframes(events, chunk_size)):
+        if file_format == "csv":
+            df.to_csv(path, mode="a" if i else "w", header=not i, index=False)
+        else:
+            # values are stored as text so every part has the same schema,
+            # whatever the values present in its chunk
+            for c in df.columns.drop("timestamp"):
+                df[c] = df[c].map(_event_value_to_text).astype("string")
+            df.to_parquet(
+                os.path.join(path, f"part-{i:05d}.parquet"), index=False
+            )
+        n += len(df)
+    return n
 
 
 # https://stackoverflow.com/questions/1060279/iterating-through-a-range-of-dates-in-python
@@ -980,57 +1202,150 @@ def make_daterange(start_date, end_date):
         yield start_date + datetime.timedelta(n)
 
 
-def load_shown_rationales_from_ltievent_logs(day_of_logs):
-    from peerinst.models import Answer, LtiEvent, ShownRationale
+def _iter_ltievent_chunks(day_of_logs, event_type, chunk_size):
+    """
+    Yields the (timestamp, event_log) of a day's events of the given type in
+    lists of `chunk_size`, in chronological order.
+    """
+    from peerinst.models import LtiEvent
 
-    event_logs = LtiEvent.objects.filter(
-        timestamp__gte=day_of_logs,
-        timestamp__lte=day_of_logs + datetime.timedelta(hours=24),
+    events = (
+        LtiEvent.objects.filter(
+            timestamp__gte=day_of_logs,
+            timestamp__lte=day_of_logs + datetime.timedelta(hours=24),
+            event_type=event_type,
+        )
+        .order_by("timestamp", "pk")
+        .values_list("timestamp", "event_log")
+        .iterator(chunk_size=chunk_size)
     )
+    while True:
+        chunk = list(itertools.islice(events, chunk_size))
+        if not chunk:
+            return
+        yield chunk
 
-    for e in event_logs.iterator():
-        e_json = e.event_log
-        if e_json["event_type"] == "save_problem_success":
 
-            try:
-                try:
-                    shown_for_answer = Answer.objects.get(
-                        user_token=e_json["username"],
-                        question_id=e_json["event"]["question_id"],
-                        assignment_id=e_json["event"]["assignment_id"],
-                    )
-                except Answer.MultipleObjectsReturned:
-                    print(
-                        (
-                            "Multiple : ",
-                            e_json["username"],
-                            e_json["event"]["question_id"],
-                            e_json["event"]["assignment_id"],
-                        )
-                    )
-                try:
-                    for r in e_json["event"]["rationales"]:
-                        (
-                            obj,
-                            created,
-                        ) = ShownRationale.objects.get_or_create(  # noqa
-                            shown_answer=Answer.objects.get(pk=r["id"]),
-                            shown_for_answer=shown_for_answer,
-                        )
-                except KeyError:
-                    print("No Rationales")
-                    print(e_json)
-
-            except Answer.DoesNotExist:
-                print(
-                    (
-                        "Not found : ",
-                        e_json["username"],
-                        e_json["event"]["question_id"],
-                        e_json["event"]["assignment_id"],
-                    )
-                )
-    return
+def _ltievent_key(event_json):
+    try:
+        return (
+            event_json["username"],
+            int(event_json["event"]["question_id"]),
+            event_json["event"]["assignment_id"],
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _get_answers_for_ltievents(keys, fields=()):
+    """
+    Fetches in a single query the answers corresponding to the
+    (username, question_id, assignment_id) keys of events. Keys matching
+    several answers are logged and left out.
+
+    Returns
+    -------
+    Dict[Tuple[str, int, str], Answer]
+        Answer for each key
+    """
+    from peerinst.models import Answer
+
+    if not keys:
+        return {}
+
+    answers = {}
+    ambiguous = set()
+    for answer in Answer.objects.filter(
+        user_token__in={key[0] for key in keys},
+        question_id__in={key[1] for key in keys},
+        assignment_id__in={key[2] for key in keys},
+    ).only("pk", "user_token", "question_id", "assignment_id", *fields):
+        key = (answer.user_token, answer.question_id, answer.assignment_id)
+        if key not in keys:
+            continue
+        if key in answers:
+            ambiguous.add(key)
+        answers[key] = answer
+
+    for key in ambiguous:
+        logger.info(f"Multiple : {key}")
+        del answers[key]
+    for key in keys - answers.keys() - ambiguous:
+        logger.info(f"Not found : {key}")
+    return answers
+
+
+def _log_backfill(name, day_of_logs, n_events, n_written, start):
+    elapsed = max(time.perf_counter() - start, 1e-6)
+    logger.info(
+        f"{name} {day_of_logs:%Y-%m-%d}: {n_events} events, "
+        f"{n_written} written in {elapsed:.2f}s "
+        f"({n_events / elapsed:.0f} events/s)"
+    )
+
+
+def load_shown_rationales_from_ltievent_logs(day_of_logs, chunk_size=2000):
+    """
+    Creates the ShownRationale objects recorded in a day's
+    save_problem_success events. Events are read in chunks, with one query
+    for the answers and one for the existing shown rationales of each chunk.
+
+    Returns
+    -------
+    Tuple[int, int]
+        Number of events read and of shown rationales created
+    """
+    from peerinst.models import Answer, ShownRationale
+
+    start = time.perf_counter()
+    n_events = 0
+    n_created = 0
+
+    for chunk in _iter_ltievent_chunks(
+        day_of_logs, "save_problem_success", chunk_size
+    ):
+        n_events += len(chunk)
+        events = []
+        for _, e_json in chunk:
+            key = _ltievent_key(e_json)
+            if key is None:
+                continue
+            if "rationales" not in e_json["event"]:
+                logger.info(f"No Rationales : {key}")
+                continue
+            events.append((key, e_json["event"]["rationales"]))
+
+        answers = _get_answers_for_ltievents({key for key, _ in events})
+        pairs = {
+            (answers[key].pk, rationale["id"])
+            for key, rationales in events
+            if key in answers
+            for rationale in rationales
+        }
+        shown_answers = set(
+            Answer.objects.filter(
+                pk__in={shown for _, shown in pairs}
+            ).values_list("pk", flat=True)
+        )
+        existing = set(
+            ShownRationale.objects.filter(
+                shown_for_answer__in={shown_for for shown_for, _ in pairs}
+            ).values_list("shown_for_answer", "shown_answer")
+        )
+        new = [
+            ShownRationale(
+                shown_for_answer_id=shown_for, shown_answer_id=shown
+            )
+            for shown_for, shown in pairs - existing
+            if shown in shown_answers
+        ]
+        ShownRationale.objects.bulk_create(
+            new, batch_size=chunk_size, ignore_conflicts=True
+        )
+        n_created += len(new)
+
+    _log_backfill("Shown rationales", day_of_logs, n_events, n_created, start)
+    return n_events, n_created
 
 
 def get_average_time_spent_on_all_question_start(
@@ -1106,322 +1421,67 @@ def get_answer_corresponding_to_ltievent_log(event_json):
     return answer_obj
 
 
-def populate_answer_start_time_from_ltievent_logs(day_of_logs, event_type):
+def populate_answer_start_time_from_ltievent_logs(
+    day_of_logs, event_type, chunk_size=2000
+):
     """
     Given a date, filter event logs to populate Answer.datetime_start field for
-    answer instances already in database
+    answer instances already in database. Events are read in chunks, with one
+    query for the answers of each chunk and their updates written in bulk.
+
+    Returns
+    -------
+    Tuple[int, int]
+        Number of events read and of answers updated
     """
-    from peerinst.models import LtiEvent
+    from peerinst.models import Answer
 
     if event_type == "problem_show":
         field = "datetime_start"
     elif event_type == "problem_check":
         field = "datetime_first"
 
-    event_logs = LtiEvent.objects.filter(
-        timestamp__gte=day_of_logs,
-        timestamp__lte=day_of_logs + datetime.timedelta(hours=24),
-    )
-    i = 0
-    for e in event_logs.iterator():
-        e_json = e.event_log
+    start = time.perf_counter()
+    n_events = 0
+    n_updated = 0
 
+    for chunk in _iter_ltievent_chunks(day_of_logs, event_type, chunk_size):
+        n_events += len(chunk)
         # problem_check events have two associated logs each
         # the earlier one will correspond to when the first_answer was saved
         # and hence is the one we want assocated with datetime_first.
         # The correct log does not have the "rationales" key in the log
         # If "rationales" in in event log, ignore this log event
-        if event_type == "problem_check" and "rationales" in e_json["event"]:
-            logger.info("skipping log event")
-            continue
-
-        # we are ignoring save_problem_success events, as they have already
-        # been handled
-        if e_json["event_type"] == event_type:
-
-            answer_obj = get_answer_corresponding_to_ltievent_log(
-                event_json=e_json
+        events = [
+            (_ltievent_key(e_json), timestamp)
+            for timestamp, e_json in chunk
+            if not (
+                event_type == "problem_check"
+                and "rationales" in e_json["event"]
             )
-            if answer_obj:
-                # keep the latest time at which student accessed
-                # problem start page
-                if getattr(answer_obj, field):
-                    if (
-                        getattr(answer_obj, field) < e.timestamp
-                        and event_type == "problem_show"
-                    ):
-                        setattr(answer_obj, field, e.timestamp)
-                        answer_obj.save()
-                        i += 1
-                    else:
-                        pass
-                else:
-                    setattr(answer_obj, field, e.timestamp)
-                    answer_obj.save()
-                    i += 1
-
-            else:
-                logger.info(
-                    "Not found : ",
-                    e_json["username"],
-                    e_json["event"]["question_id"],
-                    e_json["event"]["assignment_id"],
-                )
-
-    logger.info(f"{i} answer {field} times updated")
-    return
-
-
-def get_student_activity_data(teacher):
-    # TODO: Refactor to avoid circular import
-    from datetime import datetime, timedelta
-
-    from .models import Answer, Student, StudentGroupAssignment
-
-    current_groups = teacher.current_groups.all()
-
-    all_current_students = Student.objects.filter(groups__in=current_groups)
-
-    last_week = datetime.utcnow().replace(tzinfo=pytz.utc) - timedelta(days=7)
-    next_week = datetime.utcnow().replace(tzinfo=pytz.utc) + timedelta(days=7)
-
-    if not teacher.last_dashboard_access:
-        teacher.last_dashboard_access = last_week
-
-    # Standalone
-    standalone_assignments_all = StudentGroupAssignment.objects.filter(
-        group__in=current_groups
-    ).filter(distribution_date__isnull=False)
-
-    standalone_assignments = standalone_assignments_all.filter(
-        distribution_date__gte=last_week, due_date__lte=next_week
-    )
-
-    # if in between semesters, find most recent standalone assignment
-    if standalone_assignments.count() == 0:
-        try:
-            last_assignment = standalone_assignments_all.latest("due_date")
-            standalone_assignments = StudentGroupAssignment.objects.filter(
-                pk=last_assignment.pk
-            )
-        except StudentGroupAssignment.DoesNotExist:
-            standalone_assignments = StudentGroupAssignment.objects.none()
-
-    # print(standalone_assignments)
-
-    standalone_answers = Answer.objects.filter(
-        assignment__in=standalone_assignments.values("assignment")
-    ).filter(user_token__in=all_current_students.values("student__username"))
-
-    # LTI
-    lti_assignments = teacher.assignments.exclude(
-        identifier__in=standalone_assignments_all.values(
-            "assignment__identifier"
-        )
-    )
-
-    # print(lti_assignments)
-
-    lti_answers = Answer.objects.filter(assignment__in=lti_assignments).filter(
-        user_token__in=all_current_students.values("student__username")
-    )
-
-    # logic to infer most recent lti assignments
-    recent_assignments_list = (
-        lti_answers.filter(datetime_second__gte=last_week)
-        .order_by("-datetime_second")
-        .values_list("assignment_id", flat=True)
-    )
-    recent_assignments = lti_assignments.filter(
-        identifier__in=recent_assignments_list
-    )
-    # if in between semesters, simply get assignment of most recent answer
-    if len(recent_assignments) == 0 and lti_answers.count() > 0:
-        print(lti_answers.count())
-        most_recent_lti_assignment = lti_answers.latest(
-            "datetime_second"
-        ).assignment
-        print("most recent lti answer")
-        recent_assignments = lti_assignments.filter(
-            identifier=most_recent_lti_assignment.identifier
-        )
-
-    # drop any assignment whose last answer is older than 3 months
-    three_months_ago = datetime.utcnow().replace(tzinfo=pytz.utc) + timedelta(
-        days=90
-    )
-    stale_lti_assignments = [
-        a.identifier
-        for a in recent_assignments
-        if a.answer_set.latest("datetime_second").datetime_second
-        < three_months_ago
-    ]
-    # print("recent_assignments")
-    # print(recent_assignments)
-    # print("stale")
-    # print(stale_lti_assignments)
-    if len(stale_lti_assignments) > 0:
-        recent_assignments = recent_assignments.exclude(
-            identifier__in=stale_lti_assignments
+        ]
+        answers = _get_answers_for_ltievents(
+            {key for key, _ in events if key is not None}, fields=[field]
         )
 
-    lti_answers = lti_answers.filter(assignment_id__in=recent_assignments)
+        updated = {}
+        for key, timestamp in events:
+            answer = answers.get(key)
+            if answer is None:
+                continue
+            # keep the latest time at which student accessed
+            # problem start page, and the earliest first answer
+            if getattr(answer, field) is None or (
+                event_type == "problem_show"
+                and getattr(answer, field) < timestamp
+            ):
+                setattr(answer, field, timestamp)
+                updated[answer.pk] = answer
 
-    all_answers_by_group = {}
-    for g in current_groups:
-        all_answers_by_group[g] = {}
-        student_list = g.students.all().values_list(
-            "student__username", flat=True
+        Answer.objects.bulk_update(
+            updated.values(), [field], batch_size=chunk_size
         )
-        if len(student_list) > 0:
-            # Keyed on studentgroupassignment
-            for ga in standalone_assignments:
-                if (
-                    ga.assignment.questions.count() > 0
-                    and ga in g.studentgroupassignment_set.all()
-                ):
-                    answers = [
-                        a
-                        for a in standalone_answers
-                        if a.user_token in student_list
-                        and a.assignment == ga.assignment
-                    ]
-                    # print("standalone keys")
-                    # print(g, ga)
-                    # print(len(answers))
-                    all_answers_by_group[g][ga] = {}
-                    all_answers_by_group[g][ga]["answers"] = answers
-                    all_answers_by_group[g][ga]["new"] = [
-                        a
-                        for a in standalone_answers
-                        if a.user_token in student_list
-                        and a.assignment == ga.assignment
-                        and (
-                            (
-                                a.datetime_start
-                                and a.datetime_start
-                                > teacher.last_dashboard_access
-                            )
-                            or (
-                                a.datetime_first
-                                and a.datetime_first
-                                > teacher.last_dashboard_access
-                            )
-                            or (
-                                a.datetime_second
-                                and a.datetime_second
-                                > teacher.last_dashboard_access
-                            )
-                        )
-                    ]
-                    all_answers_by_group[g][ga]["percent_complete"] = int(
-                        100.0
-                        * len(all_answers_by_group[g][ga]["answers"])
-                        / (len(student_list) * ga.assignment.questions.count())
-                    )
-
-            # Keyed on assignment
-            for l in lti_assignments:  # noqa
-                answers = [
-                    a
-                    for a in lti_answers
-                    if a.user_token in student_list and a.assignment == l
-                ]
-                if l.questions.count() > 0 and len(answers) > 0:
-                    # print("lti keys")
-                    # print(l, g)
-                    # print(len(answers))
-                    all_answers_by_group[g][l] = {}
-                    all_answers_by_group[g][l]["answers"] = answers
-                    all_answers_by_group[g][l]["new"] = [
-                        a
-                        for a in lti_answers
-                        if a.user_token in student_list
-                        and a.assignment == l
-                        and (
-                            (
-                                a.datetime_start
-                                and a.datetime_start
-                                > teacher.last_dashboard_access
-                            )
-                            or (
-                                a.datetime_first
-                                and a.datetime_first
-                                > teacher.last_dashboard_access
-                            )
-                            or (
-                                a.datetime_second
-                                and a.datetime_second
-                                > teacher.last_dashboard_access
-                            )
-                        )
-                    ]
-                    all_answers_by_group[g][l]["percent_complete"] = int(
-                        100.0
-                        * len(all_answers_by_group[g][l]["answers"])
-                        / (len(student_list) * l.questions.count())
-                    )
-
-    # JSON
-    json_data = {}
-    for group_key, group_assignments in list(all_answers_by_group.items()):
-        json_data[group_key.name] = {}
-        for key, value_list in list(group_assignments.items()):
-            if len(value_list["answers"]) > 0:
-                try:
-                    assignment = key.assignment
-                    id = key.assignment.identifier
-
-                    date = (
-                        value_list["answers"][0].datetime_first
-                        if value_list["answers"][0].datetime_first
-                        else value_list["answers"][0].datetime_second
-                    )
-
-                    if key.distribution_date < date:
-                        start_date = key.distribution_date
-                    else:
-                        start_date = date
-
-                    date = (
-                        value_list["answers"][-1].datetime_first
-                        if value_list["answers"][-1].datetime_first
-                        else value_list["answers"][-1].datetime_second
-                    )
-
-                    if key.due_date > date:
-                        end_date = key.due_date
-                    else:
-                        end_date = date
-                except Exception:
-                    assignment = key
-                    id = key.identifier
-                    start_date = value_list["answers"][0].datetime_first
-                    end_date = value_list["answers"][-1].datetime_first
-
-                json_data[group_key.name][id] = {}
-                json_data[group_key.name][id]["distribution_date"] = str(
-                    start_date
-                )
-                json_data[group_key.name][id]["due_date"] = str(end_date)
-                json_data[group_key.name][id]["last_login"] = str(
-                    teacher.last_dashboard_access
-                )
-                json_data[group_key.name][id]["now"] = str(
-                    datetime.utcnow().replace(tzinfo=pytz.utc)
-                )
-                json_data[group_key.name][id]["total"] = (
-                    group_key.students.all().count()
-                    * assignment.questions.count()
-                )
-                json_data[group_key.name][id]["answers"] = []
-                for answer in value_list["answers"]:
-                    json_data[group_key.name][id]["answers"].append(
-                        str(
-                            answer.datetime_first
-                            if answer.datetime_first
-                            else answer.datetime_second
-                        )
-                    )
+        n_updated += len(updated)
 
-    return all_answers_by_group, json_data
+    _log_backfill(f"Answer {field}", day_of_logs, n_events, n_updated, start)
+    return n_events, n_updated
@@ -194,10 +194,24 @@ def get_context_data_index_page(req, student, new_student):
 
     StudentNotification.clean(student)
 
-    groups = StudentGroupMembership.objects.filter(student=student)
+    groups = StudentGroupMembership.objects.filter(
+        student=student
+    ).select_related("group")
+
+    student_assignments = list(
+        StudentAssignment.objects.filter(
+            student=student,
+            group_assignment__group__in=[group.group for group in groups],
+        )
+        .select_related("group_assignment__assignment", "student__student")
+        .order_by("-group_assignment__due_date")
+    )
+    results = StudentAssignment.get_results(student_assignments)
 
-    assignments = {
-        group: [
+    assignments = {group: [] for group in groups}
+    groups_ = {group.group_id: group for group in groups}
+    for assignment, results_ in zip(student_assignments, results):
+        assignments[groups_[assignment.group_assignment.group_id]].append(
             {
                 "title": assignment.group_assignment.assignment.title,
                 "pk": assignment.group_assignment.assignment.pk,
@@ -213,15 +227,10 @@ def get_context_data_index_page(req, student, new_student):
                         },
                     ),
                 ),
-                "results": assignment.results,
-                "done": assignment.completed,
+                "results": results_["results"],
+                "done": results_["completed"],
             }
-            for assignment in StudentAssignment.objects.filter(
-                student=student, group_assignment__group=group.group
-            ).order_by("-group_assignment__due_date")
-        ]
-        for group in groups
-    }
+        )
 
     assignments = {
         group: [
@@ -480,6 +489,15 @@ def join_group(req, student):
         student.student.username, student.student.email
     )
 
+    student_assignments = list(
+        StudentAssignment.objects.filter(
+            student=student, group_assignment__group=group
+        )
+        .select_related("group_assignment__assignment", "student__student")
+        .order_by("-group_assignment__due_date")
+    )
+    results = StudentAssignment.get_results(student_assignments)
+
     data = {
         "name": group.name,
         "title": group.title,
@@ -500,12 +518,10 @@ def join_group(req, student):
                         },
                     ),
                 ),
-                "results": assignment.results,
-                "done": assignment.completed,
+                "results": results_["results"],
+                "done": results_["completed"],
             }
-            for assignment in StudentAssignment.objects.filter(
-                student=student, group_assignment__group=group
-            ).order_by("-group_assignment__due_date")
+            for assignment, results_ in zip(student_assignments, results)
         ],
         "student_id": membership.student_school_id,
         "student_id_needed": group.student_id_needed,
@@ -35,10 +35,10 @@ from ..models import (
 )
 from ..rationale_annotation import (
     choose_questions,
-    choose_rationales_no_quality,
+    choose_rationales,
 )
+from ..student_activity import get_student_activity_data
 from ..tasks import compute_gradebook_async
-from ..util import get_student_activity_data
 from .decorators import teacher_required
 
 logger = logging.getLogger("peerinst-views")
@@ -73,7 +73,7 @@ def dashboard(req, teacher):
     student_activity_data, student_activity_json = get_student_activity_data(
         teacher=teacher
     )
-    rationales = choose_rationales_no_quality(teacher, n=1)
+    rationales = choose_rationales(teacher, n=1)
     context = {
         "data": json.dumps(data),
         "question_list": choose_questions(teacher).order_by("?")[:1],
@@ -270,7 +270,7 @@ def rationales_to_score(req, teacher):
     -------
     HttpResponse
     """
-    rationales = choose_rationales_no_quality(teacher, n=1)
+    rationales = choose_rationales(teacher, n=1)
 
     return TemplateResponse(
         req,
@@ -637,7 +637,8 @@ def download_gradebook(req, teacher, results=None):
     teacher : Teacher
         Teacher instance returned by `teacher_required` (not used)
     results : Optional[Dict[str, Any]]
-        Either
+        Gradebook computed in the request, whose `results` may be the
+        iterator of `iter_gradebook`. Either
             If group gradebook
                 {
                     group: str
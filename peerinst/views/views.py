@@ -49,7 +49,7 @@ from tinymce.widgets import TinyMCE
 
 from blink.models import BlinkRound
 from dalite.views.errors import response_400, response_404
-from peerinst import admin, forms, models, rationale_choice
+from peerinst import admin, events, forms, models, rationale_choice
 from peerinst.admin_views import get_question_rationale_aggregates
 from peerinst.elasticsearch import question_search as qs_ES
 from peerinst.mixins import (
@@ -81,14 +81,20 @@ from peerinst.models import (
     UserUrl,
 )
 from peerinst.stopwords import en, fr
+from peerinst.student_activity import get_student_activity_data
 from peerinst.tasks import mail_managers_async
 from peerinst.templatetags.bleach_html import STRICT_TAGS
+from peerinst.transitions import (
+    get_top_rationales,
+    get_transition_matrix,
+    get_transitions,
+    load_rationales,
+)
 from peerinst.util import (
     SessionStageData,
     get_object_or_none,
-    get_student_activity_data,
     int_or_none,
-    question_search_function,
+    ranked_question_search,
     report_data_by_assignment,
     report_data_by_question,
     report_data_by_student,
@@ -100,7 +106,6 @@ from tos.models import Consent, Tos
 
 from .decorators import ajax_login_required, ajax_user_passes_test
 
-LOGGER = logging.getLogger(__name__)
 LOGGER_teacher_activity = logging.getLogger("teacher_activity")
 performance_logger = logging.getLogger("performance")
 search_logger = logging.getLogger("search")
@@ -1039,8 +1044,7 @@ class QuestionFormView(QuestionMixin, FormView):
             "username": self.user_token,
         }
 
-        # Write JSON to log file
-        LOGGER.info(json.dumps(event))
+        events.emit(event)
 
     def submission_error(self):
         messages.error(
@@ -1495,53 +1499,55 @@ class AnswerSummaryChartView(View):
         ]
         # Other columns will be dynamically present, depending on which choices
         # were available on a given question.
+        choices = list(question.answerchoice_set.all())
         to_columns = [
             (
                 f"to_{question.get_choice_label(i)}",
                 f"To {question.get_choice_label(i)}",
             )
-            for i in range(1, question.answerchoice_set.count() + 1)
+            for i in range(1, len(choices) + 1)
         ]
+        # Count the answers for each first and second answer choice and
+        # chosen rationale in a single query
+        transitions = get_transitions(
+            models.Answer.objects.filter(
+                question=question, assignment=assignment
+            ),
+            include_own_rationales=True,
+        )
+        matrix = get_transition_matrix(transitions, len(choices), key="n_all")
         # Initialize a list of answers that we can add details to
         answers = []
-        for i, answer in enumerate(question.answerchoice_set.all(), start=1):
+        for i, answer in enumerate(choices, start=1):
             # Get the label for the row, and the counts for how many students
             # chose this answer the first time, and the second time.
             answer_row = {
                 "label": f"Answer {question.get_choice_label(i)}: {answer.text}",
-                "before": models.Answer.objects.filter(
-                    question=question,
-                    first_answer_choice=i,
-                    assignment=assignment,
-                ).count(),
-                "after": models.Answer.objects.filter(
-                    question=question,
-                    second_answer_choice=i,
-                    assignment=assignment,
-                ).count(),
+                "before": sum(
+                    transition["n_all"]
+                    for transition in transitions
+                    if transition["first"] == i
+                ),
+                "after": sum(
+                    transition["n_all"]
+                    for transition in transitions
+                    if transition["second"] == i
+                ),
             }
             for j, column in enumerate(to_columns, start=1):
-                # For every other answer, determine the count of students who
-                # chose this answer the first time, but the other answer the
-                # second time.
-                answer_row[column[0]] = models.Answer.objects.filter(
-                    question=question,
-                    first_answer_choice=i,
-                    second_answer_choice=j,
-                    assignment=assignment,
-                ).count()
+                # For every other answer, the count of students who chose this
+                # answer the first time, but the other answer the second time.
+                answer_row[column[0]] = matrix[i - 1][j - 1]
             # Get the top five rationales for this answer to display underneath
             # the chart
-            _, rationales = get_question_rationale_aggregates(
-                assignment,
-                question,
+            answer_row["rationales"] = get_top_rationales(
+                transitions,
                 5,
-                choice_id=i,
-                include_own_rationales=True,
-            )
-            answer_row["rationales"] = rationales["chosen"]
+                lambda transition, i=i: transition["second"] == i,
+            )[0]
             # Save everything about this answer into the list of table rows
             answers.append(answer_row)
+        load_rationales(*(answer_row["rationales"] for answer_row in answers))
         # Build a list of all the columns that will be used in this chart
         columns = [
             {"name": name, "label": label}
@@ -2353,29 +2359,13 @@ def question_search(request):
         if len(search_string_split_list) > 1:
             search_terms.extend(search_string_split_list)
 
-        query = []
-        query_all = []
-        # by searching first for full string, and then for constituent parts,
-        # and preserving order, the results should rank the items higher to the
-        # top that have the entire search_string included
-        query_meta = {}
-        for term in search_terms:
-            query_term = question_search_function(
-                term, search_list, (type == "assignment" or type == "blink")
-            )
-            query_term = query_term.exclude(id__in=q_qs).distinct()
-
-            query_term = [
-                q
-                for q in query_term
-                if q not in query_all
-                and q.is_not_flagged
-                and q.is_not_missing_answer_choices
-            ]
-
-            query_meta[term] = query_term
-
-            query_all.extend(query_term)
+        # the questions matching the entire search_string are ranked first,
+        # then those matching its constituent parts
+        query_all = ranked_question_search(
+            search_terms,
+            search_list,
+            (type == "assignment" or type == "blink"),
+        ).exclude(id__in=q_qs)
 
         paginator = Paginator(query_all, 50)
         try:
@@ -2386,12 +2376,11 @@ def question_search(request):
             query_subset = paginator.page(paginator.num_pages)
 
         query = []
-
-        for term in list(query_meta.keys()):
+        for i, term in enumerate(search_terms):
             query_dict = {}
             query_dict["term"] = term
             query_dict["questions"] = [
-                q for q in query_meta[term] if q in query_subset.object_list
+                q for q in query_subset.object_list if q.rank == i
             ]
             query_dict["count"] = len(query_dict["questions"])
             query.append(query_dict)
@@ -2401,7 +2390,7 @@ def question_search(request):
         performance_logger.info(
             f"ORM time to query '{search_string}': {end - start:E}s"
         )
-        performance_logger.info(f"Hit count: {len(query_all)}")
+        performance_logger.info(f"Hit count: {paginator.count}")
 
         return TemplateResponse(
             request,
@@ -2410,7 +2399,7 @@ def question_search(request):
                 "paginator": query_subset,
                 "search_results": query,
                 "form_field_name": form_field_name,
-                "count": len(query_all),
+                "count": paginator.count,
                 "previous_search_string": search_terms,
                 "assignment": assignment,
                 "type": type,
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from quality.models import LikelihoodLanguage
+from quality.models.criterion.criterions.likelihood.data import convert_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert the n-gram files of the likelihood languages to memory "
+        "mapped arrays, downloading them if needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "languages",
+            nargs="*",
+            type=str,
+            help="Languages to convert. All languages if none are given.",
+        )
+
+    def handle(self, *args, **options):
+        languages = LikelihoodLanguage.objects.all()
+        if options["languages"]:
+            languages = languages.filter(language__in=options["languages"])
+
+        for language in languages:
+            self.stdout.write(f"Converting {language.language}...")
+            convert_data(
+                language.language,
+                language.n_gram_urls,
+                language.left_to_right,
+            )
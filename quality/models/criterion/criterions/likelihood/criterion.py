@@ -1,4 +1,3 @@
-import contextlib
 import hashlib
 import json
 from functools import reduce
@@ -13,7 +12,7 @@ from dalite.models.custom_fields import CommaSepField, ProbabilityField
 from quality.models.criterion.criterion import Criterion, CriterionRules
 from quality.models.quality_type import QualityType, QualityUseType
 
-from .model import create_model
+from .model import get_model
 
 
 class LikelihoodLanguage(models.Model):
@@ -254,7 +253,7 @@ class LikelihoodCache(models.Model):
             likelihood = cache.likelihood
             likelihood_random = cache.likelihood_random
         except cls.DoesNotExist:
-            predict = create_model(
+            predict = get_model(
                 language.language,
                 language.n_gram_urls,
                 language.left_to_right,
@@ -303,34 +302,61 @@ class LikelihoodCache(models.Model):
             for rationale in rationales
         ]
 
-        likelihoods = []
-        for hash_ in hashes:
-            try:
-                cache = cls.objects.get(hash=hash_)
-                likelihoods.append((cache.likelihood, cache.likelihood_random))
-            except cls.DoesNotExist:
-                likelihoods.append(None)
+        likelihoods = {
+            hash_: (likelihood, likelihood_random)
+            for hash_, likelihood, likelihood_random in cls.objects.filter(
+                hash__in=set(hashes)
+            ).values_list("hash", "likelihood", "likelihood_random")
+        }
 
-        if not all(likelihoods):
-            predict = create_model(
+        missing = {}
+        for pk, rationale, hash_ in zip(pks, rationales, hashes):
+            if hash_ not in likelihoods and hash_ not in missing:
+                missing[hash_] = (pk, rationale)
+
+        if missing:
+            predict = get_model(
                 language.language,
                 language.n_gram_urls,
                 language.left_to_right,
                 max_gram,
             )
-            for (i, likelihood), pk, rationale, hash_ in zip(
-                enumerate(likelihoods), pks, rationales, hashes
+            predictions = predict.batch(
+                [rationale for pk, rationale in missing.values()]
+            )
+            caches = []
+            for (hash_, (pk, __)), (likelihood, likelihood_random) in zip(
+                missing.items(), predictions
             ):
-                if likelihood is None:
-                    _likelihood, likelihood_random = predict(rationale)
-                    with contextlib.suppress(IntegrityError):
-                        cls.objects.create(
-                            answer=pk,
-                            language=language,
-                            hash=hash_,
-                            likelihood=_likelihood,
-                            likelihood_random=likelihood_random,
-                        )
-                    likelihoods[i] = (_likelihood, likelihood_random)
-
-        return likelihoods
+                likelihoods[hash_] = (likelihood, likelihood_random)
+                caches.append(
+                    cls(
+                        answer=pk,
+                        language=language,
+                        hash=hash_,
+                        likelihood=likelihood,
+                        likelihood_random=likelihood_random,
+                    )
+                )
+            # Other servers may have written some of these in the meantime
+            cls.objects.bulk_create(caches, ignore_conflicts=True)
+
+        return [likelihoods[hash_] for hash_ in hashes]
+
+
+def warm_up_models():
+    """
+    Loads the models of every language for each max gram used by existing
+    rules so that the first evaluations don't have to read them from disk.
+    """
+    max_grams = LikelihoodCriterionRules.objects.values_list(
+        "max_gram", flat=True
+    ).distinct()
+    for language in LikelihoodLanguage.objects.all():
+        for max_gram in max_grams:
+            get_model(
+                language.language,
+                language.n_gram_urls,
+                language.left_to_right,
+                max_gram,
+            )
@@ -1,14 +1,21 @@
 import io
+import json
 import os
 import pickle
 import zipfile
 from itertools import product
 
+import numpy as np
 import requests
 
+from .scorer import NGramScorer
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), ".data")
+ARRAYS_VERSION = 1
+
 
 def read_data(language, urls, left_to_right):
-    path = os.path.join(os.path.dirname(__file__), ".data", language)
+    path = os.path.join(DATA_DIR, language)
 
     pkl_path = os.path.join(path, "data.pkl")
 
@@ -35,6 +42,122 @@ def read_data(language, urls, left_to_right):
     return data
 
 
+def read_arrays(language, urls, left_to_right):
+    """
+    Reads the n-gram log probability tables of the language as memory mapped
+    arrays so that all processes share the same copy through the page cache.
+    The arrays are converted from the n-gram files if they don't exist.
+
+    Parameters
+    ----------
+    language : str
+        Language of the data
+    urls : List[str]
+        Urls of the n-gram files, used if the data isn't on disk
+    left_to_right : bool
+        If the language is read from left to right
+
+    Returns
+    -------
+    Dict[str, Any]
+        Data with keys
+            alphabet : str
+                Characters of the language, in index order
+            log_probabilities : Dict[int, np.memmap]
+                Tables as returned by `NGramScorer.log_tables`
+            left_to_right : bool
+                If the language is read from left to right
+    """
+    path = os.path.join(DATA_DIR, language, "arrays")
+
+    meta = _read_arrays_meta(path)
+    if meta is None:
+        convert_data(language, urls, left_to_right)
+        meta = _read_arrays_meta(path)
+
+    return {
+        "alphabet": meta["alphabet"],
+        "log_probabilities": {
+            gram: np.load(
+                os.path.join(path, f"{gram}-grams.npy"), mmap_mode="r"
+            )
+            for gram in range(1, meta["max_gram"] + 1)
+        },
+        "left_to_right": meta["left_to_right"],
+    }
+
+
+def convert_data(language, urls, left_to_right):
+    """
+    Converts the n-gram files of the language to the array format read by
+    `read_arrays`, downloading them if needed. Each file is written under a
+    temporary name and moved in place, with the metadata written last, so
+    concurrent readers never see a partial conversion.
+
+    Parameters
+    ----------
+    language : str
+        Language of the data
+    urls : List[str]
+        Urls of the n-gram files, used if the data isn't on disk
+    left_to_right : bool
+        If the language is read from left to right
+    """
+    path = os.path.join(DATA_DIR, language)
+    arrays_path = os.path.join(path, "arrays")
+
+    grams = {
+        gram + 1: read_gram_file(language, gram + 1, url, path)
+        for gram, url in enumerate(urls)
+    }
+    alphabet = "".join(grams[1].keys())
+    probabilities = {
+        gram: np.fromiter(
+            (
+                val.get("".join(g), 1e-16)
+                for g in product(alphabet, repeat=gram)
+            ),
+            dtype=np.float64,
+            count=len(alphabet) ** gram,
+        )
+        for gram, val in grams.items()
+    }
+
+    if not os.path.exists(arrays_path):
+        os.makedirs(arrays_path, exist_ok=True)
+
+    tmp_suffix = f".{os.getpid()}.tmp"
+    for gram, table in NGramScorer.log_tables(probabilities).items():
+        gram_path = os.path.join(arrays_path, f"{gram}-grams.npy")
+        with open(gram_path + tmp_suffix, "wb") as f:
+            np.save(f, table)
+        os.replace(gram_path + tmp_suffix, gram_path)
+
+    meta_path = os.path.join(arrays_path, "meta.json")
+    with open(meta_path + tmp_suffix, "w") as f:
+        json.dump(
+            {
+                "version": ARRAYS_VERSION,
+                "alphabet": alphabet,
+                "max_gram": len(probabilities),
+                "left_to_right": left_to_right,
+            },
+            f,
+        )
+    os.replace(meta_path + tmp_suffix, meta_path)
+
+
+def _read_arrays_meta(path):
+    try:
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return None
+    if meta.get("version") != ARRAYS_VERSION:
+        return None
+    return meta
+
+
 def read_gram_file(language, gram, url, path):
     path = os.path.join(path, f"{gram}-grams.txt")
     if os.path.exists(path):
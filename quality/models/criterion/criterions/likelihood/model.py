@@ -1,31 +1,111 @@
-from functools import partial
+import threading
+from collections import OrderedDict
 from itertools import chain
 from math import log
 
-from .data import read_data
+from django.conf import settings
 
+from .data import read_arrays
+from .scorer import NGramScorer
 
-def create_model(language, urls, left_to_right, max_gram=3):
+_models = OrderedDict()
+_models_lock = threading.Lock()
+
+
+def get_model(language, urls, left_to_right, max_gram=3):
+    """
+    Returns the model for the given language, creating it only if it isn't
+    already loaded in this process. The least recently used models are
+    dropped once more than `LIKELIHOOD_MAX_MODELS` (default : 4) are loaded.
+
+    Parameters
+    ----------
+    language : str
+        Language of the model
+    urls : List[str]
+        Urls of the n-gram files, used if the data isn't on disk
+    left_to_right : bool
+        If the language is read from left to right
+    max_gram : int (default : 3)
+        Maximum size of n-grams to use
+
+    Returns
+    -------
+    Model
+        Model returning the log likelihood of a text in the language and in
+        a uniform language over the same characters
+    """
+    key = (language, max_gram, left_to_right)
+    with _models_lock:
+        if key in _models:
+            _models.move_to_end(key)
+        else:
+            _models[key] = create_model(
+                language, urls, left_to_right, max_gram
+            )
+            while len(_models) > getattr(settings, "LIKELIHOOD_MAX_MODELS", 4):
+                _models.popitem(last=False)
+        return _models[key]
 
-    data = {
+
+def clear_models():
+    with _models_lock:
+        _models.clear()
+
+
+def create_model(language, urls, left_to_right, max_gram=3):
+    data = read_arrays(language, urls, left_to_right)
+    log_probabilities = {
         gram: val
-        for gram, val in read_data(language, urls, left_to_right).items()
-        if len(gram) <= max_gram
-    }
-    data = read_data(language, urls, left_to_right)
-    data["n_grams"] = {
-        gram: val for gram, val in data["n_grams"].items() if gram <= max_gram
+        for gram, val in data["log_probabilities"].items()
+        if gram <= max_gram
     }
 
-    other = {
-        "n_grams": {
-            gram: {g: 1.0 / len(val) for g in val.keys()}
-            for gram, val in data["n_grams"].items()
-        },
-        "left_to_right": data["left_to_right"],
-    }
+    scorer = NGramScorer(
+        data["alphabet"], log_probabilities, data["left_to_right"]
+    )
+    other_scorer = NGramScorer.uniform(
+        data["alphabet"], len(log_probabilities), data["left_to_right"]
+    )
+
+    return Model(scorer, other_scorer)
+
+
+class Model:
+    """
+    Likelihood model of a language, scoring texts with vectorized n-gram
+    tables. Calling it on a text gives the same result as `predict`.
+    """
+
+    def __init__(self, scorer, other_scorer):
+        self.scorer = scorer
+        self.other_scorer = other_scorer
 
-    return partial(predict, data=data, other=other)
+    def __call__(self, text):
+        return self.batch([text])[0]
+
+    def batch(self, texts):
+        """
+        Returns the log likelihood of each text in the language and in a
+        uniform language over the same characters.
+
+        Parameters
+        ----------
+        texts : List[str]
+            Texts to evaluate
+
+        Returns
+        -------
+        List[Tuple[float, float]]
+            Log likelihoods of each text
+        """
+        texts = list(texts)
+        return list(
+            zip(
+                self.scorer.log_likelihoods(texts).tolist(),
+                self.other_scorer.log_likelihoods(texts).tolist(),
+            )
+        )
 
 
 def predict(text, data, other):
@@ -0,0 +1,198 @@
+from itertools import product
+
+import numpy as np
+
+
+class NGramScorer:
+    """
+    Scores texts with n-gram tables interned into integer indexed arrays.
+    Characters are encoded as their index in the alphabet and an n-gram
+    `c_1...c_n` as `c_1 * a^(n-1) + ... + c_n` where `a` is the alphabet
+    size, so each table is a flat array of size `a^n`.
+
+    The scores are the same as `model.log_likelihood` up to floating point
+    rounding.
+    """
+
+    def __init__(self, alphabet, log_probabilities, left_to_right):
+        """
+        Parameters
+        ----------
+        alphabet : str
+            Characters of the model, in index order
+        log_probabilities : Dict[int, np.ndarray]
+            Tables as returned by `log_tables`, which may be memory mapped
+        left_to_right : bool
+            If the language is read from left to right
+        """
+        self.alphabet = alphabet
+        self.size = len(alphabet)
+        self.n = len(log_probabilities)
+        self.left_to_right = left_to_right
+
+        self._lookup = np.full(
+            max(map(ord, alphabet), default=0) + 1, -2, dtype=np.int64
+        )
+        self._lookup[[ord(c) for c in alphabet]] = np.arange(self.size)
+
+        self._first = log_probabilities[1]
+        self._conditionals = {
+            gram: log_probabilities[gram] for gram in range(2, self.n + 1)
+        }
+
+    @staticmethod
+    def log_tables(probabilities):
+        """
+        Computes the log probability of the first character and the log
+        conditional probability of the last character of each n-gram given
+        the previous ones.
+
+        Parameters
+        ----------
+        probabilities : Dict[int, np.ndarray]
+            Probability of each n-gram for each n-gram size
+
+        Returns
+        -------
+        Dict[int, np.ndarray]
+            Log probability tables for each n-gram size
+        """
+        size = len(probabilities[1])
+        # Each term of the original sum has 1e-16 added to it
+        tables = {1: np.log(probabilities[1]) + 1e-16}
+        tables.update(
+            {
+                gram: np.log(
+                    probabilities[gram]
+                    / np.repeat(probabilities[gram - 1], size)
+                )
+                + 1e-16
+                for gram in range(2, len(probabilities) + 1)
+            }
+        )
+        return tables
+
+    @classmethod
+    def from_dict(cls, ngrams, left_to_right):
+        """
+        Creates the scorer from n-gram tables in the format of
+        `data.read_data`, with missing n-grams set to 1e-16.
+        """
+        alphabet = "".join(c for c in ngrams[1] if len(c) == 1)
+        probabilities = {
+            gram: np.fromiter(
+                (
+                    ngrams[gram].get("".join(g), 1e-16)
+                    for g in product(alphabet, repeat=gram)
+                ),
+                dtype=np.float64,
+                count=len(alphabet) ** gram,
+            )
+            for gram in range(1, len(ngrams) + 1)
+        }
+        return cls(alphabet, cls.log_tables(probabilities), left_to_right)
+
+    @classmethod
+    def uniform(cls, alphabet, n, left_to_right):
+        """
+        Creates a scorer where all n-grams of a given size have the same
+        probability. The tables are broadcast from a single value so they
+        don't take any memory.
+        """
+        value = np.log(1.0 / len(alphabet)) + 1e-16
+        log_probabilities = {
+            gram: np.broadcast_to(value, (len(alphabet) ** gram,))
+            for gram in range(1, n + 1)
+        }
+        return cls(alphabet, log_probabilities, left_to_right)
+
+    def encode(self, texts):
+        """
+        Encodes the texts as one array of character indices where -1
+        separates words and texts.
+
+        Returns
+        -------
+        np.ndarray
+            Character indices
+        np.ndarray
+            Index of the text for each character
+        """
+        encoded = []
+        for text in texts:
+            code_points = np.frombuffer(
+                text.lower().encode("utf-32-le"), dtype=np.uint32
+            ).astype(np.int64)
+            # Spaces separate words and characters outside the alphabet are
+            # dropped
+            codes = np.where(
+                code_points < len(self._lookup),
+                self._lookup[np.minimum(code_points, len(self._lookup) - 1)],
+                -2,
+            )
+            codes[code_points == ord(" ")] = -1
+            codes = codes[codes != -2]
+            if not self.left_to_right:
+                codes = codes[::-1]
+            encoded.append(np.append(codes, -1))
+
+        if not encoded:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        text_ids = np.repeat(np.arange(len(encoded)), list(map(len, encoded)))
+        return np.concatenate(encoded), text_ids
+
+    def log_likelihoods(self, texts):
+        """
+        Returns the log likelihood of each text.
+
+        Parameters
+        ----------
+        texts : List[str]
+            Texts to score
+
+        Returns
+        -------
+        np.ndarray
+            Log likelihood of each text
+        """
+        texts = list(texts)
+        codes, text_ids = self.encode(texts)
+
+        is_char = codes >= 0
+        starts = is_char & ~np.concatenate(([False], is_char[:-1]))
+        word_ids = np.cumsum(starts)[is_char] - 1
+
+        chars = codes[is_char]
+        text_ids = text_ids[is_char]
+        word_starts = np.flatnonzero(starts[is_char])
+        positions = np.arange(len(chars)) - word_starts[word_ids]
+        lengths = np.bincount(word_ids, minlength=len(word_starts))[word_ids]
+
+        if self.n == 1:
+            return np.bincount(
+                text_ids, weights=self._first[chars], minlength=len(texts)
+            )
+
+        first = positions == 0
+        ids = [text_ids[first]]
+        terms = [self._first[chars[first]]]
+
+        grams = chars
+        for gram in range(2, self.n + 1):
+            grams = grams[:-1] * self.size + chars[gram - 1 :]
+            positions_ = positions[: len(grams)]
+            lengths_ = lengths[: len(grams)]
+            if gram < self.n:
+                # Conditional probabilities of the start of each word
+                mask = (positions_ == 0) & (lengths_ >= gram)
+            else:
+                mask = positions_ + gram <= lengths_
+            ids.append(text_ids[: len(grams)][mask])
+            terms.append(self._conditionals[gram][grams[mask]])
+
+        return np.bincount(
+            np.concatenate(ids),
+            weights=np.concatenate(terms),
+            minlength=len(texts),
+        )
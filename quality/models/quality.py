@@ -134,7 +134,7 @@ class Quality(models.Model):
         ]
 
         if cache:
-            cached = [QualityCache.get(self, answer) for answer in answers]
+            cached = QualityCache.batch_get(self, answers)
             answers = [a for a, c in zip(answers, cached) if c[0] is None]
         else:
             cached = [(None, None) for _ in answers]
@@ -167,8 +167,7 @@ class Quality(models.Model):
         combined = [(q, qq) for q, qq in zip(quality, qualities)]
 
         if cache:
-            for (q, qq), answer in zip(combined, answers):
-                QualityCache.cache(self, answer, q, qq)
+            QualityCache.batch_cache(self, answers, combined)
 
             gen = iter(combined)
             combined = [q if q[0] is not None else next(gen) for q in cached]
@@ -335,15 +334,8 @@ class QualityCache(models.Model):
     quality = models.FloatField()
     qualities = models.TextField()
 
-    @classmethod
-    def get(cls, quality, answer):
-        if isinstance(answer, str):
-            answer_pk = None
-            rationale = answer
-        else:
-            answer_pk = answer.pk
-            rationale = answer.rationale
-
+    @staticmethod
+    def _hashes(quality, answers):
         criterions = [
             dict(
                 chain(
@@ -358,47 +350,78 @@ class QualityCache(models.Model):
             for c in quality.criterions.all()
         ]
 
-        hash_ = hashlib.md5(
-            json.dumps({"text": rationale, "criterions": criterions}).encode()
-        ).hexdigest()
+        return [
+            hashlib.md5(
+                json.dumps(
+                    {
+                        "text": answer
+                        if isinstance(answer, str)
+                        else answer.rationale,
+                        "criterions": criterions,
+                    }
+                ).encode()
+            ).hexdigest()
+            for answer in answers
+        ]
 
-        if cls.objects.filter(hash=hash_).exists():
-            cache = cls.objects.get(hash=hash_)
-            return cache.quality, json.loads(cache.qualities)
-        else:
-            return None, None
+    @classmethod
+    def get(cls, quality, answer):
+        return cls.batch_get(quality, [answer])[0]
 
     @classmethod
-    def cache(cls, quality_instance, answer, quality, qualities):
-        if isinstance(answer, str):
-            answer_pk = None
-            rationale = answer
-        else:
-            answer_pk = answer.pk
-            rationale = answer.rationale
+    def batch_get(cls, quality, answers):
+        """
+        Returns the cached quality for each answer, fetched in a single query.
 
-        criterions = [
-            dict(
-                chain(
-                    iter(
-                        get_criterion(c.name)["criterion"].objects.get(
-                            version=c.version
-                        )
-                    ),
-                    list({"rules": c.rules, "weight": c.weight}.items()),
-                )
-            )
-            for c in quality_instance.criterions.all()
-        ]
+        Parameters
+        ----------
+        quality : Quality
+            Quality used to evaluate the answers
+        answers : List[Union[Answer, str]]
+            Answers to get
 
-        hash_ = hashlib.md5(
-            json.dumps({"text": rationale, "criterions": criterions}).encode()
-        ).hexdigest()
+        Returns
+        -------
+        List[Tuple[Optional[float], Optional[List[Dict[str, Any]]]]]
+            Quality and criterion results, or (None, None) if not cached
+        """
+        hashes = cls._hashes(quality, answers)
+        cached = {
+            hash_: (quality_, json.loads(qualities))
+            for hash_, quality_, qualities in cls.objects.filter(
+                hash__in=set(hashes)
+            ).values_list("hash", "quality", "qualities")
+        }
+        return [cached.get(hash_, (None, None)) for hash_ in hashes]
 
-        if not cls.objects.filter(hash=hash_):
-            cls.objects.create(
-                answer=answer_pk,
+    @classmethod
+    def cache(cls, quality_instance, answer, quality, qualities):
+        cls.batch_cache(quality_instance, [answer], [(quality, qualities)])
+
+    @classmethod
+    def batch_cache(cls, quality_instance, answers, qualities):
+        """
+        Caches the quality of each answer, ignoring those already cached.
+
+        Parameters
+        ----------
+        quality_instance : Quality
+            Quality used to evaluate the answers
+        answers : List[Union[Answer, str]]
+            Evaluated answers
+        qualities : List[Tuple[float, List[Dict[str, Any]]]]
+            Quality and criterion results for each answer
+        """
+        hashes = cls._hashes(quality_instance, answers)
+        caches = {
+            hash_: cls(
+                answer=None if isinstance(answer, str) else answer.pk,
                 hash=hash_,
                 quality=quality,
-                qualities=json.dumps(qualities),
+                qualities=json.dumps(qualities_),
+            )
+            for hash_, answer, (quality, qualities_) in zip(
+                hashes, answers, qualities
             )
+        }
+        cls.objects.bulk_create(caches.values(), ignore_conflicts=True)
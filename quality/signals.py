@@ -1,10 +1,16 @@
+import logging
 from operator import itemgetter
 
+from celery.signals import worker_process_init
+from django.conf import settings
 from django.db.models.signals import post_migrate
 from django.dispatch import receiver
 
 from .models import LikelihoodLanguage, Quality, QualityType, QualityUseType
 from .models.criterion.criterion_list import criterions
+from .models.criterion.criterions.likelihood.criterion import warm_up_models
+
+logger = logging.getLogger("quality")
 
 
 @receiver(post_migrate)
@@ -75,3 +81,12 @@ def add_likelihood_languages(sender, **kwargs):
             language=language["language"]
         ).exists():
             LikelihoodLanguage.objects.create(**language)
+
+
+@worker_process_init.connect
+def warm_up_likelihood_models(**kwargs):
+    if getattr(settings, "LIKELIHOOD_MODELS_WARM_UP", False):
+        try:
+            warm_up_models()
+        except Exception:
+            logger.exception("The likelihood models couldn't be loaded.")
@@ -148,3 +148,34 @@ def test_batch__rationale_only(answers):
         assert abs(l1[0] - l2[0]) < 1e-5
         assert abs(l1[1] - l2[1]) < 1e-5
     assert time_taken_2 < time_taken_1
+
+
+def test_batch__queries(answers, mocker, django_assert_num_queries):
+    answers = answers[:3]
+    answers[0].rationale = "rationale 0"
+    answers[1].rationale = "rationale 1"
+    answers[2].rationale = "rationale 0"
+
+    english = LikelihoodLanguage.objects.get(language="english")
+
+    model = mocker.Mock()
+    model.batch.side_effect = lambda rationales: [
+        (0.5, 0.1 * len(rationale)) for rationale in rationales
+    ]
+    get_model = mocker.patch(
+        "quality.models.criterion.criterions.likelihood.criterion.get_model",
+        return_value=model,
+    )
+
+    with django_assert_num_queries(2):
+        likelihoods_1 = LikelihoodCache.batch(answers, english, 3)
+    assert get_model.call_count == 1
+    model.batch.assert_called_once_with(["rationale 0", "rationale 1"])
+    assert LikelihoodCache.objects.count() == 2
+
+    with django_assert_num_queries(1):
+        likelihoods_2 = LikelihoodCache.batch(answers, english, 3)
+    assert get_model.call_count == 1
+
+    assert likelihoods_1 == likelihoods_2
+    assert likelihoods_1[0] == likelihoods_1[2]
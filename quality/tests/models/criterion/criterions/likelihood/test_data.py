@@ -1,4 +1,32 @@
-from quality.models.criterion.criterions.likelihood.data import read_data
+import json
+
+import numpy as np
+import pytest
+
+from quality.models.criterion.criterions.likelihood.data import (
+    convert_data,
+    read_arrays,
+    read_data,
+)
+
+
+@pytest.fixture
+def data_dir(tmp_path, mocker):
+    mocker.patch(
+        "quality.models.criterion.criterions.likelihood.data.DATA_DIR",
+        str(tmp_path),
+    )
+    (tmp_path / "test").mkdir()
+    grams = {
+        1: {"a": 0.75, "b": 0.25},
+        2: {"aa": 0.5, "ab": 0.25, "ba": 0.25},
+    }
+    for gram, val in grams.items():
+        with open(tmp_path / "test" / f"{gram}-grams.txt", "w") as f:
+            f.write("n-gram\tfrequency\n")
+            for n_gram, frequency in val.items():
+                f.write(f"{n_gram}\t{frequency}\n")
+    return tmp_path
 
 
 def test_read_data__english():
@@ -45,3 +73,40 @@ def test_read_data__french():
     assert abs(1 - sum(data["n_grams"][2].values())) < 1e-5
     assert abs(1 - sum(data["n_grams"][3].values())) < 1e-5
     assert data["left_to_right"]
+
+
+def test_convert_data(data_dir):
+    convert_data("test", [None, None], False)
+
+    with open(data_dir / "test" / "arrays" / "meta.json") as f:
+        meta = json.load(f)
+    assert meta["alphabet"] == "ab"
+    assert meta["max_gram"] == 2
+    assert not meta["left_to_right"]
+
+    first = np.load(data_dir / "test" / "arrays" / "1-grams.npy")
+    conditional = np.load(data_dir / "test" / "arrays" / "2-grams.npy")
+    assert np.allclose(first, np.log([0.75, 0.25]))
+    assert np.allclose(
+        conditional,
+        np.log([0.5 / 0.75, 0.25 / 0.75, 0.25 / 0.25, 1e-16 / 0.25]),
+    )
+
+
+def test_read_arrays(data_dir, mocker):
+    convert_data_ = mocker.patch(
+        "quality.models.criterion.criterions.likelihood.data.convert_data",
+        side_effect=convert_data,
+    )
+
+    data_1 = read_arrays("test", [None, None], True)
+    data_2 = read_arrays("test", [None, None], True)
+
+    assert convert_data_.call_count == 1
+    assert data_1["alphabet"] == data_2["alphabet"] == "ab"
+    assert data_1["left_to_right"]
+    assert sorted(data_1["log_probabilities"]) == [1, 2]
+    assert isinstance(data_1["log_probabilities"][2], np.memmap)
+    assert np.array_equal(
+        data_1["log_probabilities"][2], data_2["log_probabilities"][2]
+    )
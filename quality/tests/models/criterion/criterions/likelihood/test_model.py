@@ -5,7 +5,11 @@ from operator import sub
 
 import pytest
 
-from quality.models.criterion.criterions.likelihood.model import create_model
+from quality.models.criterion.criterions.likelihood.model import (
+    clear_models,
+    create_model,
+    get_model,
+)
 
 
 @pytest.fixture
@@ -226,3 +230,37 @@ def test_predict__english__1_gram(english):
     result = [1 - min(1, exp(-sub(*predict(t)))) for t in test]
     for r in result:
         assert r >= 0.95
+
+
+def test_get_model(english, mocker):
+    clear_models()
+    create_model_ = mocker.patch(
+        "quality.models.criterion.criterions.likelihood.model.create_model",
+        side_effect=lambda *args: object(),
+    )
+
+    predict_1 = get_model(*english)
+    predict_2 = get_model(*english)
+    predict_3 = get_model(*english, max_gram=1)
+
+    assert predict_1 is predict_2
+    assert predict_1 is not predict_3
+    assert create_model_.call_count == 2
+    clear_models()
+
+
+def test_get_model__evicted(english, french, mocker, settings):
+    clear_models()
+    settings.LIKELIHOOD_MAX_MODELS = 1
+    create_model_ = mocker.patch(
+        "quality.models.criterion.criterions.likelihood.model.create_model",
+        side_effect=lambda *args: object(),
+    )
+
+    predict_1 = get_model(*english)
+    get_model(*french)
+    predict_2 = get_model(*english)
+
+    assert predict_1 is not predict_2
+    assert create_model_.call_count == 3
+    clear_models()
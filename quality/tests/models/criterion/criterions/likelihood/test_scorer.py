@@ -0,0 +1,99 @@
+import random
+from itertools import product
+
+import pytest
+
+from quality.models.criterion.criterions.likelihood.model import (
+    create_model,
+    log_likelihood,
+)
+from quality.models.criterion.criterions.likelihood.scorer import NGramScorer
+
+
+@pytest.fixture
+def ngrams():
+    random.seed(0)
+    alphabet = "abcé"
+    ngrams = {
+        1: {c: random.random() for c in alphabet},
+        2: {a + b: random.random() for a in alphabet for b in alphabet},
+        3: {
+            a + b + c: random.random()
+            for a in alphabet
+            for b in alphabet
+            for c in alphabet
+        },
+    }
+    # Missing n-grams use the default probability
+    del ngrams[2]["ab"]
+    del ngrams[3]["abc"]
+    return ngrams
+
+
+@pytest.fixture
+def texts():
+    return [
+        "abc",
+        "Ab cab, bacé! é",
+        "a",
+        "",
+        "  ",
+        "xyz",
+        "aabbcc ccbbaa abcabc",
+        "ab\nca",
+    ]
+
+
+@pytest.mark.parametrize("max_gram", [1, 2, 3])
+@pytest.mark.parametrize("left_to_right", [True, False])
+def test_log_likelihoods(ngrams, texts, max_gram, left_to_right):
+    ngrams = {gram: val for gram, val in ngrams.items() if gram <= max_gram}
+    scorer = NGramScorer.from_dict(ngrams, left_to_right)
+
+    result = scorer.log_likelihoods(texts)
+
+    assert len(result) == len(texts)
+    for text, likelihood in zip(texts, result):
+        assert likelihood == pytest.approx(
+            log_likelihood(text, ngrams, left_to_right)
+        )
+
+
+def test_log_likelihoods__empty(ngrams):
+    scorer = NGramScorer.from_dict(ngrams, True)
+
+    assert len(scorer.log_likelihoods([])) == 0
+
+
+def test_model(ngrams, texts, tmp_path, mocker):
+    mocker.patch(
+        "quality.models.criterion.criterions.likelihood.data.DATA_DIR",
+        str(tmp_path),
+    )
+    (tmp_path / "test").mkdir()
+    for gram, val in ngrams.items():
+        with open(tmp_path / "test" / f"{gram}-grams.txt", "w") as f:
+            f.write("n-gram\tfrequency\n")
+            for n_gram, frequency in val.items():
+                f.write(f"{n_gram}\t{frequency}\n")
+    model = create_model("test", [None, None, None], True)
+
+    predictions = model.batch(texts)
+
+    assert len(predictions) == len(texts)
+    for text, (l1, l0) in zip(texts, predictions):
+        assert model(text) == pytest.approx((l1, l0))
+        assert l1 == pytest.approx(log_likelihood(text, ngrams, True))
+        assert l0 == pytest.approx(
+            log_likelihood(
+                text,
+                {
+                    gram: {
+                        "".join(g): 1.0 / len(ngrams[1]) ** gram
+                        for g in product(ngrams[1], repeat=gram)
+                    }
+                    for gram in ngrams
+                },
+                True,
+            )
+        )
@@ -42,3 +42,46 @@ def test_get(global_validation_quality, answers):
     )
     assert quality_ == quality
     assert qualities_ == qualities
+
+
+def test_batch_cache(global_validation_quality, answers):
+    answers = answers[:3]
+    for i, answer in enumerate(answers):
+        answer.rationale = f"test {i}"
+        answer.save()
+
+    qualities = [
+        (i, {"name": "test", "quality": i, "threshold": 1})
+        for i in range(len(answers))
+    ]
+
+    n = QualityCache.objects.count()
+    QualityCache.batch_cache(global_validation_quality, answers, qualities)
+    QualityCache.batch_cache(
+        global_validation_quality,
+        [a.rationale for a in answers],
+        qualities,
+    )
+    assert QualityCache.objects.count() == n + len(answers)
+
+
+def test_batch_get(
+    global_validation_quality, answers, django_assert_num_queries
+):
+    answers = answers[:3]
+    for i, answer in enumerate(answers):
+        answer.rationale = f"test {i}"
+        answer.save()
+
+    qualities = [
+        (i, {"name": "test", "quality": i, "threshold": 1})
+        for i in range(len(answers) - 1)
+    ]
+    QualityCache.batch_cache(
+        global_validation_quality, answers[:-1], qualities
+    )
+
+    with django_assert_num_queries(2):
+        cached = QualityCache.batch_get(global_validation_quality, answers)
+
+    assert cached == qualities + [(None, None)]
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from reputation.models import ReputationCounter
+
+
+class Command(BaseCommand):
+    help = "Recompute the reputation counters from the answers."
+
+    def handle(self, *args, **options):
+        ReputationCounter.refresh()
@@ -1,6 +1,7 @@
 import logging
 from datetime import datetime
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
 from reputation.models import Reputation, ReputationHistory
@@ -12,15 +13,18 @@ class Command(BaseCommand):
     help = "Compute and save the reputations in the history."
 
     def handle(self, *args, **options):
-        reputations = Reputation.objects.all()
+        chunk_size = getattr(settings, "REPUTATION_HISTORY_CHUNK_SIZE", 500)
+        pks = list(
+            Reputation.objects.order_by("pk").values_list("pk", flat=True)
+        )
 
-        n = reputations.count()
-        step = 1.0 / n * 100
-        progress = 0
+        n = len(pks)
 
-        for reputation in reputations.iterator():
-            ReputationHistory.create(reputation)
-            progress = progress + step
+        for i in range(0, n, chunk_size):
+            ReputationHistory.batch_create(
+                Reputation.objects.filter(pk__in=pks[i : i + chunk_size])
+            )
+            progress = min(i + chunk_size, n) / n * 100
             print(
                 f"{datetime.now()} - ({progress:>6.2f}%) -"
                 + " Updating reputations"
@@ -0,0 +1,96 @@
+# Generated by Django 3.2.23 on 2026-10-18 21:28
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_reputation_counters(apps, _):
+    Answer = apps.get_model("peerinst", "Answer")
+    AnswerAnnotation = apps.get_model("peerinst", "AnswerAnnotation")
+    Question = apps.get_model("peerinst", "Question")
+    ShownRationale = apps.get_model("peerinst", "ShownRationale")
+    ReputationCounter = apps.get_model("reputation", "ReputationCounter")
+
+    def count_by(queryset, field):
+        return dict(
+            queryset.values(field)
+            .annotate(n=Count("pk"))
+            .values_list(field, "n")
+            .order_by()
+        )
+
+    counters = {
+        "question_answers": count_by(Answer.objects.all(), "question"),
+        "answers": count_by(Answer.objects.all(), "user_token"),
+        "chosen_rationales": count_by(
+            Answer.objects.filter(chosen_rationale__isnull=False),
+            "chosen_rationale__user_token",
+        ),
+        "shown_rationales": count_by(
+            ShownRationale.objects.all(), "shown_answer__user_token"
+        ),
+        "questions": count_by(
+            Question.objects.filter(user__isnull=False), "user"
+        ),
+        "rationale_evaluations": count_by(
+            AnswerAnnotation.objects.filter(score__isnull=False), "annotator"
+        ),
+    }
+    for score in (0, 1, 2, 3):
+        counters[f"rationale_score_{score}"] = count_by(
+            AnswerAnnotation.objects.filter(score=score),
+            "answer__user_token",
+        )
+
+    chosen = list(
+        Answer.objects.filter(chosen_rationale__isnull=False)
+        .values("user_token", "chosen_rationale")
+        .annotate(n=Count("pk"))
+        .values_list("user_token", "chosen_rationale", "n")
+        .order_by()
+    )
+    totals = defaultdict(int)
+    for _, rationale, n in chosen:
+        totals[rationale] += n
+    common = defaultdict(int)
+    for user_token, rationale, n in chosen:
+        common[user_token] += totals[rationale] - n
+    counters["common_rationale_choices"] = common
+
+    ReputationCounter.objects.bulk_create(
+        (
+            ReputationCounter(name=name, key=str(key), value=value)
+            for name, values in counters.items()
+            for key, value in values.items()
+            if key is not None and value
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('peerinst', '0113_rationaleevaluationcandidate'),
+        ('reputation', '0013_auto_20200103_1550'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReputationCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32)),
+                ('key', models.CharField(max_length=150)),
+                ('value', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('name', 'key')},
+            },
+        ),
+        migrations.RunPython(
+            populate_reputation_counters, migrations.RunPython.noop
+        ),
+    ]
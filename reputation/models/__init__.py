@@ -7,12 +7,14 @@ __all__ = [
     "QuestionLikedCriterion",
     "RationaleEvaluationCriterion",
     "Reputation",
+    "ReputationCounter",
     "ReputationHistory",
     "ReputationType",
     "StudentRationaleEvaluationCriterion",
     "UsesCriterion",
 ]
 
+from .counter import ReputationCounter
 from .criteria import (
     CommonRationaleChoicesCriterion,
     ConvincingRationalesCriterion,
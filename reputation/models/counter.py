@@ -0,0 +1,494 @@
+from collections import defaultdict
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models import Count, F
+
+SCORES = (0, 1, 2, 3)
+
+
+def _values(instance, fields, saved):
+    """
+    Returns the `fields` of the instance, or of its saved row if `saved`, or
+    None if they aren't available.
+    """
+    if saved:
+        if instance._state.adding:
+            return None
+        return (
+            type(instance)
+            ._base_manager.filter(pk=instance.pk)
+            .values_list(*fields)
+            .first()
+        )
+    if instance.get_deferred_fields() & set(fields):
+        return None
+    return tuple(getattr(instance, field) for field in fields)
+
+
+class ReputationCounter(models.Model):
+    """
+    Running count read by the reputation criteria, identified by its `name`
+    and the `key` of the counted entity (username of a student or primary
+    key of a question or user). The counts are updated when answers, shown
+    rationales, annotations and questions are saved or deleted and
+    reconciled by `refresh`.
+
+    Counters
+    --------
+    question_answers : by question
+        Number of answers to the question
+    answers : by username
+        Number of answers given
+    chosen_rationales : by username
+        Number of answers having chosen one of the user's rationales
+    shown_rationales : by username
+        Number of times one of the user's rationales was shown
+    common_rationale_choices : by username
+        Number of answers of others having chosen a rationale the user also
+        chose
+    questions : by user
+        Number of questions written
+    rationale_evaluations : by user
+        Number of rationales evaluated
+    rationale_score_<score> : by username
+        Number of evaluations with the given score of the user's rationales
+    """
+
+    name = models.CharField(max_length=32)
+    key = models.CharField(max_length=150)
+    value = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("name", "key")
+
+    def __str__(self):
+        return f"{self.name} for {self.key}: {self.value}"
+
+    @classmethod
+    def get(cls, name, keys):
+        """
+        Returns the value of the counter for each of the keys.
+
+        Parameters
+        ----------
+        name : str
+            Name of the counter
+        keys : Iterable[Any]
+            Keys of the counted entities
+
+        Returns
+        -------
+        Dict[str, int]
+            Value for each key, converted to string, with missing counters
+            at 0
+        """
+        keys = [str(key) for key in keys]
+        values = dict.fromkeys(keys, 0)
+        values.update(
+            cls.objects.filter(name=name, key__in=keys).values_list(
+                "key", "value"
+            )
+        )
+        return values
+
+    @classmethod
+    def add(cls, name, keys, n=1):
+        """
+        Adds `n` to the counter of each of the keys, creating the missing
+        ones unless `n` is negative. The missing counters are created before
+        the update so concurrent creations can't lose an increment.
+
+        Parameters
+        ----------
+        name : str
+            Name of the counter
+        keys : Iterable[Any]
+            Distinct keys of the counted entities
+        n : int (default : 1)
+            Value to add
+        """
+        keys = {str(key) for key in keys}
+        if not keys or not n:
+            return
+        if n > 0:
+            cls.objects.bulk_create(
+                [cls(name=name, key=key) for key in keys],
+                ignore_conflicts=True,
+            )
+        cls.objects.filter(name=name, key__in=keys).update(
+            value=F("value") + n
+        )
+
+    @staticmethod
+    def answer_values(answer, saved=False):
+        """
+        Returns the values of the answer used by the counters, read from its
+        saved row if `saved`, or None if they aren't available.
+        """
+        return _values(
+            answer, ("question_id", "user_token", "chosen_rationale_id"), saved
+        )
+
+    @classmethod
+    def _add_rationale_choice(cls, answer_pk, user_token, rationale_pk, n):
+        """
+        Updates the common rationale choices for the answer `answer_pk` of
+        `user_token` choosing `rationale_pk`, ignoring the answer itself in
+        the other choices.
+
+        This runs on every answer choosing a rationale, with a query reading
+        the other choices of the rationale and an update of the counters of
+        every user who made them, so its cost grows with the popularity of
+        the rationale.
+        """
+        Answer = apps.get_model(app_label="peerinst", model_name="Answer")
+        choices = list(
+            Answer.objects.filter(chosen_rationale=rationale_pk)
+            .exclude(pk=answer_pk)
+            .values_list("user_token", flat=True)
+        )
+        others = [token for token in choices if token != user_token]
+        # the answer is one more answer of others for each user who also
+        # chose the rationale
+        cls.add("common_rationale_choices", set(others), n)
+        # if it's the first time the user chooses the rationale, all the
+        # choices of others now count for them
+        if len(others) == len(choices):
+            cls.add("common_rationale_choices", [user_token], n * len(others))
+
+    @classmethod
+    def update_answer(
+        cls, answer, previous_values=None, created=False, deleted=False
+    ):
+        """
+        Updates the counters for a saved or deleted answer. The counters of
+        answers deleted in cascade with the rationale they chose are only
+        fixed by `refresh`.
+
+        Parameters
+        ----------
+        answer : Answer
+            Answer that was saved or deleted
+        previous_values : Optional[Tuple]
+            Values of the answer as returned by `answer_values` before it was
+            saved or deleted
+        created : bool (default : False)
+            If the answer was just created
+        deleted : bool (default : False)
+            If the answer was deleted
+        """
+        Answer = apps.get_model(app_label="peerinst", model_name="Answer")
+        values = None
+        if not deleted:
+            # the row is read back if some fields were deferred
+            values = cls.answer_values(answer)
+            if values is None:
+                values = cls.answer_values(answer, saved=True)
+        if created:
+            previous_values = None
+        elif previous_values is None or (values is None and not deleted):
+            return
+        if previous_values == values:
+            return
+
+        authors = dict(
+            Answer.objects.filter(
+                pk__in=[
+                    values_[2]
+                    for values_ in (previous_values, values)
+                    if values_ is not None and values_[2] is not None
+                ]
+            ).values_list("pk", "user_token")
+        )
+
+        with transaction.atomic():
+            for values_, other, n in (
+                (previous_values, values, -1),
+                (values, previous_values, 1),
+            ):
+                if values_ is None:
+                    continue
+                question_pk, user_token, rationale_pk = values_
+                other = other or (None, None, None)
+                if question_pk != other[0]:
+                    cls.add("question_answers", [question_pk], n)
+                if user_token != other[1]:
+                    cls.add("answers", [user_token], n)
+                if rationale_pk is None:
+                    continue
+                if rationale_pk != other[2] and rationale_pk in authors:
+                    cls.add("chosen_rationales", [authors[rationale_pk]], n)
+                if (user_token, rationale_pk) != other[1:]:
+                    cls._add_rationale_choice(
+                        answer.pk, user_token, rationale_pk, n
+                    )
+
+            if (
+                previous_values is not None
+                and values is not None
+                and previous_values[1] != values[1]
+            ):
+                cls._move_rationale(answer, previous_values[1], values[1])
+
+    @classmethod
+    def _move_rationale(cls, answer, previous_user_token, user_token):
+        """
+        Moves the counters of the rationale of `answer` from its previous
+        author to the current one.
+        """
+        Answer = apps.get_model(app_label="peerinst", model_name="Answer")
+        AnswerAnnotation = apps.get_model(
+            app_label="peerinst", model_name="AnswerAnnotation"
+        )
+        ShownRationale = apps.get_model(
+            app_label="peerinst", model_name="ShownRationale"
+        )
+        counts = [
+            (
+                "chosen_rationales",
+                Answer.objects.filter(chosen_rationale=answer.pk).count(),
+            ),
+            (
+                "shown_rationales",
+                ShownRationale.objects.filter(shown_answer=answer.pk).count(),
+            ),
+            *(
+                (f"rationale_score_{score}", n)
+                for score, n in AnswerAnnotation.objects.filter(
+                    answer=answer.pk, score__isnull=False
+                )
+                .values("score")
+                .annotate(n=Count("pk"))
+                .values_list("score", "n")
+                .order_by()
+            ),
+        ]
+        for name, n in counts:
+            cls.add(name, [previous_user_token], -n)
+            cls.add(name, [user_token], n)
+
+    @classmethod
+    def update_shown_rationale(cls, shown_rationale, n):
+        """
+        Updates the counters for a created (`n` = 1) or deleted (`n` = -1)
+        shown rationale.
+        """
+        Answer = apps.get_model(app_label="peerinst", model_name="Answer")
+        cls.add(
+            "shown_rationales",
+            Answer.objects.filter(
+                pk=shown_rationale.shown_answer_id
+            ).values_list("user_token", flat=True),
+            n,
+        )
+
+    @staticmethod
+    def annotation_values(annotation, saved=False):
+        """
+        Returns the values of the annotation used by the counters, read from
+        its saved row if `saved`, or None if they aren't available.
+        """
+        return _values(
+            annotation, ("answer_id", "annotator_id", "score"), saved
+        )
+
+    @classmethod
+    def update_annotation(
+        cls, annotation, previous_values=None, created=False, deleted=False
+    ):
+        """
+        Updates the counters for a saved or deleted answer annotation.
+
+        Parameters
+        ----------
+        annotation : AnswerAnnotation
+            Annotation that was saved or deleted
+        previous_values : Optional[Tuple]
+            Values of the annotation as returned by `annotation_values`
+            before it was saved or deleted
+        created : bool (default : False)
+            If the annotation was just created
+        deleted : bool (default : False)
+            If the annotation was deleted
+        """
+        Answer = apps.get_model(app_label="peerinst", model_name="Answer")
+        values = None
+        if not deleted:
+            # the row is read back if some fields were deferred
+            values = cls.annotation_values(annotation)
+            if values is None:
+                values = cls.annotation_values(annotation, saved=True)
+        if created:
+            previous_values = None
+        elif previous_values is None or (values is None and not deleted):
+            return
+        if previous_values == values:
+            return
+
+        authors = dict(
+            Answer.objects.filter(
+                pk__in=[
+                    values_[0]
+                    for values_ in (previous_values, values)
+                    if values_ is not None and values_[2] is not None
+                ]
+            ).values_list("pk", "user_token")
+        )
+
+        with transaction.atomic():
+            for values_, other, n in (
+                (previous_values, values, -1),
+                (values, previous_values, 1),
+            ):
+                if values_ is None or values_[2] is None:
+                    continue
+                answer_pk, annotator_pk, score = values_
+                other = other or (None, None, None)
+                if other[2] is None or annotator_pk != other[1]:
+                    cls.add("rationale_evaluations", [annotator_pk], n)
+                moved = (answer_pk, score) != (other[0], other[2])
+                if moved and answer_pk in authors:
+                    cls.add(
+                        f"rationale_score_{score}", [authors[answer_pk]], n
+                    )
+
+    @staticmethod
+    def question_values(question, saved=False):
+        """
+        Returns the values of the question used by the counters, read from its
+        saved row if `saved`, or None if they aren't available.
+        """
+        return _values(question, ("user_id",), saved)
+
+    @classmethod
+    def update_question(
+        cls, question, previous_values=None, created=False, deleted=False
+    ):
+        """
+        Updates the counters for a saved or deleted question.
+
+        Parameters
+        ----------
+        question : Question
+            Question that was saved or deleted
+        previous_values : Optional[Tuple]
+            Values of the question as returned by `question_values` before it
+            was saved or deleted
+        created : bool (default : False)
+            If the question was just created
+        deleted : bool (default : False)
+            If the question was deleted
+        """
+        values = None
+        if not deleted:
+            # the row is read back if some fields were deferred
+            values = cls.question_values(question)
+            if values is None:
+                values = cls.question_values(question, saved=True)
+        if created:
+            previous_values = None
+        elif previous_values is None or (values is None and not deleted):
+            return
+        if previous_values == values:
+            return
+
+        with transaction.atomic():
+            for (user_pk,), n in (
+                (previous_values or (None,), -1),
+                (values or (None,), 1),
+            ):
+                if user_pk is not None:
+                    cls.add("questions", [user_pk], n)
+
+    @classmethod
+    def compute(cls):
+        """
+        Computes the value of all counters from the tables.
+
+        Returns
+        -------
+        Dict[str, Dict[Any, int]]
+            Value for each key of each counter
+        """
+        Answer = apps.get_model(app_label="peerinst", model_name="Answer")
+        AnswerAnnotation = apps.get_model(
+            app_label="peerinst", model_name="AnswerAnnotation"
+        )
+        Question = apps.get_model(app_label="peerinst", model_name="Question")
+        ShownRationale = apps.get_model(
+            app_label="peerinst", model_name="ShownRationale"
+        )
+
+        def count_by(queryset, field):
+            return dict(
+                queryset.values(field)
+                .annotate(n=Count("pk"))
+                .values_list(field, "n")
+                .order_by()
+            )
+
+        counters = {
+            "question_answers": count_by(Answer.objects.all(), "question"),
+            "answers": count_by(Answer.objects.all(), "user_token"),
+            "chosen_rationales": count_by(
+                Answer.objects.filter(chosen_rationale__isnull=False),
+                "chosen_rationale__user_token",
+            ),
+            "shown_rationales": count_by(
+                ShownRationale.objects.all(), "shown_answer__user_token"
+            ),
+            "questions": count_by(
+                Question.objects.filter(user__isnull=False), "user"
+            ),
+            "rationale_evaluations": count_by(
+                AnswerAnnotation.objects.filter(score__isnull=False),
+                "annotator",
+            ),
+        }
+
+        for score in SCORES:
+            counters[f"rationale_score_{score}"] = count_by(
+                AnswerAnnotation.objects.filter(score=score),
+                "answer__user_token",
+            )
+
+        chosen = list(
+            Answer.objects.filter(chosen_rationale__isnull=False)
+            .values("user_token", "chosen_rationale")
+            .annotate(n=Count("pk"))
+            .values_list("user_token", "chosen_rationale", "n")
+            .order_by()
+        )
+        totals = defaultdict(int)
+        for _, rationale, n in chosen:
+            totals[rationale] += n
+        common = defaultdict(int)
+        for user_token, rationale, n in chosen:
+            common[user_token] += totals[rationale] - n
+        counters["common_rationale_choices"] = common
+
+        return counters
+
+    @classmethod
+    def refresh(cls, batch_size=1000):
+        """
+        Recomputes all counters from the tables.
+
+        Parameters
+        ----------
+        batch_size : int (default : 1000)
+            Number of counters created in each query
+        """
+        counters = cls.compute()
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(
+                (
+                    cls(name=name, key=str(key), value=value)
+                    for name, values in counters.items()
+                    for key, value in values.items()
+                    if key is not None and value
+                ),
+                batch_size=batch_size,
+            )
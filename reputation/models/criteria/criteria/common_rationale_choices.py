@@ -1,6 +1,7 @@
 from django.db import models
 
 from reputation.logger import logger
+from reputation.models.counter import ReputationCounter
 
 from ..criterion import Criterion
 
@@ -39,9 +40,41 @@ class CommonRationaleChoicesCriterion(Criterion):
         TypeError
             If `instance` isn't of type Student
         """
-        super().evaluate(instance)
-        if instance.__class__.__name__ == "Student":
-            return (instance.answers_also_chosen_by_others.count(), {})
+        return self.batch_evaluate([instance])[0]
+
+    def batch_evaluate(self, students):
+        """
+        Evaluates how often each of the `students` chooses rationales that
+        are also chosen by others, read from their counters.
+
+        Parameters
+        ----------
+        students : List[student]
+            students whose rationale choices are evaluated
+
+        Returns
+        -------
+        List[Tuple[float, Dict[str, Any]]]
+            Reputation as evaluated by the criterion and details about the
+            calculation for each student
+
+        Raises
+        ------
+        TypeError
+            If `students` aren't of type Student
+        """
+        if not students:
+            return []
+        super().evaluate(students[0])
+        if students[0].__class__.__name__ == "Student":
+            models.prefetch_related_objects(students, "student")
+            counts = ReputationCounter.get(
+                "common_rationale_choices",
+                [student.student.username for student in students],
+            )
+            return [
+                (counts[student.student.username], {}) for student in students
+            ]
         else:
             msg = "`instance` has to be of type Student."
             logger.error(f"TypeError: {msg}")
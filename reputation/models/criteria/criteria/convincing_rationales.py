@@ -1,6 +1,7 @@
 from django.db import models
 
 from reputation.logger import logger
+from reputation.models.counter import ReputationCounter
 
 from ..criterion import Criterion
 
@@ -38,12 +39,41 @@ class ConvincingRationalesCriterion(Criterion):
         TypeError
             If `instance` isn't of type Student
         """
-        super().evaluate(instance)
-        if instance.__class__.__name__ == "Student":
-            return (
-                instance.answers_chosen_by_others.count(),
-                {"times_shown": instance.answers_shown_to_others.count()},
-            )
+        return self.batch_evaluate([instance])[0]
+
+    def batch_evaluate(self, students):
+        """
+        Evaluates how often the rationales of each of the `students` are
+        chosen by others, read from their counters.
+
+        Parameters
+        ----------
+        students : List[Student]
+            Students whose rationales are evaluated
+
+        Returns
+        -------
+        List[Tuple[float, Dict[str, Any]]]
+            Reputation as evaluated by the criterion and details about the
+            calculation for each student
+
+        Raises
+        ------
+        TypeError
+            If `students` aren't of type Student
+        """
+        if not students:
+            return []
+        super().evaluate(students[0])
+        if students[0].__class__.__name__ == "Student":
+            models.prefetch_related_objects(students, "student")
+            usernames = [student.student.username for student in students]
+            chosen = ReputationCounter.get("chosen_rationales", usernames)
+            shown = ReputationCounter.get("shown_rationales", usernames)
+            return [
+                (chosen[username], {"times_shown": shown[username]})
+                for username in usernames
+            ]
         else:
             msg = "`instance` has to be of type Student."
             logger.error(f"TypeError: {msg}")
@@ -1,6 +1,7 @@
 from django.db import models
 
 from reputation.logger import logger
+from reputation.models.counter import ReputationCounter
 
 from ..criterion import Criterion
 
@@ -38,11 +39,45 @@ class NAnswersCriterion(Criterion):
         TypeError
             If `instance` isn't of type Question or Student
         """
-        super().evaluate(instance)
-        if instance.__class__.__name__ == "Question":
-            return instance.answer_set.count(), {}
-        elif instance.__class__.__name__ == "Student":
-            return instance.answers.count(), {}
+        return self.batch_evaluate([instance])[0]
+
+    def batch_evaluate(self, instances):
+        """
+        Evaluates each of the `instances` using the number of answers to it,
+        read from their counters.
+
+        Parameters
+        ----------
+        instances : List[Question] | List[Student]
+            Questions or Students to evaluate
+
+        Returns
+        -------
+        List[Tuple[float, Dict[str, Any]]]
+            Reputation as evaluated by the criterion and details about the
+            calculation for each instance
+
+        Raises
+        ------
+        TypeError
+            If `instances` aren't of type Question or Student
+        """
+        if not instances:
+            return []
+        super().evaluate(instances[0])
+        if instances[0].__class__.__name__ == "Question":
+            counts = ReputationCounter.get(
+                "question_answers", [question.pk for question in instances]
+            )
+            return [(counts[str(question.pk)], {}) for question in instances]
+        elif instances[0].__class__.__name__ == "Student":
+            models.prefetch_related_objects(instances, "student")
+            counts = ReputationCounter.get(
+                "answers", [student.student.username for student in instances]
+            )
+            return [
+                (counts[student.student.username], {}) for student in instances
+            ]
         else:
             msg = "`question` has to be of type Question."
             logger.error(f"TypeError: {msg}")
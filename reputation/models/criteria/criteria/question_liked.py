@@ -1,4 +1,6 @@
+from django.apps import apps
 from django.db import models
+from django.db.models import Exists, F, OuterRef
 
 from reputation.logger import logger
 
@@ -126,5 +128,99 @@ class QuestionLikedCriterion(Criterion):
             logger.error(f"TypeError: {msg}")
             raise TypeError(msg)
 
+    def batch_evaluate(self, instances):
+        """
+        Evaluates each of the `instances` like `evaluate`, counting the likes
+        and uses of the questions of all of them with grouped queries.
+
+        Parameters
+        ----------
+        instances : List[Question] | List[Teacher]
+            Questions or Teachers to evaluate
+
+        Returns
+        -------
+        List[Tuple[float, Dict[str, Any]]]
+            Reputation as evaluated by the criterion and details about the
+            calculation for each instance
+
+        Raises
+        ------
+        TypeError
+            If `instances` aren't of type Question or Teacher
+        """
+        if not instances:
+            return []
+        super().evaluate(instances[0])
+        Answer = apps.get_model(app_label="peerinst", model_name="Answer")
+        Assignment = apps.get_model(
+            app_label="peerinst", model_name="Assignment"
+        )
+        AssignmentQuestions = apps.get_model(
+            app_label="peerinst", model_name="AssignmentQuestions"
+        )
+        Teacher = apps.get_model(app_label="peerinst", model_name="Teacher")
+
+        # assignments containing the question with answers to it
+        used = AssignmentQuestions.objects.filter(
+            Exists(
+                Answer.objects.filter(
+                    assignment=OuterRef("assignment"),
+                    question=OuterRef("question"),
+                )
+            )
+        )
+
+        if instances[0].__class__.__name__ == "Question":
+            likes = self._count_by(
+                Teacher.favourite_questions.through.objects.filter(
+                    question__in=instances
+                ),
+                "question",
+            )
+            uses = self._count_by(
+                used.filter(question__in=instances), "question"
+            )
+            return [
+                (
+                    likes.get(question.pk, 0) * self.points_liked
+                    + uses.get(question.pk, 0) * self.points_used,
+                    {},
+                )
+                for question in instances
+            ]
+        elif instances[0].__class__.__name__ == "Teacher":
+            users = [teacher.user_id for teacher in instances]
+            # likes and uses by other teachers than the question's author
+            likes = self._count_by(
+                Teacher.favourite_questions.through.objects.filter(
+                    question__user__in=users
+                ).exclude(teacher__user=F("question__user")),
+                "question__user",
+            )
+            uses = self._count_by(
+                used.filter(question__user__in=users).exclude(
+                    Exists(
+                        Assignment.owner.through.objects.filter(
+                            assignment=OuterRef("assignment"),
+                            user=OuterRef("question__user"),
+                        )
+                    )
+                ),
+                "question__user",
+            )
+            return [
+                (
+                    likes.get(user, 0) * self.points_liked
+                    + uses.get(user, 0) * self.points_used,
+                    {},
+                )
+                for user in users
+            ]
+        else:
+            msg = "`question` has to be of type Question."
+            logger.error(f"TypeError: {msg}")
+            raise TypeError(msg)
+
     def info(self):
         return super().info(QuestionLikedCriterion.general_info())
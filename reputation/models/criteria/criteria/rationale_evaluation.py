@@ -1,6 +1,7 @@
 from django.db import models
 
 from reputation.logger import logger
+from reputation.models.counter import ReputationCounter
 
 from ..criterion import Criterion
 
@@ -40,14 +41,38 @@ class RationaleEvaluationCriterion(Criterion):
         TypeError
             If `instance` isn't of type Teacher
         """
-        super().evaluate(teacher)
-        if teacher.__class__.__name__ == "Teacher":
-            return (
-                teacher.user.answerannotation_set.filter(
-                    score__isnull=False
-                ).count(),
-                {},
+        return self.batch_evaluate([teacher])[0]
+
+    def batch_evaluate(self, teachers):
+        """
+        Evaluates each of the `teachers` using the number of rationale
+        evaluations done, read from their counters.
+
+        Parameters
+        ----------
+        teachers : List[Teacher]
+            Teachers to evaluate
+
+        Returns
+        -------
+        List[Tuple[float, Dict[str, Any]]]
+            Reputation as evaluated by the criterion and details about the
+            calculation for each teacher
+
+        Raises
+        ------
+        TypeError
+            If `teachers` aren't of type Teacher
+        """
+        if not teachers:
+            return []
+        super().evaluate(teachers[0])
+        if teachers[0].__class__.__name__ == "Teacher":
+            counts = ReputationCounter.get(
+                "rationale_evaluations",
+                [teacher.user_id for teacher in teachers],
             )
+            return [(counts[str(teacher.user_id)], {}) for teacher in teachers]
         else:
             msg = "`question` has to be of type Teacher."
             logger.error(f"TypeError: {msg}")
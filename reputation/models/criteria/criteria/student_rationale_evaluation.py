@@ -1,6 +1,7 @@
 from django.db import models
 
 from reputation.logger import logger
+from reputation.models.counter import SCORES, ReputationCounter
 
 from ..criterion import Criterion
 
@@ -46,19 +47,53 @@ class StudentRationaleEvaluationCriterion(Criterion):
         TypeError
             If `instance` isn't of type Question or Student
         """
-        super().evaluate(student)
+        return self.batch_evaluate([student])[0]
 
-        if student.__class__.__name__ == "Student":
-            return (
-                sum(
-                    getattr(self, f"points_score_{evaluation.score}")
-                    for answer in student.answers.all()
-                    for evaluation in answer.answerannotation_set.filter(
-                        score__isnull=False
-                    ).all()
-                ),
-                {},
-            )
+    def batch_evaluate(self, students):
+        """
+        Evaluates each of the `students` using the evaluations given by
+        teachers for their rationales, counted for all of them with a single
+        grouped query.
+
+        Parameters
+        ----------
+        students : List[Student]
+            Students to evaluate
+
+        Returns
+        -------
+        List[Tuple[float, Dict[str, Any]]]
+            Reputation as evaluated by the criterion and details about the
+            calculation for each student
+
+        Raises
+        ------
+        TypeError
+            If `students` aren't of type Student
+        """
+        if not students:
+            return []
+        super().evaluate(students[0])
+        if students[0].__class__.__name__ == "Student":
+            models.prefetch_related_objects(students, "student")
+            usernames = [student.student.username for student in students]
+            counts = {
+                score: ReputationCounter.get(
+                    f"rationale_score_{score}", usernames
+                )
+                for score in SCORES
+            }
+            return [
+                (
+                    sum(
+                        getattr(self, f"points_score_{score}")
+                        * counts[score][username]
+                        for score in SCORES
+                    ),
+                    {},
+                )
+                for username in usernames
+            ]
         else:
             msg = "`question` has to be of type Student."
             logger.error(f"TypeError: {msg}")
@@ -116,6 +116,54 @@ class Criterion(models.Model):
             logger.error(msg)
             raise TypeError(msg)
 
+    def batch_evaluate(self, instances):
+        """
+        Evaluates the reputation score of each of the `instances`, which must
+        all be of the same type. Classes inheriting should override it to
+        evaluate all of them with grouped queries.
+
+        Parameters
+        ----------
+        instances : List[Model]
+            Models being evaluated. Must be in `for_reputation_types`
+
+        Returns
+        -------
+        List[Tuple[float, Dict[str, Any]]]
+            Reputation and details as returned by `evaluate` for each instance
+
+        Raises
+        ------
+        TypeError
+            If the `instances` aren't in the for_reputation_types
+        """
+        return [self.evaluate(instance) for instance in instances]
+
+    @staticmethod
+    def _count_by(queryset, field):
+        """
+        Counts the elements of the `queryset` for each value of `field` with a
+        single grouped query.
+
+        Parameters
+        ----------
+        queryset : QuerySet
+            Elements to count
+        field : str
+            Field to group by
+
+        Returns
+        -------
+        Dict[Any, int]
+            Number of elements for each value of `field`
+        """
+        return dict(
+            queryset.values(field)
+            .annotate(n=models.Count("pk"))
+            .values_list(field, "n")
+            .order_by()
+        )
+
     def save(self, *args, **kwargs):
         """
         Saves the new criterion making sure the `name` field exists.
@@ -1,4 +1,5 @@
 import json
+from collections import defaultdict
 from datetime import date as date_
 
 from django.db import IntegrityError, models
@@ -159,3 +160,73 @@ class ReputationHistory(models.Model):
             instance.save()
 
         return instance
+
+    @staticmethod
+    def batch_create(reputations):
+        """
+        Creates or updates today's history of each of the `reputations`,
+        evaluating those of the same type together.
+
+        Parameters
+        ----------
+        reputations : Iterable[Reputation]
+            Reputations for which to save the history
+
+        Returns
+        -------
+        List[ReputationHistory]
+            Created or updated instances
+        """
+        reputations = list(reputations)
+        models.prefetch_related_objects(reputations, "reputation_type")
+
+        by_type = defaultdict(list)
+        for reputation in reputations:
+            by_type[reputation.reputation_type].append(reputation)
+
+        values = {}
+        for reputation_type, reputations_ in by_type.items():
+            if reputation_type.model_name:
+                models.prefetch_related_objects(
+                    reputations_, reputation_type.model_name
+                )
+            linked = []
+            for reputation in reputations_:
+                try:
+                    linked.append((reputation, reputation.reputation_model))
+                except ValueError:
+                    values[reputation.pk] = (None, [])
+            for (reputation, _), value in zip(
+                linked,
+                reputation_type.batch_evaluate([model for _, model in linked]),
+            ):
+                values[reputation.pk] = value
+
+        existing = {
+            instance.reputation_id: instance
+            for instance in ReputationHistory.objects.filter(
+                reputation__in=values, date=date_.today()
+            )
+        }
+        to_create = []
+        for reputation in reputations:
+            value, details = values[reputation.pk]
+            if reputation.pk in existing:
+                instance = existing[reputation.pk]
+                instance.reputation_value = value
+                instance.reputation_details = json.dumps(details)
+            else:
+                to_create.append(
+                    ReputationHistory(
+                        reputation=reputation,
+                        reputation_value=value,
+                        reputation_details=json.dumps(details),
+                    )
+                )
+
+        ReputationHistory.objects.bulk_update(
+            existing.values(), ["reputation_value", "reputation_details"]
+        )
+        return list(existing.values()) + ReputationHistory.objects.bulk_create(
+            to_create
+        )
@@ -13,7 +13,7 @@ class ReputationType(models.Model):
     def __str__(self):
         return self.type
 
-    def _calculate_points(self, criterion, model):
+    def _calculate_points(self, criterion, model, evaluation=None):
         """
         Calculates the number of points returned by the model based on the
         criterion evaluation and its point thresholds. Points can't be smaller
@@ -25,6 +25,9 @@ class ReputationType(models.Model):
             Criterion used for the evaluation
         model : Union[Question, Assignment, Teacher]
             Model for which to evaluate the reputation
+        evaluation : Optional[Tuple[float, Dict[str, Any]]] (default : None)
+            Result of the criterion evaluation of the model if already
+            computed
 
         Returns
         -------
@@ -41,7 +44,9 @@ class ReputationType(models.Model):
         TypeError
             If the given `model` doesn't correspond to the `type`
         """
-        evaluation, details = criterion.evaluate(model)
+        if evaluation is None:
+            evaluation = criterion.evaluate(model)
+        evaluation, details = evaluation
         evaluation = max(0, evaluation)
 
         if criterion.thresholds:
@@ -218,6 +223,79 @@ class ReputationType(models.Model):
 
         return reputation, reputations
 
+    def batch_evaluate(self, models_):
+        """
+        Returns the reputation of each of the linked models as `evaluate`
+        without a criterion would, evaluating each criterion for all of them
+        at once.
+
+        Parameters
+        ----------
+        models_ : List[Union[Question, Assignment, Teacher, Student]]
+            Models for which to evaluate the reputation
+
+        Returns
+        -------
+        List[Tuple[Optional[float], List[Dict[str, Any]]]]
+            Reputation and individual criteria of each model in the format
+            returned by `evaluate`
+
+        Raises
+        ------
+        TypeError
+            If one of the given `models_` doesn't correspond to the `type`
+        """
+        for model in models_:
+            if model.__class__.__name__.lower() != self.type:
+                msg = (
+                    "The type of `model` doesn't correspond to the correct "
+                    "type; is {} instead of {}.".format(
+                        model.__class__.__name__.lower(), self.type
+                    )
+                )
+                logger.error(f"TypeError: {msg}")
+                raise TypeError(msg)
+
+        criteria = [
+            get_criterion(c.name).objects.get(version=c.version)
+            for c in self.criteria.all()
+        ]
+        if not criteria:
+            return [(None, [])] * len(models_)
+
+        evaluations = [
+            (criterion, dict(criterion), criterion.batch_evaluate(models_))
+            for criterion in criteria
+        ]
+
+        results = []
+        for i, model in enumerate(models_):
+            reputations = []
+            for criterion, info, evaluations_ in evaluations:
+                reputation = dict(
+                    chain(
+                        self._calculate_points(
+                            criterion, model, evaluations_[i]
+                        ).items(),
+                        info.items(),
+                    )
+                )
+                reputations.append(
+                    {
+                        key: (
+                            "{}\n{}".format(val, reputation["equation"])
+                            if key == "description"
+                            else val
+                        )
+                        for key, val in reputation.items()
+                    }
+                )
+            results.append(
+                (sum(r["reputation"] for r in reputations), reputations)
+            )
+
+        return results
+
 
 class UsesCriterion(models.Model):
     reputation_type = models.ForeignKey(
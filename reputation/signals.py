@@ -1,7 +1,14 @@
-from django.db.models.signals import post_migrate
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_save,
+)
 from django.dispatch import receiver
 
-from .models import ReputationType
+from peerinst.models import Answer, AnswerAnnotation, Question, ShownRationale
+
+from .models import ReputationCounter, ReputationType
 
 
 @receiver(post_migrate)
@@ -16,3 +23,79 @@ def add_reputation_types(sender, **kwargs):
         if type_.model_name != quality_type[1]:
             type_.model_name = quality_type[1]
             type_.save()
+
+
+@receiver(pre_save, sender=Answer)
+def store_answer_counter_values(sender, instance, **kwargs):
+    instance._counter_values = ReputationCounter.answer_values(
+        instance, saved=True
+    )
+
+
+@receiver(post_save, sender=Answer)
+def update_counters_on_answer_save(sender, instance, created, **kwargs):
+    ReputationCounter.update_answer(
+        instance, instance._counter_values, created=created
+    )
+
+
+@receiver(post_delete, sender=Answer)
+def update_counters_on_answer_delete(sender, instance, **kwargs):
+    ReputationCounter.update_answer(
+        instance, ReputationCounter.answer_values(instance), deleted=True
+    )
+
+
+@receiver(post_save, sender=ShownRationale)
+def update_counters_on_shown_rationale_save(
+    sender, instance, created, **kwargs
+):
+    if created:
+        ReputationCounter.update_shown_rationale(instance, 1)
+
+
+@receiver(post_delete, sender=ShownRationale)
+def update_counters_on_shown_rationale_delete(sender, instance, **kwargs):
+    ReputationCounter.update_shown_rationale(instance, -1)
+
+
+@receiver(pre_save, sender=AnswerAnnotation)
+def store_annotation_counter_values(sender, instance, **kwargs):
+    instance._counter_values = ReputationCounter.annotation_values(
+        instance, saved=True
+    )
+
+
+@receiver(post_save, sender=AnswerAnnotation)
+def update_counters_on_annotation_save(sender, instance, created, **kwargs):
+    ReputationCounter.update_annotation(
+        instance, instance._counter_values, created=created
+    )
+
+
+@receiver(post_delete, sender=AnswerAnnotation)
+def update_counters_on_annotation_delete(sender, instance, **kwargs):
+    ReputationCounter.update_annotation(
+        instance, ReputationCounter.annotation_values(instance), deleted=True
+    )
+
+
+@receiver(pre_save, sender=Question)
+def store_question_counter_values(sender, instance, **kwargs):
+    instance._counter_values = ReputationCounter.question_values(
+        instance, saved=True
+    )
+
+
+@receiver(post_save, sender=Question)
+def update_counters_on_question_save(sender, instance, created, **kwargs):
+    ReputationCounter.update_question(
+        instance, instance._counter_values, created=created
+    )
+
+
+@receiver(post_delete, sender=Question)
+def update_counters_on_question_delete(sender, instance, **kwargs):
+    ReputationCounter.update_question(
+        instance, ReputationCounter.question_values(instance), deleted=True
+    )
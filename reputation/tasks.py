@@ -1,9 +1,24 @@
-from dalite.celery import app
+from celery import shared_task
+from django.conf import settings
+
+from dalite.celery import app, try_async
 
 
 @app.task
 def update_reputation_history():
+    from .models import Reputation
+
+    chunk_size = getattr(settings, "REPUTATION_HISTORY_CHUNK_SIZE", 500)
+    pks = list(Reputation.objects.order_by("pk").values_list("pk", flat=True))
+    for i in range(0, len(pks), chunk_size):
+        update_reputation_history_chunk(pks[i : i + chunk_size])
+
+
+@try_async
+@shared_task
+def update_reputation_history_chunk(reputation_pks):
     from .models import Reputation, ReputationHistory
 
-    for reputation in Reputation.objects.all().iterator():
-        ReputationHistory.create(reputation)
+    ReputationHistory.batch_create(
+        Reputation.objects.filter(pk__in=reputation_pks)
+    )
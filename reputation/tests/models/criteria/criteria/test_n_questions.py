@@ -42,3 +42,13 @@ def test_info(n_questions_criterion):
     assert "name" in info
     assert "full_name" in info
     assert "description" in info
+
+
+def test_batch_evaluate(n_questions_criterion, teachers, questions):
+    for question in questions[1:]:
+        question.user = teachers[0].user
+        question.save()
+
+    assert n_questions_criterion.batch_evaluate(teachers) == [
+        n_questions_criterion.evaluate(teacher) for teacher in teachers
+    ]
@@ -102,3 +102,38 @@ def test_info(question_liked_criterion):
     assert "name" in info
     assert "full_name" in info
     assert "description" in info
+
+
+def test_batch_evaluate__question(
+    question_liked_criterion, questions, assignment, teachers, answers
+):
+    for question in questions[:2]:
+        teachers[0].favourite_questions.add(question)
+        assignment.questions.add(question)
+    teachers[1].favourite_questions.add(questions[0])
+    answers[0].question = questions[0]
+    answers[0].assignment = assignment
+    answers[0].save()
+
+    assert question_liked_criterion.batch_evaluate(questions) == [
+        question_liked_criterion.evaluate(question) for question in questions
+    ]
+
+
+def test_batch_evaluate__teacher(
+    question_liked_criterion, questions, assignment, teachers, answers
+):
+    assignment.owner.add(teachers[0].user)
+    for i, question in enumerate(questions):
+        question.user = teachers[i % 2].user
+        question.save()
+        teachers[0].favourite_questions.add(question)
+        assignment.questions.add(question)
+    for i in range(min(len(questions), len(answers))):
+        answers[i].question = questions[i]
+        answers[i].assignment = assignment
+        answers[i].save()
+
+    assert question_liked_criterion.batch_evaluate(teachers) == [
+        question_liked_criterion.evaluate(teacher) for teacher in teachers
+    ]
@@ -46,3 +46,18 @@ def test_info(rationale_evaluation_criterion):
     assert "name" in info
     assert "full_name" in info
     assert "description" in info
+
+
+def test_batch_evaluate(rationale_evaluation_criterion, teachers, answers):
+    for answer in answers[1:]:
+        AnswerAnnotation.objects.create(
+            answer=answer, annotator=teachers[0].user, score=1
+        )
+    AnswerAnnotation.objects.create(
+        answer=answers[0], annotator=teachers[1].user
+    )
+
+    assert rationale_evaluation_criterion.batch_evaluate(teachers) == [
+        rationale_evaluation_criterion.evaluate(teacher)
+        for teacher in teachers
+    ]
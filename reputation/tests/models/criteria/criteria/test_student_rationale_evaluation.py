@@ -137,3 +137,19 @@ def test_info(student_rationale_evaluation_criterion):
     assert "name" in info
     assert "full_name" in info
     assert "description" in info
+
+
+def test_batch_evaluate(
+    student_rationale_evaluation_criterion, students, answers, teacher
+):
+    for i, answer in enumerate(answers):
+        answer.user_token = students[i % 2].student.username
+        answer.save()
+        AnswerAnnotation.objects.create(
+            answer=answer, annotator=teacher.user, score=i % 4
+        )
+
+    assert student_rationale_evaluation_criterion.batch_evaluate(students) == [
+        student_rationale_evaluation_criterion.evaluate(student)
+        for student in students
+    ]
@@ -0,0 +1,104 @@
+from django.core.management import call_command
+
+from peerinst.models import Answer, AnswerAnnotation, ShownRationale
+from peerinst.tests.fixtures import *  # noqa
+from reputation.models import ReputationCounter
+from reputation.tests.fixtures import *  # noqa
+
+
+def counter_values():
+    return {
+        (counter.name, counter.key): counter.value
+        for counter in ReputationCounter.objects.all()
+        if counter.value
+    }
+
+
+def computed_values():
+    return {
+        (name, str(key)): value
+        for name, values in ReputationCounter.compute().items()
+        for key, value in values.items()
+        if key is not None and value
+    }
+
+
+def test_add():
+    ReputationCounter.add("answers", ["a", "b"])
+    ReputationCounter.add("answers", ["b", "c"], 2)
+    ReputationCounter.add("answers", ["c", "d"], -1)
+
+    assert ReputationCounter.get("answers", ["a", "b", "c", "d"]) == {
+        "a": 1,
+        "b": 3,
+        "c": 1,
+        "d": 0,
+    }
+
+
+def test_update__answers(students, answers, teacher):
+    for i, answer in enumerate(answers):
+        answer.user_token = students[i % 3].student.username
+        answer.chosen_rationale = answers[(i * 7) % 5]
+        answer.save()
+    answers[1].chosen_rationale = None
+    answers[1].save()
+    answers[2].user_token = students[0].student.username
+    answers[2].save()
+    answers[-1].delete()
+
+    assert counter_values() == computed_values()
+
+
+def test_update__deferred(students, answers):
+    answer = Answer.objects.only("pk", "rationale").get(pk=answers[0].pk)
+    answer.rationale = "new rationale"
+    answer.save()
+    answer = Answer.objects.only("pk", "user_token").get(pk=answers[1].pk)
+    answer.user_token = students[0].student.username
+    answer.save()
+
+    assert counter_values() == computed_values()
+
+
+def test_update__shown_rationales(answers):
+    for answer in answers[:3]:
+        ShownRationale.objects.create(
+            shown_for_answer=answers[-1], shown_answer=answer
+        )
+    ShownRationale.objects.filter(shown_answer=answers[0]).first().delete()
+
+    assert counter_values() == computed_values()
+
+
+def test_update__annotations(answers, teachers):
+    for i, answer in enumerate(answers):
+        AnswerAnnotation.objects.create(
+            answer=answer, annotator=teachers[i % 2].user, score=i % 4
+        )
+    annotation = AnswerAnnotation.objects.get(answer=answers[0])
+    annotation.score = None
+    annotation.save()
+    annotation = AnswerAnnotation.objects.get(answer=answers[1])
+    annotation.score = 3
+    annotation.save()
+    AnswerAnnotation.objects.get(answer=answers[2]).delete()
+
+    assert counter_values() == computed_values()
+
+
+def test_update__questions(questions, teachers):
+    for question in questions[:2]:
+        question.user = teachers[1].user
+        question.save()
+    questions[2].delete()
+
+    assert counter_values() == computed_values()
+
+
+def test_refresh(answers):
+    Answer.objects.filter(pk=answers[0].pk).update(user_token="other")
+
+    assert counter_values() != computed_values()
+    call_command("refresh_reputation_counters")
+    assert counter_values() == computed_values()
@@ -4,7 +4,7 @@ from unittest import mock
 import pytest
 
 from peerinst.tests.fixtures import *  # noqa
-from reputation.models import ReputationHistory
+from reputation.models import Reputation, ReputationHistory, UsesCriterion
 from reputation.tests.fixtures import *  # noqa
 
 
@@ -74,3 +74,50 @@ def test_create__exists(teacher_reputation):
         assert history_elem.reputation.pk == teacher_reputation.pk
         assert history_elem.reputation_value == reputation_2[0]
         assert json.loads(history_elem.reputation_details) == reputation_2[1]
+
+
+def test_batch_create(
+    n_answers_criterion,
+    question_reputation,
+    teacher_reputation,
+    django_assert_max_num_queries,
+):
+    UsesCriterion.objects.create(
+        reputation_type=question_reputation.reputation_type,
+        name="n_answers",
+        version=n_answers_criterion.version,
+    )
+
+    with django_assert_max_num_queries(12):
+        history = ReputationHistory.batch_create(
+            Reputation.objects.filter(
+                pk__in=[question_reputation.pk, teacher_reputation.pk]
+            )
+        )
+
+    assert len(history) == 2
+    for reputation in (question_reputation, teacher_reputation):
+        history_elem = ReputationHistory.objects.get(reputation=reputation)
+        value, details = reputation.evaluate()
+        assert history_elem.reputation_value == value
+        assert json.loads(history_elem.reputation_details) == details
+
+
+def test_batch_create__exists(n_answers_criterion, question_reputation):
+    UsesCriterion.objects.create(
+        reputation_type=question_reputation.reputation_type,
+        name="n_answers",
+        version=n_answers_criterion.version,
+    )
+    ReputationHistory.objects.create(
+        reputation=question_reputation,
+        reputation_value=-1,
+        reputation_details="[]",
+    )
+
+    ReputationHistory.batch_create([question_reputation])
+
+    history_elem = ReputationHistory.objects.get(
+        reputation=question_reputation
+    )
+    assert history_elem.reputation_value == question_reputation.evaluate()[0]
@@ -162,3 +162,32 @@ def test_evaluate__no_criterion(question_reputation):
     reputation, criteria = reputation_type.evaluate(model)
     assert reputation is None
     assert criteria == []
+
+
+def test_batch_evaluate(n_answers_criterion, questions, answers):
+    reputation_type = ReputationType.objects.get(type="question")
+    UsesCriterion.objects.create(
+        reputation_type=reputation_type,
+        name="n_answers",
+        version=n_answers_criterion.version,
+    )
+    for i, answer in enumerate(answers):
+        answer.question = questions[i % 2]
+        answer.save()
+
+    assert reputation_type.batch_evaluate(questions) == [
+        reputation_type.evaluate(question) for question in questions
+    ]
+
+
+def test_batch_evaluate__no_criteria(questions):
+    reputation_type = ReputationType.objects.get(type="question")
+    assert reputation_type.batch_evaluate(questions) == [(None, [])] * len(
+        questions
+    )
+
+
+def test_batch_evaluate__wrong_type(teacher):
+    reputation_type = ReputationType.objects.get(type="question")
+    with pytest.raises(TypeError):
+        reputation_type.batch_evaluate([teacher])